@@ -0,0 +1,327 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Sweep-driven asset prefetch (replaces mirroring the whole asset bucket):
+#
+#   python render-genesis.py --asset-manifest /workspace/assets.json
+#   python asset_cache.py --manifest /workspace/assets.json \
+#       --source minio://public/shared/blender --dest /workspace/data-assets
+#
+# The manifest lists the files a sweep references (envTextures, textures)
+# and the folders it lists (poses_dir), relative to the asset root. Each
+# remote object is fetched once into a content-addressed cache
+# (objects/ab/<sha256>, keyed by remote key + size + ETag) and hard-linked
+# into --dest, so a pod restart on the same volume only re-links. Fetched
+# content is checked against the source's SHA-256 (the local file, or the
+# x-amz-meta-sha256 object metadata), else a plain-MD5 ETag, else the size.
+
+CACHE_DIR = "/workspace/.asset-cache"
+FETCH_WORKERS = 16
+CHUNK = 1 << 20
+
+
+# ----------------------------------------------------------
+# Manifest
+# ----------------------------------------------------------
+
+def asset_manifest(asset_root, files=(), dirs=None):
+    """
+    files: absolute paths; dirs: absolute folder → filename suffix. Paths
+    outside asset_root (e.g. a "none" texture) go to "external".
+    """
+    root = os.path.abspath(asset_root)
+    rel_files, rel_dirs, external = [], {}, []
+    for path in files:
+        rel = os.path.relpath(os.path.abspath(path), root)
+        if rel.startswith(".."):
+            external.append(path)
+        else:
+            rel_files.append(rel)
+    for path, suffix in (dirs or {}).items():
+        rel = os.path.relpath(os.path.abspath(path), root)
+        if rel.startswith(".."):
+            external.append(path)
+        else:
+            rel_dirs[rel] = suffix
+    return {
+        "root": root,
+        "files": sorted(set(f.replace(os.sep, "/") for f in rel_files)),
+        "dirs": {d.replace(os.sep, "/"): s for d, s in sorted(rel_dirs.items())},
+        "external": external,
+    }
+
+
+def write_asset_manifest(path, manifest):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"🧾 Asset manifest → {path} ({len(manifest['files'])} files, {len(manifest['dirs'])} folders)")
+
+
+# ----------------------------------------------------------
+# Sources
+# ----------------------------------------------------------
+
+class LocalSource:
+    """Directory tree (the stand-in for the bucket); ETag = size + mtime."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def _etag(self, st):
+        return f"{st.st_size:x}-{st.st_mtime_ns:x}"
+
+    def stat(self, key):
+        try:
+            st = os.stat(os.path.join(self.root, key))
+        except FileNotFoundError:
+            return None
+        return st.st_size, self._etag(st)
+
+    def list(self, prefix, suffix=""):
+        base = os.path.join(self.root, prefix)
+        if not os.path.isdir(base):
+            return []
+        with os.scandir(base) as it:
+            return [
+                (f"{prefix}/{e.name}", e.stat().st_size, self._etag(e.stat()))
+                for e in it if e.is_file() and e.name.endswith(suffix)
+            ]
+
+    def sha256(self, key):
+        return file_digests(os.path.join(self.root, key))[0]
+
+    def fetch(self, key, dest):
+        shutil.copyfile(os.path.join(self.root, key), dest)
+
+    def __repr__(self):
+        return f"LocalSource({self.root})"
+
+
+class MinioSource:
+    def __init__(self, bucket, prefix=""):
+        from uploader import minio_client_from_env
+        self.client = minio_client_from_env()
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def _name(self, key):
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def stat(self, key):
+        from minio.error import S3Error
+        try:
+            obj = self.client.stat_object(self.bucket, self._name(key))
+        except S3Error:
+            return None
+        return obj.size, obj.etag.strip('"')
+
+    def list(self, prefix, suffix=""):
+        out = []
+        skip = len(self.prefix) + 1 if self.prefix else 0
+        for obj in self.client.list_objects(self.bucket, prefix=self._name(prefix) + "/"):
+            if not obj.is_dir and obj.object_name.endswith(suffix):
+                out.append((obj.object_name[skip:], obj.size, obj.etag.strip('"')))
+        return out
+
+    def sha256(self, key):
+        """x-amz-meta-sha256 of the object, None when it was uploaded without one."""
+        obj = self.client.stat_object(self.bucket, self._name(key))
+        return {k.lower(): v for k, v in (obj.metadata or {}).items()}.get("x-amz-meta-sha256")
+
+    def fetch(self, key, dest):
+        self.client.fget_object(self.bucket, self._name(key), dest)
+
+    def __repr__(self):
+        return f"MinioSource({self.bucket}/{self.prefix})"
+
+
+def source_from_url(url):
+    if url.startswith("minio://"):
+        from uploader import split_minio_url
+        return MinioSource(*split_minio_url(url))
+    return LocalSource(url)
+
+
+# ----------------------------------------------------------
+# Cache
+# ----------------------------------------------------------
+
+def file_digests(path):
+    sha, md5 = hashlib.sha256(), hashlib.md5()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK):
+            sha.update(chunk)
+            md5.update(chunk)
+    return sha.hexdigest(), md5.hexdigest()
+
+
+def is_md5_etag(etag):
+    return len(etag) == 32 and all(c in "0123456789abcdef" for c in etag)
+
+
+class AssetCache:
+    """objects/ab/<sha256> plus index.json: "key|size|etag" → sha256."""
+
+    def __init__(self, root=CACHE_DIR):
+        self.root = root
+        self.objects = os.path.join(root, "objects")
+        self.index_path = os.path.join(root, "index.json")
+        os.makedirs(self.objects, exist_ok=True)
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                self.index = json.load(f)
+        self.lock = threading.Lock()
+
+    def object_path(self, sha):
+        return os.path.join(self.objects, sha[:2], sha)
+
+    def lookup(self, key, size, etag):
+        sha = self.index.get(f"{key}|{size}|{etag}")
+        if sha and os.path.exists(self.object_path(sha)):
+            return self.object_path(sha)
+        return None
+
+    def fetch(self, source, key, size, etag):
+        """
+        Download into the cache and verify it against the source's SHA-256,
+        else a plain-MD5 ETag, else the size. Returns the object path.
+        """
+        tmp = os.path.join(self.objects, f".{threading.get_ident()}-{os.path.basename(key)}.part")
+        expected = source.sha256(key)
+        source.fetch(key, tmp)
+        sha, md5 = file_digests(tmp)
+        actual = os.path.getsize(tmp)
+        if expected:
+            bad = sha != expected.lower()
+        else:
+            bad = is_md5_etag(etag) and md5 != etag
+        if actual != size or bad:
+            os.remove(tmp)
+            raise ValueError(f"Checksum mismatch for {key} (size {actual}/{size}, sha256 {sha}/{expected}, "
+                             f"md5 {md5}/{etag})")
+        obj = self.object_path(sha)
+        os.makedirs(os.path.dirname(obj), exist_ok=True)
+        os.replace(tmp, obj)
+        with self.lock:
+            self.index[f"{key}|{size}|{etag}"] = sha
+        return obj
+
+    def save(self):
+        tmp = f"{self.index_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f)
+        os.replace(tmp, self.index_path)
+
+
+def link_into(obj, dest):
+    """Hard link (copy across file systems); a dest already linked is kept."""
+    if os.path.exists(dest):
+        if os.path.samefile(obj, dest):
+            return
+        os.remove(dest)
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    try:
+        os.link(obj, dest)
+    except OSError:
+        shutil.copyfile(obj, dest)
+
+
+# ----------------------------------------------------------
+# Prefetch
+# ----------------------------------------------------------
+
+def resolve_entries(manifest, source, workers=FETCH_WORKERS):
+    """(key, size, etag) of every manifest file and listed folder entry; missing keys apart."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        stats = list(pool.map(source.stat, manifest["files"]))
+        listings = list(pool.map(lambda d: source.list(*d), manifest["dirs"].items()))
+    entries = [(key, *st) for key, st in zip(manifest["files"], stats) if st is not None]
+    missing = [key for key, st in zip(manifest["files"], stats) if st is None]
+    missing += [d for d, listing in zip(manifest["dirs"], listings) if not listing]
+    for listing in listings:
+        entries.extend(listing)
+    return entries, missing
+
+
+def prefetch(manifest, source, dest_root, cache: AssetCache, workers=FETCH_WORKERS, log=print):
+    """
+    Fetch what the cache lacks, link everything into dest_root.
+    Returns {"hits", "fetched", "bytes", "missing", "failed"}.
+    """
+    entries, missing = resolve_entries(manifest, source, workers)
+    result = {"hits": 0, "fetched": 0, "bytes": 0, "missing": missing, "failed": []}
+    lock = threading.Lock()
+
+    def _one(entry):
+        key, size, etag = entry
+        obj = cache.lookup(key, size, etag)
+        hit = obj is not None
+        if not hit:
+            obj = cache.fetch(source, key, size, etag)
+        link_into(obj, os.path.join(dest_root, key))
+        with lock:
+            if hit:
+                result["hits"] += 1
+            else:
+                result["fetched"] += 1
+                result["bytes"] += size
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_one, e): e[0] for e in entries}
+            for fut, key in futures.items():
+                try:
+                    fut.result()
+                except Exception as e:
+                    result["failed"].append(key)
+                    log(f"❌ {key}: {e}")
+    finally:
+        cache.save()
+    return result
+
+
+# ----------------------------------------------------------
+# Main
+# ----------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch the assets of a sweep through a local content-addressed cache")
+    parser.add_argument("--manifest", required=True, help="JSON from render-*.py --asset-manifest")
+    parser.add_argument("--source", required=True, help="minio://bucket/prefix or a local directory")
+    parser.add_argument("--dest", required=False, help="Asset root to populate (default: the manifest root)")
+    parser.add_argument("--cache", default=CACHE_DIR)
+    parser.add_argument("--workers", type=int, default=FETCH_WORKERS)
+    parser.add_argument("--extra", nargs="*", default=[], help="More keys to fetch (e.g. the .blend scene)")
+    args = parser.parse_args()
+
+    with open(args.manifest, encoding="utf-8") as f:
+        manifest = json.load(f)
+    manifest["files"] = sorted(set(manifest["files"]) | set(args.extra))
+    dest = args.dest or manifest["root"]
+    source = source_from_url(args.source)
+    cache = AssetCache(args.cache)
+
+    print(f"📦 {len(manifest['files'])} files + {len(manifest['dirs'])} folders from {source} → {dest}")
+    t0 = time.perf_counter()
+    result = prefetch(manifest, source, dest, cache, args.workers)
+    elapsed = time.perf_counter() - t0
+
+    print(f"✅ {result['hits']} cached, {result['fetched']} fetched "
+          f"({result['bytes'] / 1e6:.1f} MB) in {elapsed:.2f}s")
+    for key in result["missing"]:
+        print(f"⚠️ Missing on source: {key}")
+    for path in manifest.get("external", []):
+        print(f"⚠️ Outside the asset root, not fetched: {path}")
+    if result["missing"] or result["failed"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
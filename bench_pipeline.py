@@ -0,0 +1,306 @@
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+import xml.etree.ElementTree as ET
+import numpy as np
+import cv2
+
+import organize_masks_annotation as oma
+import organize_image_mask as oim
+from render_telemetry import peak_rss_mb
+
+# CPU-only benchmark of the post-processing pipeline on synthetic
+# SMPL-X-like label masks. Results are written as JSON so runs from two
+# commits can be compared with --compare.
+
+
+# ----------------------------------------------------------
+# Synthetic data
+# ----------------------------------------------------------
+
+def synth_label_mask(rng, width, height, n_labels, fragments, noise):
+    """
+    Body-like label map: a torso ellipse, limb/part ellipses each carrying
+    a pass index in 1..n_labels, small stray fragments per label and
+    optional salt noise (fraction of pixels set to a random label).
+    """
+    mask = np.zeros((height, width), dtype=np.uint8)
+    cx, cy = width // 2, height // 2
+    labels = rng.permutation(np.arange(1, n_labels + 1))
+
+    cv2.ellipse(mask, (cx, cy), (width // 7, height // 4), 0, 0, 360, int(labels[0]), -1)
+    for v in labels[1:]:
+        center = (
+            int(cx + rng.normal(0, width / 6)),
+            int(cy + rng.normal(0, height / 5)),
+        )
+        axes = (int(rng.uniform(0.02, 0.08) * width), int(rng.uniform(0.02, 0.12) * height))
+        cv2.ellipse(mask, center, axes, float(rng.uniform(0, 180)), 0, 360, int(v), -1)
+
+        for _ in range(fragments):
+            p = (int(rng.uniform(0, width)), int(rng.uniform(0, height)))
+            cv2.circle(mask, p, int(rng.uniform(1, 6)), int(v), -1)
+
+    if noise > 0:
+        hit = rng.random(mask.shape) < noise
+        mask[hit] = rng.integers(1, n_labels + 1, size=int(hit.sum()))
+
+    return mask
+
+
+def write_synthetic_dataset(root: Path, args):
+    """
+    Renders N (image, mask) pairs named like the Blender File Output
+    nodes, plus the label map JSON the annotator expects.
+    """
+    rng = np.random.default_rng(args.seed)
+    render_dir = root / "renders"
+    render_dir.mkdir()
+
+    for i in range(args.frames):
+        mask = synth_label_mask(rng, args.width, args.height, args.labels, args.fragments, args.noise)
+        meta = f"env=bench&cam=front&tex=none&rotZ={i % 8 * 45}&pose=pose{i:05d}&zoom=medium&char=bench"
+        cv2.imwrite(str(render_dir / f"segmentation-material&{meta}0001.png"), mask)
+        image = cv2.applyColorMap(mask * (255 // max(args.labels, 1)), cv2.COLORMAP_JET)
+        cv2.imwrite(str(render_dir / f"image&{meta}0001.png"), image)
+
+    label_json = root / "labels.json"
+    with open(label_json, "w") as f:
+        json.dump({f"part_{v:02d}": v for v in range(1, args.labels + 1)}, f)
+    return render_dir, label_json
+
+
+# ----------------------------------------------------------
+# Timing
+# ----------------------------------------------------------
+
+class StageTimer:
+    """
+    Seconds per stage and, with trace_memory, the peak of traced allocations
+    (tracemalloc: Python objects and NumPy / OpenCV arrays) above the level
+    at stage entry, so each stage reports its own working set instead of the
+    process-wide peak RSS. Stages must not nest.
+    """
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name, items=1, pixels=0):
+        if self.trace_memory:
+            start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        t0 = time.perf_counter()
+        yield
+        dt = time.perf_counter() - t0
+        s = self.stages.setdefault(name, {"seconds": 0.0, "items": 0, "pixels": 0, "peak_alloc_mb": None})
+        s["seconds"] += dt
+        s["items"] += items
+        s["pixels"] += pixels
+        if self.trace_memory:
+            peak = (tracemalloc.get_traced_memory()[1] - start) / 2**20
+            s["peak_alloc_mb"] = max(s["peak_alloc_mb"] or 0.0, peak)
+
+    def report(self):
+        out = {}
+        for name, s in self.stages.items():
+            sec = s["seconds"]
+            out[name] = {
+                "seconds": round(sec, 6),
+                "items": s["items"],
+                "items_per_s": round(s["items"] / sec, 2) if sec else None,
+                "mpx_per_s": round(s["pixels"] / sec / 1e6, 2) if sec and s["pixels"] else None,
+                "peak_alloc_mb": round(s["peak_alloc_mb"], 3) if s["peak_alloc_mb"] is not None else None,
+            }
+        return out
+
+
+# ----------------------------------------------------------
+# Pipelines
+# ----------------------------------------------------------
+
+def bench_organize(timer, render_dir: Path, out_dir: Path):
+    img_out = out_dir / "images"
+    mask_out = out_dir / "masks"
+    img_out.mkdir(parents=True)
+    mask_out.mkdir()
+
+    with timer.stage("organize.scan"):
+        files = oim.scan_files(render_dir)
+    timer.stages["organize.scan"]["items"] = len(files)
+
+    with timer.stage("organize.group", items=len(files)):
+        groups = oim.group_files(files)
+
+    with timer.stage("organize.copy", items=len(groups)):
+        oim.write_groups(groups, img_out, mask_out, out_dir / "data.csv")
+
+    return mask_out
+
+
+def synthetic_fusion(label_map, groups, size):
+    """First groups × size labels fused into group_0, group_1, ..."""
+    names = list(label_map)
+    return {
+        f"group_{g}": [label_map[n] for n in names[g * size:(g + 1) * size]]
+        for g in range(groups) if names[g * size:(g + 1) * size]
+    }
+
+
+def bench_annotate(timer, mask_dir: Path, label_json: Path, out_dir: Path, args):
+    """
+    organize_masks_annotation's CVAT path per mask: mask_instances (largest
+    components, fusion LUT, polygon simplification with a vertex budget),
+    then the XML write.
+    """
+    with open(label_json) as f:
+        label_map = json.load(f)
+    value_to_label = {int(v): k for k, v in label_map.items()}
+    fusion_label_to_values = synthetic_fusion(label_map, args.fusion_groups, args.fusion_size)
+    fused_values = {v for values in fusion_label_to_values.values() for v in values}
+    fusion_lut = oma.build_fusion_lut(fusion_label_to_values)
+    polygon_opts = dict(
+        epsilon_ratio=oma.POLYGON_EPSILON_RATIO,
+        chain_approx=oma.CHAIN_APPROX_MODES[oma.POLYGON_CHAIN_APPROX],
+        max_vertices=args.max_vertices,
+        iou_tolerance=oma.POLYGON_IOU_TOLERANCE,
+    )
+
+    cvat_root = oma.create_cvat_root()
+    for image_id, mask_path in enumerate(sorted(mask_dir.glob("*.png"))):
+        with timer.stage("annotate.load"):
+            mask = oma.load_mask(mask_path)
+        h, w = mask.shape
+        timer.stages["annotate.load"]["pixels"] += h * w
+
+        image_el = oma.create_cvat_image(cvat_root, image_id, mask_path.name, w, h)
+        instances = oma.mask_instances(
+            mask, value_to_label, fusion_label_to_values, fusion_lut, fused_values, polygon_opts,
+            stage=lambda name: timer.stage(f"annotate.{name}", pixels=h * w),
+        )
+        for label, _, _, _, polygons in instances:
+            for poly in polygons:
+                oma.add_cvat_polygon(image_el, label, poly)
+
+    with timer.stage("annotate.xml_write"):
+        ET.ElementTree(cvat_root).write(
+            out_dir / "annotations.xml", encoding="utf-8", xml_declaration=True
+        )
+
+
+# ----------------------------------------------------------
+# Compare
+# ----------------------------------------------------------
+
+def compare(baseline, current, threshold, min_seconds=0.01):
+    """
+    Prints per-stage time ratio current/baseline; returns the stages
+    slower than 1 + threshold. Stages shorter than min_seconds in both
+    runs are shown but never flagged (timer noise).
+    """
+    regressions = []
+    print(f"\n{'stage':22s} {'base s':>9s} {'now s':>9s} {'ratio':>7s}")
+    for name, now in current["stages"].items():
+        base = baseline["stages"].get(name)
+        if not base or not base["seconds"]:
+            continue
+        ratio = now["seconds"] / base["seconds"]
+        flag = ""
+        if ratio > 1 + threshold and max(base["seconds"], now["seconds"]) >= min_seconds:
+            regressions.append(name)
+            flag = " ⚠️"
+        print(f"{name:22s} {base['seconds']:9.4f} {now['seconds']:9.4f} {ratio:7.2f}{flag}")
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# ----------------------------------------------------------
+# Main
+# ----------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark organize_image_mask + organize_masks_annotation on synthetic masks"
+    )
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--width", type=int, default=1024)
+    parser.add_argument("--height", type=int, default=1024)
+    parser.add_argument("--labels", type=int, default=40, help="Pass indices per mask")
+    parser.add_argument("--fragments", type=int, default=3, help="Stray blobs per label")
+    parser.add_argument("--noise", type=float, default=0.0, help="Fraction of salt-noise pixels")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fusion-groups", type=int, default=4, help="Fused classes (0 = no fusion)")
+    parser.add_argument("--fusion-size", type=int, default=3, help="Labels per fused class")
+    parser.add_argument("--max-vertices", type=int, default=32,
+                        help="Polygon vertex budget (0 = epsilon only, the annotator default)")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="Skip per-stage tracemalloc (its overhead skews the timings slightly)")
+    parser.add_argument("--json-out", default="bench_results.json")
+    parser.add_argument("--compare", required=False,
+                        help="Baseline results JSON; exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Allowed slowdown ratio before flagging a stage")
+    args = parser.parse_args()
+
+    timer = StageTimer(trace_memory=not args.no_memory)
+    if timer.trace_memory:
+        tracemalloc.start()
+    with tempfile.TemporaryDirectory(prefix="bench-pipeline-") as tmp:
+        root = Path(tmp)
+        print(f"🧪 Generating {args.frames} synthetic frames {args.width}×{args.height}, {args.labels} labels")
+        render_dir, label_json = write_synthetic_dataset(root, args)
+
+        mask_dir = bench_organize(timer, render_dir, root / "images-masks")
+        bench_annotate(timer, mask_dir, label_json, root, args)
+    if timer.trace_memory:
+        tracemalloc.stop()
+
+    results = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {k: v for k, v in vars(args).items() if k not in ("json_out", "compare", "threshold")},
+        "stages": timer.report(),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+    print(f"\n{'stage':22s} {'seconds':>9s} {'items/s':>9s} {'Mpx/s':>8s} {'alloc MB':>9s}")
+    for name, s in results["stages"].items():
+        print(
+            f"{name:22s} {s['seconds']:9.4f} {s['items_per_s'] or 0:9.1f} "
+            f"{s['mpx_per_s'] or 0:8.1f} {s['peak_alloc_mb'] or 0:9.2f}"
+        )
+    print(f"Peak RSS {results['peak_rss_mb'] or 0:.0f} MB")
+
+    with open(args.json_out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults → {args.json_out}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("config") != results["config"]:
+            print("⚠️ Baseline was run with a different config; ratios are not comparable.")
+        regressions = compare(baseline, results, args.threshold)
+        if regressions:
+            print(f"\n❌ Regressions: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+import sys
+
+# Command-line helpers shared by the scripts Blender runs with -P. No bpy
+# import here, so render_sweep.py and the tests load it with plain Python.
+#
+#   blender -b scene.blend -P utils/pose.py -- --armature main_armature
+
+
+def script_args(argv=None):
+    """
+    CLI arguments of a Blender script: everything after `--` when run as
+    `blender -b scene.blend -P script.py -- --shard 0/4`, all of argv[1:]
+    when run with plain Python.
+    """
+    argv = sys.argv if argv is None else argv
+    if "--" in argv:
+        return argv[argv.index("--") + 1:]
+    return [] if "bpy" in sys.modules else argv[1:]
+
@@ -0,0 +1,233 @@
+import argparse
+import itertools
+import json
+import random
+import time
+from pathlib import Path
+import numpy as np
+import cv2
+
+from organize_masks_annotation import (
+    POLYGON_EPSILON_RATIO,
+    MIN_COMPONENT_AREA_PX,
+    MIN_COMPONENT_AREA_RATIO,
+    MAX_SEG_PER_CLASS,
+    add_polygon_args,
+    build_fusion_lut,
+    load_fusion_rules,
+    load_mask,
+    find_unique_labels,
+    extract_binary_mask,
+    fused_masks,
+    polygon_opts_from_args,
+    simplify_contour,
+)
+from label_store import LabelStore
+
+# Samples K masks, caches connected components + raw contours once, then
+# scores every parameter combination against that cache:
+#   - polygon vertex count (simplify_contour per epsilon with the annotator's
+#     --chain-approx / --max-vertices / --iou-tolerance, cached)
+#   - dropped area % (components removed by min area / max per class;
+#     fused groups keep all their components, like organize_masks_annotation)
+#   - estimated time per image (component/contour pass + simplification),
+#     with mask decoding reported separately
+
+
+# ----------------------------------------------------------
+# Cache
+# ----------------------------------------------------------
+
+def component_contours(binary, chain_approx):
+    """(area, external contours) of each component of a 0/255 mask, largest first."""
+    num_labels, labels, stats, _ = cv2.connectedComponentsWithStats(
+        binary, connectivity=8
+    )
+    contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, chain_approx)
+    # each external contour belongs to the component under its first point
+    by_comp = {}
+    for cnt in contours:
+        x, y = cnt[0, 0]
+        by_comp.setdefault(int(labels[y, x]), []).append(cnt)
+
+    return sorted(
+        (
+            (int(stats[i, cv2.CC_STAT_AREA]), by_comp.get(i, []))
+            for i in range(1, num_labels)
+        ),
+        key=lambda c: c[0], reverse=True
+    )
+
+
+def cache_components(mask, values, chain_approx, fusion_label_to_values=None, fusion_lut=None):
+    """
+    Components and contours of each labelled non-fused pass index, then of
+    each fused group present (see fused_masks). Fused classes
+    are flagged: the annotator keeps all of their components.
+    """
+    h, w = mask.shape
+    classes = []
+    fused_values = set().union(*(fusion_label_to_values or {}).values())
+    for v in values:
+        if v not in fused_values:
+            classes.append((False, component_contours(extract_binary_mask(mask, v), chain_approx)))
+
+    for _, merged in fused_masks(mask, set(values), fusion_label_to_values or {}, fusion_lut):
+        classes.append((True, component_contours(merged, chain_approx)))
+    return {"image_area": h * w, "classes": classes}
+
+
+class ApproxCache:
+    """
+    simplify_contour results (vertex count, seconds) per (image, class,
+    component, contour) index and epsilon.
+    """
+
+    def __init__(self, max_vertices=0, iou_tolerance=0.02):
+        self.max_vertices = max_vertices
+        self.iou_tolerance = iou_tolerance
+        self.cache = {}
+
+    def vertices(self, key, cnt, epsilon_ratio):
+        key = (*key, epsilon_ratio)
+        if key not in self.cache:
+            t0 = time.perf_counter()
+            n = 0
+            if len(cnt) >= 3:
+                approx = simplify_contour(cnt, epsilon_ratio, self.max_vertices, self.iou_tolerance)
+                n = len(approx) if len(approx) >= 3 else 0
+            self.cache[key] = (n, time.perf_counter() - t0)
+        return self.cache[key]
+
+
+# ----------------------------------------------------------
+# Evaluation
+# ----------------------------------------------------------
+
+def evaluate(cached, approx, base_seconds, epsilon_ratio, min_area_px, min_area_ratio, max_seg):
+    vertices = 0
+    polygons = 0
+    total_area = 0
+    kept_area = 0
+    seconds = base_seconds
+
+    for i_img, img in enumerate(cached):
+        min_area = max(min_area_px, int(img["image_area"] * min_area_ratio))
+        for i_cls, (fused, comps) in enumerate(img["classes"]):
+            total_area += sum(a for a, _ in comps)
+            kept = comps if fused else [c for c in comps if c[0] >= min_area][:max(max_seg, 0)]
+            for i_comp, (area, contours) in enumerate(kept):
+                kept_area += area
+                for i_cnt, cnt in enumerate(contours):
+                    n, dt = approx.vertices((i_img, i_cls, i_comp, i_cnt), cnt, epsilon_ratio)
+                    vertices += n
+                    polygons += n > 0
+                    seconds += dt
+
+    n_images = max(len(cached), 1)
+    return {
+        "epsilon_ratio": epsilon_ratio,
+        "min_area_px": min_area_px,
+        "min_area_ratio": min_area_ratio,
+        "max_seg": max_seg,
+        "polygons_per_image": polygons / n_images,
+        "vertices_per_image": vertices / n_images,
+        "dropped_area_pct": 100.0 * (1 - kept_area / total_area) if total_area else 0.0,
+        "ms_per_image": 1000 * seconds / n_images,
+    }
+
+
+def parse_list(text, cast):
+    return [cast(x) for x in text.split(",") if x]
+
+
+# ----------------------------------------------------------
+# Main
+# ----------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Calibrate polygon / component thresholds on a cached mask sample"
+    )
+    mask_src = parser.add_mutually_exclusive_group(required=True)
+    mask_src.add_argument("--mask-dir")
+    mask_src.add_argument("--mask-store")
+    parser.add_argument("--annotation-json", required=True)
+    parser.add_argument("--fusion-json", required=False,
+                        help="Fusion rules, as passed to organize_masks_annotation.py")
+    add_polygon_args(parser)
+    parser.add_argument("--samples", type=int, default=50, help="K masks to sample")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--epsilon", default=f"0.0005,{POLYGON_EPSILON_RATIO},0.002,0.004")
+    parser.add_argument("--min-area-px", default=f"500,{MIN_COMPONENT_AREA_PX},3000")
+    parser.add_argument("--min-area-ratio", default=f"0.0001,{MIN_COMPONENT_AREA_RATIO},0.001")
+    parser.add_argument("--max-seg", default=f"1,{MAX_SEG_PER_CLASS},4")
+    parser.add_argument("--json-out", required=False)
+    args = parser.parse_args()
+
+    with open(args.annotation_json) as f:
+        label_map = json.load(f)
+    known_values = {int(v) for v in label_map.values()}
+    fusion_label_to_values, _ = load_fusion_rules(label_map, args.fusion_json)
+    fusion_lut = build_fusion_lut(fusion_label_to_values)
+    polygon_opts = polygon_opts_from_args(args)
+
+    if args.mask_store:
+        store = LabelStore(Path(args.mask_store))
+        names = store.names
+        get_mask = store.get
+    else:
+        mask_dir = Path(args.mask_dir)
+        names = sorted(p.name for p in mask_dir.glob("*.png"))
+        get_mask = lambda name: load_mask(mask_dir / name)
+
+    sample = random.Random(args.seed).sample(names, min(args.samples, len(names)))
+
+    # --------------------- build cache once ---------------------
+    cached = []
+    decode_seconds = base_seconds = 0.0
+    for name in sample:
+        t0 = time.perf_counter()
+        mask = np.asarray(get_mask(name))
+        t1 = time.perf_counter()
+        values = [v for v in find_unique_labels(mask) if v in known_values]
+        cached.append(cache_components(
+            mask, values, polygon_opts["chain_approx"], fusion_label_to_values, fusion_lut
+        ))
+        decode_seconds += t1 - t0
+        base_seconds += time.perf_counter() - t1
+    decode_ms = 1000 * decode_seconds / max(len(cached), 1)
+    print(f"🗂️ Cached {len(cached)} masks in {base_seconds:.2f}s (+ {decode_seconds:.2f}s decoding, "
+          f"{decode_ms:.2f} ms/img, not in ms/img below)")
+
+    # --------------------- sweep grid ---------------------
+    grid = list(itertools.product(
+        parse_list(args.epsilon, float),
+        parse_list(args.min_area_px, int),
+        parse_list(args.min_area_ratio, float),
+        parse_list(args.max_seg, int),
+    ))
+    approx = ApproxCache(polygon_opts["max_vertices"], polygon_opts["iou_tolerance"])
+    t0 = time.perf_counter()
+    results = [evaluate(cached, approx, base_seconds, *params) for params in grid]
+    print(f"⚙️ Evaluated {len(grid)} combinations in {time.perf_counter() - t0:.2f}s\n")
+
+    current = (POLYGON_EPSILON_RATIO, MIN_COMPONENT_AREA_PX, MIN_COMPONENT_AREA_RATIO, MAX_SEG_PER_CLASS)
+    print(f"{'eps':>8s} {'min px':>7s} {'min ratio':>10s} {'seg':>4s} {'poly/img':>9s} {'vert/img':>9s} {'drop %':>7s} {'ms/img':>7s}")
+    for r in results:
+        params = (r["epsilon_ratio"], r["min_area_px"], r["min_area_ratio"], r["max_seg"])
+        mark = " ◀ current" if params == current else ""
+        print(
+            f"{r['epsilon_ratio']:8.4f} {r['min_area_px']:7d} {r['min_area_ratio']:10.5f} "
+            f"{r['max_seg']:4d} {r['polygons_per_image']:9.1f} {r['vertices_per_image']:9.1f} "
+            f"{r['dropped_area_pct']:7.2f} {r['ms_per_image']:7.2f}{mark}"
+        )
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"samples": sample, "decode_ms_per_image": decode_ms, "results": results}, f, indent=2)
+        print(f"\nResults → {args.json_out}")
+
+
+if __name__ == "__main__":
+    main()
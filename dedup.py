@@ -0,0 +1,149 @@
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+import numpy as np
+import cv2
+
+# Near-duplicate detection for rendered (image, mask) pairs:
+#   - 64-bit difference hash (dHash) of the grayscale image and of the mask,
+#     concatenated into one 128-bit key
+#   - multi-index hashing: with radius r the key is split into r + 1 bands,
+#     two keys within Hamming distance r share at least one band exactly, so a
+#     lookup is a few dict hits instead of a scan
+#   - append-only JSONL store, so the index grows across sweeps
+#
+#   python dedup.py --img-dir /tmp/blender-outputs --radius 6
+
+HASH_SIZE = 8
+KEY_BITS = 2 * HASH_SIZE * HASH_SIZE
+DEDUP_RADIUS = 6
+
+
+def dhash(gray, hash_size=HASH_SIZE):
+    """Row-gradient sign hash of an (h, w) array as a Python int."""
+    small = cv2.resize(np.asarray(gray, dtype=np.float32), (hash_size + 1, hash_size),
+                       interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def read_gray_reduced(path: Path):
+    """Grayscale at 1/4 resolution (decoder-side reduction where supported)."""
+    img = cv2.imread(str(path), cv2.IMREAD_REDUCED_GRAYSCALE_4)
+    if img is None:
+        raise ValueError(f"Cannot read image: {path}")
+    return img
+
+
+def pair_key(image_path: Path | None, mask_path: Path | None):
+    """128-bit key: image dHash in the high half, mask dHash in the low half."""
+    half = HASH_SIZE * HASH_SIZE
+    image_hash = dhash(read_gray_reduced(image_path)) if image_path is not None else 0
+    mask_hash = 0
+    if mask_path is not None:
+        from mask_io import read_mask
+        mask_hash = dhash(read_mask(mask_path))
+    return (image_hash << half) | mask_hash
+
+
+class DedupIndex:
+    """
+    Hamming-radius lookup over 128-bit keys. Entries are (key, name); with a
+    path, they are loaded from and appended to a JSONL file.
+    """
+
+    def __init__(self, radius=DEDUP_RADIUS, path: Path | None = None, bits=KEY_BITS):
+        self.radius = radius
+        self.bits = bits
+        n_bands = radius + 1
+        edges = np.linspace(0, bits, n_bands + 1).astype(int)
+        self.bands = [(int(lo), int(hi - lo)) for lo, hi in zip(edges[:-1], edges[1:])]
+        self.tables = [{} for _ in self.bands]
+        self.keys = []
+        self.names = []
+        self.path = path
+        self.f = None
+        if path is not None:
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            rec = json.loads(line)
+                            self._insert(int(rec["key"], 16), rec["name"])
+            self.f = open(path, "a", encoding="utf-8")
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _band_values(self, key):
+        return [(key >> lo) & ((1 << width) - 1) for lo, width in self.bands]
+
+    def _insert(self, key, name):
+        idx = len(self.keys)
+        self.keys.append(key)
+        self.names.append(name)
+        for table, value in zip(self.tables, self._band_values(key)):
+            table.setdefault(value, []).append(idx)
+
+    def add(self, key, name):
+        self._insert(key, name)
+        if self.f:
+            self.f.write(json.dumps({"key": f"{key:032x}", "name": name}) + "\n")
+
+    def query(self, key):
+        """Closest indexed entry within radius as (distance, name), or None."""
+        best = None
+        seen = set()
+        for table, value in zip(self.tables, self._band_values(key)):
+            for idx in table.get(value, ()):
+                if idx in seen:
+                    continue
+                seen.add(idx)
+                d = (self.keys[idx] ^ key).bit_count()
+                if d <= self.radius and (best is None or d < best[0]):
+                    best = (d, self.names[idx])
+        return best
+
+    def close(self):
+        if self.f:
+            self.f.close()
+            self.f = None
+
+
+# ----------------------------------------------------------
+# Main
+# ----------------------------------------------------------
+
+def main():
+    from organize_image_mask import scan_files, group_files
+
+    parser = argparse.ArgumentParser(description="Count near-duplicate image/mask pairs in a render folder")
+    parser.add_argument("--img-dir", required=True)
+    parser.add_argument("--radius", type=int, default=DEDUP_RADIUS, help="Max Hamming distance (of 128 bits)")
+    parser.add_argument("--index", required=False, help="Persistent index JSONL to check against / extend")
+    args = parser.parse_args()
+
+    groups = group_files(scan_files(Path(args.img_dir)))
+    index = DedupIndex(args.radius, Path(args.index) if args.index else None)
+    print(f"🗂️ {len(index)} indexed pairs, {len(groups)} new groups")
+
+    t0 = time.perf_counter()
+    duplicates = 0
+    for entry in groups.values():
+        key = pair_key(entry["image"], entry["mask"])
+        name = (entry["mask"] or entry["image"]).name
+        hit = index.query(key)
+        if hit:
+            duplicates += 1
+            print(f"♊ {name} ≈ {hit[1]} (distance {hit[0]})")
+        else:
+            index.add(key, name)
+    index.close()
+    elapsed = time.perf_counter() - t0
+    print(f"📊 {duplicates}/{len(groups)} near-duplicates in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
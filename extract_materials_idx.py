@@ -1,6 +1,11 @@
+import argparse
 import bpy
 import json
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))  # repo root: blender -P does not add it
+from blender_args import script_args
 
 # Output file (absolute path or relative to blend file)
 OUTPUT_JSON = os.path.join(bpy.path.abspath("//"), "materials_pass_index.json")
@@ -29,10 +34,6 @@ def export_material_pass_indices(output_path=None):
     
     return result
 
-# Run the exporter
-data = export_material_pass_indices()
-#print("Material Passes",data)
-
 # -----------------------------------------------------------
 # 2. EXPORT MATERIALS
 # -----------------------------------------------------------
@@ -177,11 +178,34 @@ def import_materials(json_path):
 
 
 # -----------------------------------------------------------
-# EXAMPLE USAGE
+# MAIN
 # -----------------------------------------------------------
 
-# Export from any .blend
-export_materials("/tmp/materials_export.json")
-
-# Import into a new empty blend
-# import_materials("/tmp/materials_export.json")
+def main(argv=None):
+    """
+    blender -b scene.blend -P extract_materials_idx.py -- [--export PATH]
+        [--pass-index-json PATH] [--import PATH]
+    """
+    if argv is None:
+        argv = script_args()
+    parser = argparse.ArgumentParser(description="Export / import materials and their pass indices")
+    parser.add_argument("--export", default="/tmp/materials_export.json",
+                        help="Material export JSON (shader type, pass index, params)")
+    parser.add_argument("--pass-index-json", required=False,
+                        help=f"Also write material → pass index (e.g. {OUTPUT_JSON})")
+    parser.add_argument("--import", dest="import_json", required=False,
+                        help="Rebuild materials from an export JSON instead of exporting")
+    args = parser.parse_args(argv)
+
+    if args.import_json:
+        # Import into a new empty blend
+        import_materials(args.import_json)
+        return
+
+    export_material_pass_indices(args.pass_index_json)
+    # Export from any .blend
+    export_materials(args.export)
+
+
+if __name__ == "__main__":
+    main()
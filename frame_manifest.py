@@ -0,0 +1,88 @@
+import hashlib
+import json
+import os
+import re
+
+# Filename codec for rendered frames. Outputs are named
+#
+#   {node}_{frame id}_0001.png      e.g. segmentation-material_3f9c0e12ab45d701_0001.png
+#
+# (Blender appends the frame number) and every parameter of the frame - axis
+# values, seed, noisy camera / object positions, visible fraction, written
+# files - is appended as one JSON line to frames.jsonl next to the outputs.
+# The frame id is a 64-bit BLAKE2b of (seed, job key), so names carry no
+# user strings and the same job under another seed does not overwrite.
+
+MANIFEST_NAME = "frames.jsonl"
+FRAME_ID_BYTES = 8
+OUTPUT_NAME_RE = re.compile(rf"^(?P<node>.+)_(?P<id>[0-9a-f]{{{2 * FRAME_ID_BYTES}}})_(?P<frame>\d*)$")
+
+
+def frame_id(key, seed):
+    return hashlib.blake2b(f"{seed}|{key}".encode(), digest_size=FRAME_ID_BYTES).hexdigest()
+
+
+def output_name(node_name, fid):
+    """File Output slot path; Blender appends the frame number."""
+    return f"{node_name}_{fid}_"
+
+
+def parse_output_name(filename):
+    """(node, frame id) of a codec filename, None for anything else."""
+    m = OUTPUT_NAME_RE.match(os.path.splitext(os.path.basename(filename))[0])
+    return (m["node"], m["id"]) if m else None
+
+
+def frame_record(fid, key, meta, seed, camera, obj=None, visible=None, files=None):
+    return {
+        "id": fid,
+        "job": key,
+        "meta": meta,
+        "seed": seed,
+        "camera": [round(v, 6) for v in camera],
+        "object": [round(v, 6) for v in obj] if obj is not None else None,
+        "visible": round(visible, 4) if visible is not None else None,
+        "files": files or {},
+    }
+
+
+def csv_fields(record):
+    """Flat columns for data.csv: axis values, then seed and sampled noise."""
+    fields = {"frame_id": record["id"], **record["meta"]}
+    fields["seed"] = record["seed"]
+    for axis, v in zip("xyz", record["camera"]):
+        fields[f"cam_{axis}"] = v
+    if record.get("object") is not None:
+        for axis, v in zip("xyz", record["object"]):
+            fields[f"obj_{axis}"] = v
+    if record.get("visible") is not None:
+        fields["visible"] = record["visible"]
+    return fields
+
+
+class ManifestWriter:
+    """Append-only, line-buffered so a killed render keeps every finished frame."""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.f = open(path, "a", encoding="utf-8", buffering=1)
+
+    def write(self, record):
+        self.f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def close(self):
+        self.f.close()
+
+
+def load_manifest(path):
+    """frame id → record (a re-rendered frame keeps its latest record)."""
+    records = {}
+    if not path or not os.path.exists(path):
+        return records
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                rec = json.loads(line)
+                records[rec["id"]] = rec
+    return records
@@ -0,0 +1,119 @@
+import argparse
+import json
+import time
+from pathlib import Path
+import numpy as np
+
+# Cheap per-frame quality gate on the label mask (NumPy only, so it also runs
+# inside Blender on the IndexMA pass). Computed on a strided downsample:
+#   - foreground fraction (pixels with a non-zero pass index)
+#   - number of classes and the image fraction of the largest one
+#   - image edges touched by the foreground (character cropped by the frame)
+#
+#   python frame_quality.py --mask-dir ./data/images-masks/masks   # reasons histogram
+
+QUALITY_DOWNSAMPLE = 4
+MIN_FOREGROUND_FRACTION = 0.01
+MAX_DOMINANT_CLASS_FRACTION = 0.90
+MIN_CLASSES = 2
+MAX_TRUNCATED_EDGES = 2
+
+
+def frame_stats(mask, downsample=QUALITY_DOWNSAMPLE):
+    small = np.asarray(mask)[::downsample, ::downsample]
+    fg = small != 0
+    counts = np.bincount(small.ravel()) if small.size else np.zeros(1, dtype=np.int64)
+    counts[0] = 0
+    edges = {
+        "top": fg[0].any(),
+        "bottom": fg[-1].any(),
+        "left": fg[:, 0].any(),
+        "right": fg[:, -1].any(),
+    }
+    return {
+        "foreground_fraction": float(fg.mean()) if small.size else 0.0,
+        "classes": int(np.count_nonzero(counts)),
+        "dominant_class_fraction": float(counts.max() / small.size) if small.size else 0.0,
+        "truncated_edges": [name for name, touched in edges.items() if touched],
+    }
+
+
+def reject_reasons(stats,
+                   min_foreground=MIN_FOREGROUND_FRACTION,
+                   max_dominant=MAX_DOMINANT_CLASS_FRACTION,
+                   min_classes=MIN_CLASSES,
+                   max_truncated_edges=MAX_TRUNCATED_EDGES):
+    """Empty list = keep the frame."""
+    reasons = []
+    if stats["foreground_fraction"] < min_foreground:
+        reasons.append(f"foreground {stats['foreground_fraction']:.4f} < {min_foreground}")
+    if stats["classes"] < min_classes:
+        reasons.append(f"classes {stats['classes']} < {min_classes}")
+    if stats["dominant_class_fraction"] > max_dominant:
+        reasons.append(f"dominant class covers {stats['dominant_class_fraction']:.2f} > {max_dominant}")
+    if len(stats["truncated_edges"]) > max_truncated_edges:
+        reasons.append(f"truncated at {'/'.join(stats['truncated_edges'])}")
+    return reasons
+
+
+def check_frame(mask, downsample=QUALITY_DOWNSAMPLE, **thresholds):
+    stats = frame_stats(mask, downsample)
+    return stats, reject_reasons(stats, **thresholds)
+
+
+def add_threshold_args(parser):
+    """Shared CLI flags (organize_image_mask.py, this script)."""
+    parser.add_argument("--min-foreground", type=float, default=MIN_FOREGROUND_FRACTION)
+    parser.add_argument("--max-dominant", type=float, default=MAX_DOMINANT_CLASS_FRACTION)
+    parser.add_argument("--min-classes", type=int, default=MIN_CLASSES)
+    parser.add_argument("--max-truncated-edges", type=int, default=MAX_TRUNCATED_EDGES)
+    parser.add_argument("--quality-downsample", type=int, default=QUALITY_DOWNSAMPLE)
+
+
+def thresholds_from_args(args):
+    return {
+        "min_foreground": args.min_foreground,
+        "max_dominant": args.max_dominant,
+        "min_classes": args.min_classes,
+        "max_truncated_edges": args.max_truncated_edges,
+    }
+
+
+# ----------------------------------------------------------
+# Main
+# ----------------------------------------------------------
+
+def main():
+    from mask_io import read_mask
+
+    parser = argparse.ArgumentParser(description="Report frames the quality gate would reject")
+    parser.add_argument("--mask-dir", required=True)
+    parser.add_argument("--json-out", required=False, help="Per-mask stats and reasons")
+    add_threshold_args(parser)
+    args = parser.parse_args()
+
+    thresholds = thresholds_from_args(args)
+    results = {}
+    reasons_count = {}
+    t0 = time.perf_counter()
+    for mask_path in sorted(Path(args.mask_dir).glob("*.png")):
+        stats, reasons = check_frame(read_mask(mask_path), args.quality_downsample, **thresholds)
+        results[mask_path.name] = {**stats, "reasons": reasons}
+        for r in reasons:
+            kind = r.split()[0]
+            reasons_count[kind] = reasons_count.get(kind, 0) + 1
+    elapsed = time.perf_counter() - t0
+
+    rejected = sum(1 for r in results.values() if r["reasons"])
+    print(f"🔎 {len(results)} masks in {elapsed:.2f}s, {rejected} would be rejected")
+    for kind, n in sorted(reasons_count.items(), key=lambda x: -x[1]):
+        print(f"   {kind:12s} {n}")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Stats → {args.json_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import json
+import os
+import numpy as np
+
+# NumPy only: this module is imported from inside Blender (no cv2 / PIL there)
+# and by the offline annotation scripts.
+
+
+# ----------------------------------------------------------
+# RLE
+# ----------------------------------------------------------
+
+def encode_rle(binary_mask):
+    """
+    COCO uncompressed RLE: column-major run lengths,
+    starting with a (possibly empty) background run.
+    """
+    h, w = binary_mask.shape
+    pixels = binary_mask.T.ravel() > 0
+    changes = np.flatnonzero(pixels[1:] != pixels[:-1]) + 1
+    runs = np.diff(np.concatenate(([0], changes, [pixels.size])))
+    counts = runs.tolist()
+    if pixels.size and pixels[0]:
+        counts = [0] + counts
+    return {"size": [h, w], "counts": counts}
+
+
+def decode_rle(rle):
+    h, w = rle["size"]
+    counts = rle["counts"]
+    flat = np.repeat(np.arange(len(counts)) % 2, counts).astype(bool)
+    return flat.reshape(w, h).T
+
+
+# ----------------------------------------------------------
+# Render result → label mask
+# ----------------------------------------------------------
+
+def labels_from_index_pass(pixels, width, height):
+    """
+    Convert a flat RGBA float buffer (Blender image.pixels layout:
+    bottom row first) holding the IndexMA pass into a 2D label mask
+    (top row first), uint8 or uint16 depending on the max index.
+    """
+    buf = np.asarray(pixels, dtype=np.float32).reshape(height, width, -1)
+    index = np.rint(buf[::-1, :, 0])
+    dtype = np.uint8 if index.max(initial=0) <= 255 else np.uint16
+    return index.astype(dtype)
+
+
+def summarize_label_mask(label_mask, value_to_label=None):
+    """
+    Compact per-frame label outputs: histogram, and per pass index
+    its bbox [x, y, w, h], area and RLE. The RLEs together are
+    lossless, so the label mask can be rebuilt without the PNG.
+    """
+    h, w = label_mask.shape
+    hist = np.bincount(label_mask.ravel())
+    values = np.flatnonzero(hist)
+
+    labels = []
+    for v in values:
+        if v == 0:
+            continue
+        binary = label_mask == v
+        rows = np.flatnonzero(binary.any(axis=1))
+        cols = np.flatnonzero(binary.any(axis=0))
+        entry = {
+            "value": int(v),
+            "bbox": [
+                int(cols[0]), int(rows[0]),
+                int(cols[-1] - cols[0] + 1), int(rows[-1] - rows[0] + 1)
+            ],
+            "area": int(hist[v]),
+            "rle": encode_rle(binary),
+        }
+        if value_to_label and int(v) in value_to_label:
+            entry["label"] = value_to_label[int(v)]
+        labels.append(entry)
+
+    return {
+        "size": [h, w],
+        "histogram": {str(int(v)): int(hist[v]) for v in values},
+        "labels": labels,
+    }
+
+
+def write_frame_labels(label_mask, out_dir, stem, value_to_label=None):
+    """
+    Write {stem}.labels.json next to the rendered frame.
+    """
+    path = os.path.join(out_dir, f"{stem}.labels.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            summarize_label_mask(label_mask, value_to_label),
+            f, separators=(",", ":")
+        )
+    return path
+
+
+def load_frame_labels(path):
+    """
+    Rebuild the label mask from a .labels.json written by write_frame_labels.
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    h, w = data["size"]
+    max_value = max((e["value"] for e in data["labels"]), default=0)
+    mask = np.zeros((h, w), dtype=np.uint8 if max_value <= 255 else np.uint16)
+    for e in data["labels"]:
+        mask[decode_rle(e["rle"])] = e["value"]
+    return mask
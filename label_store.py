@@ -0,0 +1,150 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+import numpy as np
+
+# Compact label-map storage: masks are stacked as raw uint8/uint16 arrays
+# in fixed-size shards (shard_XXXXX.bin) described by an index.json, so any
+# mask can be memory-mapped and read without PNG/zlib decoding.
+#
+#   store/
+#     index.json        {"version", "shards": [...], "items": [...]}
+#     shard_00000.bin   (n, h, w) C-order, dtype from the index
+
+INDEX_NAME = "index.json"
+STORE_VERSION = 1
+
+
+class LabelStoreWriter:
+    """
+    Appends masks to shards; a new shard starts when the current one is
+    full or the mask shape/dtype changes. index.json is written on close.
+    """
+
+    def __init__(self, out_dir: Path, shard_size=256):
+        self.out_dir = Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.shard_size = shard_size
+        self.shards = []
+        self.items = []
+        self.f = None
+
+    def _open_shard(self, shape, dtype):
+        if self.f:
+            self.f.close()
+        filename = f"shard_{len(self.shards):05d}.bin"
+        self.shards.append({
+            "file": filename,
+            "dtype": np.dtype(dtype).name,
+            "shape": [0, *shape],
+        })
+        self.f = open(self.out_dir / filename, "wb")
+
+    def append(self, name, mask):
+        shard = self.shards[-1] if self.shards else None
+        if (
+            shard is None
+            or shard["shape"][0] >= self.shard_size
+            or list(mask.shape) != shard["shape"][1:]
+            or mask.dtype.name != shard["dtype"]
+        ):
+            self._open_shard(mask.shape, mask.dtype)
+            shard = self.shards[-1]
+
+        self.f.write(np.ascontiguousarray(mask).tobytes())
+        self.items.append({
+            "name": name,
+            "shard": len(self.shards) - 1,
+            "offset": shard["shape"][0],
+        })
+        shard["shape"][0] += 1
+
+    def close(self):
+        if self.f:
+            self.f.close()
+            self.f = None
+        with open(self.out_dir / INDEX_NAME, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": STORE_VERSION,
+                "shards": self.shards,
+                "items": self.items,
+            }, f)
+
+
+class LabelStore:
+    """
+    Random-access reader: masks are memory-mapped views into the shards.
+    """
+
+    def __init__(self, store_dir: Path):
+        self.store_dir = Path(store_dir)
+        with open(self.store_dir / INDEX_NAME, encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") != STORE_VERSION:
+            raise ValueError(
+                f"Unsupported label store version {index.get('version')} in {store_dir}"
+            )
+        self.shards = index["shards"]
+        self.items = index["items"]
+        self.names = [it["name"] for it in self.items]
+        self._name_to_idx = {n: i for i, n in enumerate(self.names)}
+        self._maps = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def shard(self, shard_idx):
+        """(n, h, w) memmap of a whole shard, for batched processing."""
+        if shard_idx not in self._maps:
+            s = self.shards[shard_idx]
+            self._maps[shard_idx] = np.memmap(
+                self.store_dir / s["file"], dtype=s["dtype"], mode="r",
+                shape=tuple(s["shape"])
+            )
+        return self._maps[shard_idx]
+
+    def __getitem__(self, idx):
+        it = self.items[idx]
+        return self.shard(it["shard"])[it["offset"]]
+
+    def get(self, name):
+        return self[self._name_to_idx[name]]
+
+
+# ----------------------------------------------------------
+# PNG → store converter
+# ----------------------------------------------------------
+
+def build_store(mask_dir: Path, out_dir: Path, shard_size=256):
+    """Packs the PNG masks of mask_dir (sorted by name); returns the closed writer."""
+    from mask_io import read_mask
+
+    mask_paths = sorted(Path(mask_dir).glob("*.png"))
+    writer = LabelStoreWriter(Path(out_dir), shard_size)
+    for i, mask_path in enumerate(mask_paths, start=1):
+        sys.stdout.write(f"\rPacking {mask_path.name} {i}/{len(mask_paths)}")
+        sys.stdout.flush()
+        writer.append(mask_path.name, read_mask(mask_path))
+    writer.close()
+    if mask_paths:
+        sys.stdout.write("\n")
+    return writer
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert a directory of PNG masks into a memory-mappable label store"
+    )
+    parser.add_argument("--mask-dir", required=True)
+    parser.add_argument("--out-dir", required=True)
+    parser.add_argument("--shard-size", type=int, default=256,
+                        help="Masks per shard file")
+    args = parser.parse_args()
+
+    writer = build_store(Path(args.mask_dir), Path(args.out_dir), args.shard_size)
+    print(f"✅ {len(writer.items)} masks in {len(writer.shards)} shards → {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+import numpy as np
+from PIL import Image
+import cv2
+
+
+# ----------------------------------------------------------
+# Mask reader
+# ----------------------------------------------------------
+
+# cv2 color images come back as BGR(A): the pass index lives in R
+PASS_INDEX_CHANNEL = 2
+
+
+def pick_pass_index_channel(pixels, path, check_channels=True):
+    """
+    Reduce a multi-channel mask to its pass-index channel.
+
+    Blender's BW masks are sometimes written as RGB/RGBA with the
+    same value in every color channel. When check_channels is set,
+    the color channels are verified to be identical instead of being
+    silently mixed like Image.convert("L") does.
+    """
+    index = pixels[..., PASS_INDEX_CHANNEL]
+    if check_channels:
+        for c in range(3):
+            if c != PASS_INDEX_CHANNEL and not np.array_equal(pixels[..., c], index):
+                raise ValueError(
+                    f"Mask '{path}' has differing color channels; "
+                    f"cannot recover a single pass-index channel"
+                )
+    return np.ascontiguousarray(index)
+
+
+def read_mask_pil(path: Path, check_channels=True):
+    """
+    PIL fallback (paths cv2 cannot open, palette images).
+    Reads the native mode without a .convert() copy.
+    """
+    img = Image.open(path)
+    if img.mode == "P":
+        # palette indices are not pass indices
+        return np.asarray(img.convert("L"))
+    if img.mode.startswith("I;16"):
+        return np.asarray(img).astype(np.uint16, copy=False)
+
+    pixels = np.asarray(img)
+    if pixels.ndim == 2:
+        return pixels
+    if img.mode == "LA":
+        return np.ascontiguousarray(pixels[..., 0])
+    # PIL is RGB(A): reorder so the channel lookup matches cv2
+    return pick_pass_index_channel(pixels[..., 2::-1], path, check_channels)
+
+
+def read_mask(path: Path, check_channels=True):
+    """
+    Decode a label mask into a 2D uint8/uint16 array of pass indices,
+    choosing the decode path from what is stored in the file:
+      - 8/16-bit grayscale → returned as decoded, no copy
+      - RGB/RGBA           → pass-index channel (see pick_pass_index_channel)
+    """
+    pixels = cv2.imread(str(path), cv2.IMREAD_UNCHANGED)
+    if pixels is None:
+        return read_mask_pil(path, check_channels)
+    if pixels.ndim == 2:
+        return pixels
+    return pick_pass_index_channel(pixels, path, check_channels)
+
+
+# ----------------------------------------------------------
+# Decode benchmark
+# ----------------------------------------------------------
+
+DECODERS = {
+    "pil_convert_L": lambda p: np.array(Image.open(p).convert("L")),
+    "pil_native": lambda p: read_mask_pil(p, check_channels=False),
+    "cv2_unchanged": lambda p: cv2.imread(str(p), cv2.IMREAD_UNCHANGED),
+    "read_mask": lambda p: read_mask(p),
+}
+
+
+def benchmark_decoders(paths, repeat=1):
+    results = {}
+    for name, decode in DECODERS.items():
+        timings = []
+        pixels = 0
+        for _ in range(repeat):
+            for p in paths:
+                t0 = time.perf_counter()
+                arr = decode(p)
+                timings.append(time.perf_counter() - t0)
+                pixels += arr.shape[0] * arr.shape[1]
+        total = sum(timings)
+        results[name] = {
+            "masks": len(timings),
+            "mean_ms": 1000 * total / len(timings),
+            "median_ms": 1000 * statistics.median(timings),
+            "mpx_per_s": pixels / total / 1e6 if total else 0.0,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark mask decoding paths over a sample directory"
+    )
+    parser.add_argument("--mask-dir", required=True)
+    parser.add_argument("--limit", type=int, default=200,
+                        help="Max number of masks to sample")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--json-out", required=False,
+                        help="Optional path to write results as JSON")
+    args = parser.parse_args()
+
+    paths = sorted(Path(args.mask_dir).glob("*.png"))[:args.limit]
+    if not paths:
+        print(f"❌ No masks found in {args.mask_dir}")
+        return
+
+    sample = Image.open(paths[0])
+    print(f"📂 {len(paths)} masks, first: {sample.mode} {sample.size[0]}×{sample.size[1]}")
+
+    results = benchmark_decoders(paths, args.repeat)
+
+    print(f"\n{'decoder':16s} {'mean ms':>9s} {'median ms':>10s} {'Mpx/s':>8s}")
+    for name, r in results.items():
+        print(f"{name:16s} {r['mean_ms']:9.2f} {r['median_ms']:10.2f} {r['mpx_per_s']:8.1f}")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults → {args.json_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+import numpy as np
+
+from label_store import LabelStore, INDEX_NAME, build_store
+from organize_masks_annotation import MIN_COMPONENT_AREA_PX, MIN_COMPONENT_AREA_RATIO
+
+QUANTILES = [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+
+
+# ----------------------------------------------------------
+# Batched statistics
+# ----------------------------------------------------------
+
+def per_image_histograms(chunk, n_values):
+    """
+    (n, h, w) label chunk → (n, n_values) pixel counts per image,
+    in one bincount by offsetting each image into its own value range.
+    """
+    n = chunk.shape[0]
+    offsets = (np.arange(n, dtype=np.int64) * n_values)[:, None]
+    flat = chunk.reshape(n, -1).astype(np.int64, copy=False) + offsets
+    return np.bincount(flat.ravel(), minlength=n * n_values).reshape(n, n_values)
+
+
+def collect_dataset_stats(store: LabelStore, chunk_size=32):
+    """
+    Walk every shard of the store in chunks of (chunk_size, h, w) and gather:
+      - total pixels per pass index
+      - per pass index, the area (px) and area ratio of each image it appears in
+    """
+    totals = {}
+    areas = {}
+    ratios = {}
+    n_images = 0
+
+    for shard_idx, shard in enumerate(store.shards):
+        data = store.shard(shard_idx)
+        n, h, w = data.shape
+        n_values = 256 if data.dtype == np.uint8 else 1 << 16
+
+        for start in range(0, n, chunk_size):
+            hist = per_image_histograms(data[start:start + chunk_size], n_values)
+            present = np.flatnonzero(hist.any(axis=0))
+            for v in present:
+                if v == 0:
+                    continue
+                col = hist[:, v]
+                col = col[col > 0]
+                v = int(v)
+                totals[v] = totals.get(v, 0) + int(col.sum())
+                areas.setdefault(v, []).append(col)
+                ratios.setdefault(v, []).append(col / float(h * w))
+            n_images += hist.shape[0]
+
+            sys.stdout.write(f"\rScanned {n_images}/{len(store)} masks")
+            sys.stdout.flush()
+
+    print()
+    return n_images, totals, {v: np.concatenate(a) for v, a in areas.items()}, \
+        {v: np.concatenate(r) for v, r in ratios.items()}
+
+
+def summarize(n_images, totals, areas, ratios, value_to_label, min_area_px, min_area_ratio):
+    all_values = sorted(set(totals) | set(value_to_label))
+    classes = {}
+    for v in all_values:
+        a = areas.get(v, np.empty(0, dtype=np.int64))
+        r = ratios.get(v, np.empty(0))
+        entry = {
+            "label": value_to_label.get(v),
+            "pixels": totals.get(v, 0),
+            "images_present": int(a.size),
+            "images_empty": n_images - int(a.size),
+        }
+        if a.size:
+            entry["area_px_quantiles"] = dict(zip(
+                map(str, QUANTILES), np.quantile(a, QUANTILES).round(1).tolist()
+            ))
+            entry["area_ratio_quantiles"] = dict(zip(
+                map(str, QUANTILES), np.quantile(r, QUANTILES).round(6).tolist()
+            ))
+            # whole class below the threshold ⇒ every component is dropped
+            entry["images_below_min_area"] = int(np.count_nonzero(
+                (a < min_area_px) | (r < min_area_ratio)
+            ))
+        classes[str(v)] = entry
+
+    return {
+        "images": n_images,
+        "min_component_area_px": min_area_px,
+        "min_component_area_ratio": min_area_ratio,
+        "quantiles": QUANTILES,
+        "classes": classes,
+    }
+
+
+def ensure_store(mask_dir: Path, store_dir: Path):
+    if (store_dir / INDEX_NAME).exists():
+        return
+    print(f"📦 Packing {mask_dir} → {store_dir}")
+    build_store(mask_dir, store_dir)
+
+
+# ----------------------------------------------------------
+# Main
+# ----------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Dataset-level class / area statistics over a memory-mapped label store"
+    )
+    mask_src = parser.add_mutually_exclusive_group(required=True)
+    mask_src.add_argument("--mask-store", help="Label store built by label_store.py")
+    mask_src.add_argument("--mask-dir",
+                          help="PNG masks; packed once into --store-dir if needed")
+    parser.add_argument("--store-dir", required=False,
+                        help="Where to pack --mask-dir (default: <mask-dir>-store)")
+    parser.add_argument("--annotation-json", required=False,
+                        help="Label map (label → pass index) for names and empty-class counts")
+    parser.add_argument("--chunk-size", type=int, default=32)
+    parser.add_argument("--json-out", required=False)
+    args = parser.parse_args()
+
+    if args.mask_dir:
+        mask_dir = Path(args.mask_dir)
+        store_dir = Path(args.store_dir) if args.store_dir else mask_dir.with_name(mask_dir.name + "-store")
+        ensure_store(mask_dir, store_dir)
+    else:
+        store_dir = Path(args.mask_store)
+
+    value_to_label = {}
+    if args.annotation_json:
+        with open(args.annotation_json) as f:
+            value_to_label = {int(v): k for k, v in json.load(f).items()}
+
+    t0 = time.perf_counter()
+    store = LabelStore(store_dir)
+    n_images, totals, areas, ratios = collect_dataset_stats(store, args.chunk_size)
+    report = summarize(
+        n_images, totals, areas, ratios, value_to_label,
+        MIN_COMPONENT_AREA_PX, MIN_COMPONENT_AREA_RATIO
+    )
+    elapsed = time.perf_counter() - t0
+
+    print(f"\n{'value':>5s} {'label':24s} {'present':>8s} {'empty':>7s} {'p5 px':>9s} {'p50 px':>9s} {'<min':>6s}")
+    for v, c in report["classes"].items():
+        q = c.get("area_px_quantiles", {})
+        print(
+            f"{v:>5s} {str(c['label'] or '-')[:24]:24s} {c['images_present']:8d} "
+            f"{c['images_empty']:7d} {q.get('0.05', 0):9.0f} {q.get('0.5', 0):9.0f} "
+            f"{c.get('images_below_min_area', 0):6d}"
+        )
+    print(f"\n📊 {n_images} masks in {elapsed:.1f}s")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Stats → {args.json_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,80 +3,79 @@ import csv
 import shutil
 from pathlib import Path
 
-def parse_filename_metadata(filename: str):
+from dedup import DEDUP_RADIUS
+from frame_manifest import MANIFEST_NAME, load_manifest
+from pairing import pair_files, scan_outputs, summarize_unmatched, write_unmatched
+from frame_quality import add_threshold_args, thresholds_from_args
+
+def scan_files(img_dir: Path):
     """
-    Extract key=value parts from filename like:
-    env=university_workshop_4k&cam=front&rotZ=0&pose=alexandra0001.png
+    Only list files directly inside img_dir (not recursive).
     """
-    name = Path(filename).stem
-    meta = {}
-    for part in name.split("&"):
-        if "=" in part:
-            k, v = part.split("=", 1)
-            meta[k] = v
-    return meta
-
-def detect_type(file_path: Path):
+    return [Path(path) for _, path in scan_outputs(img_dir)]
+
+def group_files(files, manifest=None):
     """
-    Detect image or mask type.
+    Group image + mask pairs by render job (frame id or job key, see pairing.py).
     """
-    name = file_path.name.lower()
-    parent = file_path.parent.name.lower()
-    if any(k in name for k in ["mask", "segmentation-material"]) or "mask" in parent:
-        return "mask"
-    return "image"
-
-def main():
-    parser = argparse.ArgumentParser(description="Organize first-level images/masks and build CSV metadata")
-    parser.add_argument("--img-dir", required=True, help="Path to directory containing rendered images/masks (non-recursive)")
-    parser.add_argument("--out-dir", default="./data", help="Output base directory")
-    parser.add_argument("--count-start", type=int, default=1, help="Starting index for naming output files")
-    args = parser.parse_args()
-
-    img_dir = Path(args.img_dir)
-    if not img_dir.exists():
-        print(f"❌ Path not found: {img_dir}")
-        return
-
-    base_dir = Path(args.out_dir) / Path("./images-masks")
-    img_out = base_dir / "images"
-    mask_out = base_dir / "masks"
-    base_dir.mkdir(exist_ok=True)
-    img_out.mkdir(exist_ok=True)
-    mask_out.mkdir(exist_ok=True)
-
-    # only list files directly inside img_dir (not recursive)
-    files = sorted([p for p in img_dir.iterdir() if p.is_file() and p.suffix.lower() in [".png", ".jpg", ".jpeg"]])
-    print(f"📂 Found {len(files)} top-level image files in {img_dir}")
-
-    # collect metadata and group image + mask pairs
-    groups = {}   # key: tuple(sorted meta excluding type)), value: dict(image=Path, mask=Path, meta=dict)
-
-    for f in files:
-        meta = parse_filename_metadata(f.name)
-        t = detect_type(f)
-        meta_no_type = tuple(sorted((k, v) for k, v in meta.items() if k != "type"))
-
-        if meta_no_type not in groups:
-            groups[meta_no_type] = {"image": None, "mask": None, "meta": meta}
-
-        groups[meta_no_type][t] = f
-        groups[meta_no_type]["meta"].update(meta)  # combine metadata if needed
+    groups, _ = pair_files(((f.name, f) for f in files), manifest)
+    return groups
 
+def reject_group(entry, reject_dir: Path, reasons, stats, reject_writer):
+    """
+    Copy a rejected pair under its original names into reject_dir/{images,masks}
+    and log the reasons.
+    """
+    for kind in ("image", "mask"):
+        if entry[kind] is not None:
+            shutil.copy(entry[kind], reject_dir / f"{kind}s" / entry[kind].name)
+    reject_writer.writerow([
+        entry["mask"].name, "; ".join(reasons),
+        f"{stats['foreground_fraction']:.4f}", stats["classes"],
+        f"{stats['dominant_class_fraction']:.4f}", "/".join(stats["truncated_edges"]),
+    ])
+
+def write_groups(groups, img_out: Path, mask_out: Path, csv_path: Path, count_start=1,
+                 reject_dir: Path | None = None, quality_thresholds=None,
+                 dedup_index=None, dedup_drop=False):
+    """
+    Copy paired files under sequential names and write the CSV index.
+    With reject_dir, pairs failing the frame quality gate (frame_quality.py)
+    go there instead, with their reasons in reject_dir/rejected.csv.
+    With dedup_index (dedup.DedupIndex), near-duplicates of an already indexed
+    pair get a duplicate_of column, or are skipped with dedup_drop.
+    Returns (count, missing_image, missing_mask, rejected, duplicates).
+    """
     # collect all keys
     all_keys = sorted({k for g in groups.values() for k in g["meta"].keys()})
 
-    # write CSV + copy files
-    csv_path = base_dir / "data.csv"
-    
     missing_image = 0
     missing_mask = 0
+    rejected = 0
+    duplicates = 0
+    extra_cols = ["duplicate_of"] if dedup_index is not None and not dedup_drop else []
+    if dedup_index is not None:
+        from dedup import pair_key
+
+    reject_file = None
+    if reject_dir is not None:
+        from frame_quality import check_frame
+        from mask_io import read_mask
+
+        (reject_dir / "images").mkdir(parents=True, exist_ok=True)
+        (reject_dir / "masks").mkdir(exist_ok=True)
+        reject_file = open(reject_dir / "rejected.csv", "w", newline="", encoding="utf-8")
+        reject_writer = csv.writer(reject_file)
+        reject_writer.writerow([
+            "mask", "reasons", "foreground_fraction", "classes", "dominant_class_fraction", "truncated_edges"
+        ])
+        quality_thresholds = quality_thresholds or {}
 
     with open(csv_path, "w", newline="", encoding="utf-8") as csvfile:
         writer = csv.writer(csvfile)
-        writer.writerow(["filename"] + all_keys)
+        writer.writerow(["filename"] + all_keys + extra_cols)
 
-        count = args.count_start
+        count = count_start
         for keys, entry in groups.items():
             # print(entry)
             
@@ -84,9 +83,28 @@ def main():
                 missing_image += 1
             if entry["mask"] is None:
                 missing_mask += 1
-            
+
+            if reject_file is not None and entry["mask"] is not None:
+                stats, reasons = check_frame(read_mask(entry["mask"]), **quality_thresholds)
+                if reasons:
+                    reject_group(entry, reject_dir, reasons, stats, reject_writer)
+                    rejected += 1
+                    continue
+
             idx_name = f"{count:04d}.png"
 
+            duplicate_of = ""
+            if dedup_index is not None:
+                key = pair_key(entry["image"], entry["mask"])
+                hit = dedup_index.query(key)
+                if hit:
+                    duplicates += 1
+                    if dedup_drop:
+                        continue
+                    duplicate_of = hit[1]
+                else:
+                    dedup_index.add(key, idx_name)
+
             # copy image
             if entry["image"] is not None:
                 shutil.copy(entry["image"], img_out / idx_name)
@@ -97,9 +115,79 @@ def main():
 
             # write metadata row
             row = [idx_name] + [entry["meta"].get(k, "") for k in all_keys]
+            if extra_cols:
+                row.append(duplicate_of)
             writer.writerow(row)
             count += 1 
 
+    if reject_file is not None:
+        reject_file.close()
+
+    return count, missing_image, missing_mask, rejected, duplicates
+
+def main():
+    parser = argparse.ArgumentParser(description="Organize first-level images/masks and build CSV metadata")
+    parser.add_argument("--img-dir", required=True, help="Path to directory containing rendered images/masks (non-recursive)")
+    parser.add_argument("--out-dir", default="./data", help="Output base directory")
+    parser.add_argument("--count-start", type=int, default=1, help="Starting index for naming output files")
+    parser.add_argument("--manifest", required=False,
+                        help=f"Frame manifest JSONL (default: <img-dir>/{MANIFEST_NAME} if present)")
+    parser.add_argument("--unmatched-report", required=False,
+                        help="Unmatched files CSV (default: <out-dir>/images-masks/unmatched.csv)")
+    parser.add_argument("--quality-gate", action="store_true",
+                        help="Send degenerate frames (empty / single-class / cropped mask) to --reject-dir")
+    parser.add_argument("--reject-dir", required=False,
+                        help="Rejected pairs + rejected.csv (default: <out-dir>/images-masks-rejected)")
+    add_threshold_args(parser)
+    parser.add_argument("--dedup", choices=["off", "flag", "drop"], default="off",
+                        help="Near-duplicate pairs (dedup.py): flag in data.csv or drop")
+    parser.add_argument("--dedup-radius", type=int, default=DEDUP_RADIUS,
+                        help="Max Hamming distance between 128-bit image+mask hashes")
+    parser.add_argument("--dedup-index", required=False,
+                        help="Persistent hash index shared across runs (default: <out-dir>/images-masks/dedup_index.jsonl)")
+    args = parser.parse_args()
+
+    img_dir = Path(args.img_dir)
+    if not img_dir.exists():
+        print(f"❌ Path not found: {img_dir}")
+        return
+
+    base_dir = Path(args.out_dir) / Path("./images-masks")
+    img_out = base_dir / "images"
+    mask_out = base_dir / "masks"
+    base_dir.mkdir(exist_ok=True)
+    img_out.mkdir(exist_ok=True)
+    mask_out.mkdir(exist_ok=True)
+
+    entries = scan_outputs(img_dir)
+    print(f"📂 Found {len(entries)} top-level image files in {img_dir}")
+
+    manifest_path = Path(args.manifest) if args.manifest else img_dir / MANIFEST_NAME
+    manifest = load_manifest(manifest_path)
+    if manifest:
+        print(f"🧾 {len(manifest)} frame records from {manifest_path}")
+
+    groups, unmatched = pair_files(entries, manifest)
+
+    # write CSV + copy files
+    csv_path = base_dir / "data.csv"
+    reject_dir = None
+    if args.quality_gate:
+        reject_dir = Path(args.reject_dir) if args.reject_dir else Path(args.out_dir) / "images-masks-rejected"
+    dedup_index = None
+    if args.dedup != "off":
+        from dedup import DedupIndex
+        index_path = Path(args.dedup_index) if args.dedup_index else base_dir / "dedup_index.jsonl"
+        dedup_index = DedupIndex(args.dedup_radius, index_path)
+        print(f"🗂️ Dedup index: {len(dedup_index)} pairs from {index_path}")
+    count, missing_image, missing_mask, rejected, duplicates = write_groups(
+        groups, img_out, mask_out, csv_path, args.count_start,
+        reject_dir, dict(thresholds_from_args(args), downsample=args.quality_downsample),
+        dedup_index, args.dedup == "drop"
+    )
+    if dedup_index is not None:
+        dedup_index.close()
+
     print(f"✅ Done. {count-1} pairs processed.")
 
     print(f"Images → {img_out}")
@@ -107,6 +195,14 @@ def main():
     print(f"Metadata → {csv_path}")
     if(missing_image>0): print(f"⚠️ Groups missing image: {missing_image}")
     if(missing_mask>0): print(f"⚠️ Groups missing mask: {missing_mask}")
+    if unmatched:
+        report_path = Path(args.unmatched_report) if args.unmatched_report else base_dir / "unmatched.csv"
+        write_unmatched(unmatched, report_path)
+        for reason, n in sorted(summarize_unmatched(unmatched).items(), key=lambda x: -x[1]):
+            print(f"⚠️ Unmatched ({reason}): {n}")
+        print(f"Unmatched files → {report_path}")
+    if(rejected>0): print(f"🚮 Rejected by quality gate: {rejected} → {reject_dir}")
+    if(duplicates>0): print(f"♊ Near-duplicates {'dropped' if args.dedup == 'drop' else 'flagged'}: {duplicates}")
     print(f"📊 Total groups: {len(groups)}")
 
 if __name__ == "__main__":
@@ -2,10 +2,14 @@ import argparse
 import json
 from pathlib import Path
 import numpy as np
-from PIL import Image
 import cv2
 import xml.etree.ElementTree as ET
 import sys
+from contextlib import nullcontext
+
+from mask_io import read_mask
+from label_export import encode_rle
+from label_store import LabelStore
 
 
 # ----------------------------------------------------------
@@ -13,7 +17,7 @@ import sys
 # ----------------------------------------------------------
 
 def load_mask(path: Path):
-    return np.array(Image.open(path).convert("L"))
+    return read_mask(path)
 
 
 def find_unique_labels(mask):
@@ -25,11 +29,137 @@ def extract_binary_mask(mask, value):
     return (mask == value).astype(np.uint8) * 255
 
 
-def extract_polygons(binary_mask, epsilon_ratio=0.002):
+def shared_fusion_groups(fusion_label_to_values):
+    """Fusion labels whose group shares a pass index with another group."""
+    owners = {}
+    for fusion_label, values in fusion_label_to_values.items():
+        for v in {int(v) for v in values}:
+            owners.setdefault(v, []).append(fusion_label)
+    return {lbl for labels in owners.values() if len(labels) > 1 for lbl in labels}
+
+
+def build_fusion_lut(fusion_label_to_values, size=1 << 16):
+    """
+    Lookup table mapping every pass index to its fused class slot
+    (1-based, 0 = not fused), so all fused classes come out of a
+    single lut[mask] pass instead of one mask per source value. A value
+    can only have one slot, so groups sharing a source value get none
+    and are OR'ed per mask instead (see fused_masks).
+    """
+    dtype = np.uint8 if len(fusion_label_to_values) < 256 else np.uint16
+    lut = np.zeros(size, dtype=dtype)
+    shared = shared_fusion_groups(fusion_label_to_values)
+    if shared:
+        print(f"⚠️ Fusion groups {', '.join(sorted(shared))} share pass indices, "
+              "built per mask instead of through the LUT")
+    for slot, (fusion_label, values) in enumerate(fusion_label_to_values.items(), start=1):
+        if fusion_label not in shared:
+            lut[values] = slot
+    return lut
+
+
+def fused_masks(mask, present_values, fusion_label_to_values, fusion_lut):
+    """
+    (fusion label, 0/255 mask) of every fusion group present in the mask.
+    Groups with a LUT slot share one lut[mask] pass; groups sharing a
+    value with another are OR'ed from their values, so the shared value
+    lands in each of them.
+    """
+    shared = shared_fusion_groups(fusion_label_to_values)
+    fused = None
+    for slot, (fusion_label, values) in enumerate(fusion_label_to_values.items(), start=1):
+        if present_values.isdisjoint(values):
+            continue
+        if fusion_label in shared:
+            yield fusion_label, np.isin(mask, values).astype(np.uint8) * 255
+            continue
+        if fused is None:
+            fused = fusion_lut[mask]
+        yield fusion_label, cv2.compare(fused, slot, cv2.CMP_EQ)
+
+
+CHAIN_APPROX_MODES = {
+    "none": cv2.CHAIN_APPROX_NONE,
+    "simple": cv2.CHAIN_APPROX_SIMPLE,
+    "tc89_l1": cv2.CHAIN_APPROX_TC89_L1,
+    "tc89_kcos": cv2.CHAIN_APPROX_TC89_KCOS,
+}
+
+
+def contour_pixel_length(cnt):
+    """
+    Number of boundary pixels the contour walks through, i.e. the
+    CHAIN_APPROX_NONE vertex count, without tracing it at full detail.
+    """
+    pts = cnt[:, 0, :]
+    steps = np.abs(np.diff(np.vstack([pts, pts[:1]]), axis=0))
+    return int(steps.max(axis=1).sum())
+
+
+def contour_raster(cnt):
+    """Filled contour cropped to its bounding box, and the crop origin."""
+    x, y, w, h = cv2.boundingRect(cnt)
+    origin = np.array([x, y], dtype=cnt.dtype)
+    ref = np.zeros((h, w), dtype=np.uint8)
+    cv2.drawContours(ref, [cnt - origin], -1, 1, cv2.FILLED)
+    return ref, origin
+
+
+def raster_iou(ref, origin, approx):
+    """IoU between a contour_raster and a polygon of the same contour."""
+    poly = np.zeros_like(ref)
+    cv2.drawContours(poly, [approx - origin], -1, 1, cv2.FILLED)
+    union = np.count_nonzero(ref | poly)
+    return np.count_nonzero(ref & poly) / union if union else 1.0
+
+
+def polygon_iou(cnt, approx):
+    """IoU between the filled contour and its simplified polygon."""
+    return raster_iou(*contour_raster(cnt), approx)
+
+
+def simplify_contour(cnt, epsilon_ratio, max_vertices=0, iou_tolerance=0.02):
+    """
+    approxPolyDP with an optional vertex budget: epsilon grows until the
+    polygon fits max_vertices, but never past the point where its IoU
+    with the component (rasterised once) drops below 1 - iou_tolerance.
+    """
+    epsilon = epsilon_ratio * cv2.arcLength(cnt, True)
+    approx = cv2.approxPolyDP(cnt, epsilon, True)
+    if max_vertices < 3 or len(approx) <= max_vertices:
+        return approx
+
+    ref, origin = contour_raster(cnt)
+    min_iou = 1.0 - iou_tolerance
+    while len(approx) > max_vertices:
+        epsilon *= 1.5
+        candidate = cv2.approxPolyDP(cnt, epsilon, True)
+        if len(candidate) < 3 or raster_iou(ref, origin, candidate) < min_iou:
+            break
+        approx = candidate
+    return approx
+
+
+def extract_polygons(
+    binary_mask,
+    epsilon_ratio=0.002,
+    chain_approx=cv2.CHAIN_APPROX_SIMPLE,
+    max_vertices=0,
+    iou_tolerance=0.02,
+    stats=None
+):
+    """
+    External contours → simplified polygons.
+
+    CHAIN_APPROX_SIMPLE/TC89 only keep the corners of straight runs, so
+    approxPolyDP works on far fewer points than with CHAIN_APPROX_NONE.
+    max_vertices caps each polygon (see simplify_contour). When a stats
+    dict is given, vertex / byte / IoU figures are accumulated into it.
+    """
     contours, _ = cv2.findContours(
         binary_mask,
         cv2.RETR_EXTERNAL,
-        cv2.CHAIN_APPROX_NONE
+        chain_approx
     )
 
     polygons = []
@@ -38,21 +168,46 @@ def extract_polygons(binary_mask, epsilon_ratio=0.002):
         if len(cnt) < 3:
             continue
 
-        epsilon = epsilon_ratio * cv2.arcLength(cnt, True)
-        approx = cv2.approxPolyDP(cnt, epsilon, True)
+        approx = simplify_contour(cnt, epsilon_ratio, max_vertices, iou_tolerance)
 
         poly = [(int(x), int(y)) for [[x, y]] in approx]
         if len(poly) >= 3:
             polygons.append(poly)
+            if stats is not None:
+                update_polygon_stats(stats, cnt, approx, poly)
 
     return polygons
 
 
-def bbox_from_binary_mask(binary_mask):
-    ys, xs = np.where(binary_mask == 255)
-    if len(xs) == 0:
-        return None
-    return xs.min(), ys.min(), xs.max(), ys.max()
+def update_polygon_stats(stats, cnt, approx, poly):
+    raw_vertices = contour_pixel_length(cnt)
+    poly_bytes = len(";".join(f"{x},{y}" for x, y in poly))
+    iou = polygon_iou(cnt, approx)
+    stats["polygons"] = stats.get("polygons", 0) + 1
+    stats["raw_vertices"] = stats.get("raw_vertices", 0) + raw_vertices
+    stats["vertices"] = stats.get("vertices", 0) + len(poly)
+    # raw points string estimated at the same bytes/vertex
+    stats["raw_bytes"] = stats.get("raw_bytes", 0) + poly_bytes * raw_vertices / len(poly)
+    stats["bytes"] = stats.get("bytes", 0) + poly_bytes
+    stats["iou_sum"] = stats.get("iou_sum", 0.0) + iou
+    stats["iou_min"] = min(stats.get("iou_min", 1.0), iou)
+
+
+def print_polygon_stats(stats):
+    if not stats.get("polygons"):
+        print("No polygons.")
+        return
+    n = stats["polygons"]
+    print(f"\nPolygons: {n}")
+    print(
+        f"  vertices {stats['raw_vertices']} → {stats['vertices']} "
+        f"({100 * (1 - stats['vertices'] / stats['raw_vertices']):.1f}% saved)"
+    )
+    print(
+        f"  points bytes ≈{stats['raw_bytes'] / 1e6:.2f} MB → {stats['bytes'] / 1e6:.2f} MB "
+        f"({100 * (1 - stats['bytes'] / stats['raw_bytes']):.1f}% saved)"
+    )
+    print(f"  IoU vs contour: mean {stats['iou_sum'] / n:.4f}, min {stats['iou_min']:.4f}")
 
 
 def convert_bbox_to_yolo(bbox, w, h):
@@ -66,35 +221,24 @@ def convert_bbox_to_yolo(bbox, w, h):
         bh / h
     )
 
-def filter_binary_mask_by_area(binary_mask, min_area_px, min_area_ratio):
-    h, w = binary_mask.shape
-    min_area = max(min_area_px, int(h * w * min_area_ratio))
-
-    num_labels, labels, stats, _ = cv2.connectedComponentsWithStats(
-        binary_mask, connectivity=8
-    )
-
-    cleaned = np.zeros_like(binary_mask)
-
-    for i in range(1, num_labels):  # skip background
-        area = stats[i, cv2.CC_STAT_AREA]
-        if area >= min_area:
-            cleaned[labels == i] = 255
+def convert_polygon_to_yolo_seg(polygon_pts, w, h):
+    return " ".join(f"{x / w:.6f} {y / h:.6f}" for x, y in polygon_pts)
 
-    return cleaned
-
-def keep_largest_components(
+def largest_components(
     binary_mask: np.ndarray,
     max_components: int,
     min_area_px: int,
     min_area_ratio: float
 ):
     """
-    Keep only the N largest connected components
+    Label connected components and select the N largest ones
     that are >= min_area (px or ratio-based).
+
+    Returns (labels, stats, keep_ids) so callers can reuse the
+    component stats (area, bbox) instead of rescanning pixels.
     """
     if max_components <= 0:
-        return np.zeros_like(binary_mask)
+        return None, None, []
 
     h, w = binary_mask.shape
     min_area = max(min_area_px, int(h * w * min_area_ratio))
@@ -110,24 +254,126 @@ def keep_largest_components(
         if stats[i, cv2.CC_STAT_AREA] >= min_area
     ]
 
-    if not comps:
-        return np.zeros_like(binary_mask)
-
     # Sort by area (largest first)
     comps.sort(key=lambda x: x[1], reverse=True)
 
-    keep_ids = {i for i, _ in comps[:max_components]}
+    keep_ids = [i for i, _ in comps[:max_components]]
+
+    return labels, stats, keep_ids
 
-    out = np.zeros_like(binary_mask)
+
+def mask_from_components(labels, keep_ids):
+    out = np.zeros(labels.shape, dtype=np.uint8)
     for i in keep_ids:
         out[labels == i] = 255
-
     return out
 
 
+def keep_largest_components(
+    binary_mask: np.ndarray,
+    max_components: int,
+    min_area_px: int,
+    min_area_ratio: float
+):
+    """
+    Keep only the N largest connected components
+    that are >= min_area (px or ratio-based).
+    """
+    labels, _, keep_ids = largest_components(
+        binary_mask, max_components, min_area_px, min_area_ratio
+    )
+
+    if not keep_ids:
+        return np.zeros_like(binary_mask)
+
+    return mask_from_components(labels, keep_ids)
+
+
+def bbox_from_component_stats(stats, keep_ids):
+    """
+    Union bbox of the selected components as (x_min, y_min, x_max, y_max),
+    max inclusive.
+    """
+    sel = stats[keep_ids]
+    x_min = sel[:, cv2.CC_STAT_LEFT].min()
+    y_min = sel[:, cv2.CC_STAT_TOP].min()
+    x_max = (sel[:, cv2.CC_STAT_LEFT] + sel[:, cv2.CC_STAT_WIDTH]).max() - 1
+    y_max = (sel[:, cv2.CC_STAT_TOP] + sel[:, cv2.CC_STAT_HEIGHT]).max() - 1
+    return int(x_min), int(y_min), int(x_max), int(y_max)
+
+
+def area_from_component_stats(stats, keep_ids):
+    return int(stats[keep_ids, cv2.CC_STAT_AREA].sum())
+
+
 def inline_print(msg: str):
     sys.stdout.write("\r" + msg)
     sys.stdout.flush()
+
+
+# ----------------------------------------------------------
+# Per-mask instances
+# ----------------------------------------------------------
+
+def mask_instances(
+    mask,
+    value_to_label,
+    fusion_label_to_values,
+    fusion_lut,
+    fused_values,
+    polygon_opts=None,
+    stage=lambda name: nullcontext()
+):
+    """
+    Class instances of one label mask, as main() writes them:
+    (label, binary, stats, comp_ids, polygons) for every labelled non-fused
+    value (its MAX_SEG_PER_CLASS largest components) and every fused group
+    present (all its components). polygons is [] without polygon_opts.
+    stage(name) returns a context manager around each step (bench_pipeline.py
+    times them: unique, extract, components, fusion, polygons).
+    """
+    with stage("unique"):
+        unique_values = find_unique_labels(mask)
+
+    for v in unique_values:
+        if v in fused_values or v not in value_to_label:
+            continue
+
+        with stage("extract"):
+            binary_raw = extract_binary_mask(mask, v)
+        with stage("components"):
+            labels, stats, keep_ids = largest_components(
+                binary_raw,
+                MAX_SEG_PER_CLASS,
+                MIN_COMPONENT_AREA_PX,
+                MIN_COMPONENT_AREA_RATIO
+            )
+            if not keep_ids:
+                continue
+            binary = mask_from_components(labels, keep_ids)
+
+        polygons = []
+        if polygon_opts is not None:
+            with stage("polygons"):
+                polygons = extract_polygons(binary, **polygon_opts)
+        yield value_to_label[v], binary, stats, keep_ids, polygons
+
+    groups = fused_masks(mask, set(unique_values), fusion_label_to_values, fusion_lut)
+    while True:
+        with stage("fusion"):
+            group = next(groups, None)
+            if group is None:
+                break
+            fusion_label, merged = group
+            num_labels, _, stats, _ = cv2.connectedComponentsWithStats(
+                merged, connectivity=8
+            )
+
+        polygons = []
+        if polygon_opts is not None:
+            with stage("polygons"):
+                polygons = extract_polygons(merged, **polygon_opts)
+        yield fusion_label, merged, stats, list(range(1, num_labels)), polygons
 # ----------------------------------------------------------
 # CVAT helpers
 # ----------------------------------------------------------
@@ -157,34 +403,184 @@ def add_cvat_polygon(image_el, label, polygon_pts):
     })
 
 
+# ----------------------------------------------------------
+# COCO helpers
+# ----------------------------------------------------------
+
+class CocoWriter:
+    """
+    Streams a COCO instances JSON to disk.
+
+    Images are written into {path}.tmp, annotations go to a side file
+    that is appended on close, so memory stays flat regardless of the
+    dataset size. Only a successful close renames the result to `path`;
+    used as a context manager, a failing run removes both temp files.
+    """
+
+    def __init__(self, path: Path, categories):
+        self.path = path
+        self.tmp_path = path.with_suffix(path.suffix + ".tmp")
+        self.ann_path = path.with_suffix(path.suffix + ".ann.tmp")
+        self.f = open(self.tmp_path, "w", encoding="utf-8")
+        self.ann_f = open(self.ann_path, "w", encoding="utf-8")
+        self.n_images = 0
+        self.n_annotations = 0
+
+        self.f.write('{"info": {"description": "blender-sythetic-data"},\n')
+        self.f.write('"categories": ' + json.dumps(categories) + ",\n")
+        self.f.write('"images": [\n')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def add_image(self, image_id, filename, width, height):
+        if self.n_images:
+            self.f.write(",\n")
+        self.f.write(json.dumps({
+            "id": image_id,
+            "file_name": filename,
+            "width": width,
+            "height": height
+        }))
+        self.n_images += 1
+
+    def add_annotation(self, image_id, category_id, rle, bbox, area):
+        x_min, y_min, x_max, y_max = (int(c) for c in bbox)
+        if self.n_annotations:
+            self.ann_f.write(",\n")
+        self.n_annotations += 1
+        self.ann_f.write(json.dumps({
+            "id": self.n_annotations,
+            "image_id": image_id,
+            "category_id": category_id,
+            "segmentation": rle,
+            "area": area,
+            "bbox": [x_min, y_min, x_max - x_min + 1, y_max - y_min + 1],
+            "iscrowd": 0
+        }, separators=(",", ":")))
+
+    def close(self):
+        try:
+            self.ann_f.close()
+            self.f.write('\n],\n"annotations": [\n')
+            with open(self.ann_path, encoding="utf-8") as src:
+                while chunk := src.read(1 << 20):
+                    self.f.write(chunk)
+            self.f.write("\n]}\n")
+            self.f.close()
+            self.tmp_path.replace(self.path)
+        finally:
+            self.abort()
+
+    def abort(self):
+        """Close and delete the temp files; `path` is left untouched."""
+        self.ann_f.close()
+        self.f.close()
+        self.ann_path.unlink(missing_ok=True)
+        self.tmp_path.unlink(missing_ok=True)
+
+
 # ----------------------------------------------------------
 # Main
 # ----------------------------------------------------------
 
 POLYGON_EPSILON_RATIO = 0.001
+POLYGON_CHAIN_APPROX = "simple"   # see CHAIN_APPROX_MODES
+MAX_POLYGON_VERTICES = 0          # per polygon, 0 = no budget
+POLYGON_IOU_TOLERANCE = 0.02      # max IoU loss allowed by the budget
 MIN_COMPONENT_AREA_PX = 1500      # hard floor (pixels)
 MIN_COMPONENT_AREA_RATIO = 0.0005  # relative to image area (0.05%)
 MAX_SEG_PER_CLASS = 2
 
+
+def add_polygon_args(parser):
+    """Shared polygon flags (this script, calibrate_thresholds.py)."""
+    parser.add_argument("--chain-approx", choices=list(CHAIN_APPROX_MODES),
+                        default=POLYGON_CHAIN_APPROX,
+                        help="Contour point reduction before approxPolyDP")
+    parser.add_argument("--max-vertices", type=int, default=MAX_POLYGON_VERTICES,
+                        help="Vertex budget per polygon (0 = none)")
+    parser.add_argument("--iou-tolerance", type=float, default=POLYGON_IOU_TOLERANCE,
+                        help="Max IoU loss when enforcing --max-vertices")
+
+
+def polygon_opts_from_args(args, stats=None):
+    return dict(
+        epsilon_ratio=POLYGON_EPSILON_RATIO,
+        chain_approx=CHAIN_APPROX_MODES[args.chain_approx],
+        max_vertices=args.max_vertices,
+        iou_tolerance=args.iou_tolerance,
+        stats=stats,
+    )
+
+
+def load_fusion_rules(label_map, fusion_json=None):
+    """
+    (fusion label → source pass indices, set of fused pass indices) from
+    an optional --fusion-json of fusion label → source labels.
+    """
+    fusion_rules = {}
+    if fusion_json:
+        with open(fusion_json) as f:
+            fusion_rules = json.load(f)
+
+    fusion_label_to_values = {}
+    fused_values = set()
+
+    for fusion_label, src_labels in fusion_rules.items():
+        values = []
+        for src in src_labels:
+            if src not in label_map:
+                raise ValueError(
+                    f"Fusion source label '{src}' missing in annotation JSON"
+                )
+            values.append(label_map[src])
+        fusion_label_to_values[fusion_label] = values
+        fused_values.update(values)
+
+    return fusion_label_to_values, fused_values
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Convert masks → YOLO + CVAT with optional part fusion"
     )
-    parser.add_argument("--mask-dir", required=True)
+    mask_src = parser.add_mutually_exclusive_group(required=True)
+    mask_src.add_argument("--mask-dir", help="Directory of PNG masks")
+    mask_src.add_argument("--mask-store",
+                          help="Label store built by label_store.py (no PNG decode)")
     parser.add_argument("--annotation-json", required=True)
     parser.add_argument("--fusion-json", required=False,
                         help="Optional JSON defining fusion rules")
     parser.add_argument("--out-dir", required=True)
+    parser.add_argument("--format", choices=["cvat", "coco"], default="cvat",
+                        help="Instance mask output: CVAT polygons or COCO RLE")
+    parser.add_argument("--yolo-task", choices=["detect", "seg"], default="detect",
+                        help="YOLO label lines: bboxes (detect) or polygons (seg)")
+    add_polygon_args(parser)
+    parser.add_argument("--polygon-report", action="store_true",
+                        help="Report vertex / byte savings and polygon IoU")
 
     args = parser.parse_args()
 
-    mask_dir = Path(args.mask_dir)
     out_dir = Path(args.out_dir)
     yolo_dir = out_dir / "yolo"
     cvat_dir = out_dir / "cvat"
+    coco_dir = out_dir / "coco"
+    use_coco = args.format == "coco"
+    use_yolo_seg = args.yolo_task == "seg"
+
+    polygon_stats = {} if args.polygon_report else None
+    polygon_opts = polygon_opts_from_args(args, polygon_stats)
 
     yolo_dir.mkdir(parents=True, exist_ok=True)
-    cvat_dir.mkdir(parents=True, exist_ok=True)
+    (coco_dir if use_coco else cvat_dir).mkdir(parents=True, exist_ok=True)
 
     # ------------------------------------------------------
     # Load label map
@@ -199,24 +595,9 @@ def main():
     # Load fusion rules (optional)
     # ------------------------------------------------------
 
-    fusion_rules = {}
-    if args.fusion_json:
-        with open(args.fusion_json) as f:
-            fusion_rules = json.load(f)
+    fusion_label_to_values, fused_values = load_fusion_rules(label_map, args.fusion_json)
 
-    fusion_label_to_values = {}
-    fused_values = set()
-
-    for fusion_label, src_labels in fusion_rules.items():
-        values = []
-        for src in src_labels:
-            if src not in label_map:
-                raise ValueError(
-                    f"Fusion source label '{src}' missing in annotation JSON"
-                )
-            values.append(label_map[src])
-        fusion_label_to_values[fusion_label] = values
-        fused_values.update(values)
+    fusion_lut = build_fusion_lut(fusion_label_to_values)
 
     # ------------------------------------------------------
     # YOLO class ordering (stable)
@@ -224,7 +605,7 @@ def main():
 
     yolo_labels = (
         [lbl for lbl, v in label_map.items() if v not in fused_values]
-        + list(fusion_rules.keys())
+        + list(fusion_label_to_values)
     )
 
     yolo_label_to_id = {lbl: i for i, lbl in enumerate(yolo_labels)}
@@ -234,105 +615,104 @@ def main():
         print(f"  {v:02d} → {k}")
 
     # ------------------------------------------------------
-    # CVAT root
+    # CVAT root / COCO writer
     # ------------------------------------------------------
 
-    cvat_root = create_cvat_root()
+    cvat_root = None
+    coco_writer = nullcontext()
+    if use_coco:
+        coco_json_path = coco_dir / "instances.json"
+        coco_writer = CocoWriter(coco_json_path, [
+            {"id": cid + 1, "name": lbl} for lbl, cid in yolo_label_to_id.items()
+        ])
+    else:
+        cvat_root = create_cvat_root()
     image_id = 0
 
     # ------------------------------------------------------
     # Process masks
     # ------------------------------------------------------
 
-    for mask_path in sorted(mask_dir.glob("*.png")):
-        inline_print(f"Processing {mask_path.name} / {len(list(mask_dir.glob('*.png')))}")
-
-        mask = load_mask(mask_path)
-        h, w = mask.shape[:2]
-        unique_values = find_unique_labels(mask)
-
-        image_el = create_cvat_image(
-            cvat_root, image_id, mask_path.name, w, h
-        )
-        image_id += 1
-
-        yolo_lines = []
-
-        # ------------------ Non-fused ------------------
-
-        for v in unique_values:
-            if v in fused_values:
-                continue
-            if v not in value_to_label:
-                continue
-
-            label = value_to_label[v]
-            cid = yolo_label_to_id[label]
-
-            binary_raw = extract_binary_mask(mask, v)
-            # binary = filter_binary_mask_by_area(
-            #     binary_raw,
-            #     MIN_COMPONENT_AREA_PX,
-            #     MIN_COMPONENT_AREA_RATIO
-            # )
-            binary = keep_largest_components(
-                binary_raw,
-                MAX_SEG_PER_CLASS,
-                MIN_COMPONENT_AREA_PX,
-                MIN_COMPONENT_AREA_RATIO
-            )
-            if not np.any(binary):
-                continue
-
-            bbox = bbox_from_binary_mask(binary)
-            if bbox:
-                xc, yc, bw, bh = convert_bbox_to_yolo(bbox, w, h)
-                yolo_lines.append(
-                    f"{cid} {xc:.6f} {yc:.6f} {bw:.6f} {bh:.6f}"
+    if args.mask_store:
+        store = LabelStore(Path(args.mask_store))
+        mask_names = store.names
+        get_mask = store.get
+    else:
+        mask_dir = Path(args.mask_dir)
+        mask_names = sorted(p.name for p in mask_dir.glob("*.png"))
+        get_mask = lambda name: load_mask(mask_dir / name)
+
+    with coco_writer:
+        for mask_name in mask_names:
+            inline_print(f"Processing {mask_name} / {len(mask_names)}")
+
+            mask = get_mask(mask_name)
+            h, w = mask.shape[:2]
+
+            if use_coco:
+                coco_writer.add_image(image_id, mask_name, w, h)
+            else:
+                image_el = create_cvat_image(
+                    cvat_root, image_id, mask_name, w, h
                 )
 
-            for poly in extract_polygons(binary, epsilon_ratio=POLYGON_EPSILON_RATIO):
-                add_cvat_polygon(image_el, label, poly)
-
-        # ------------------ Fused ------------------
+            yolo_lines = []
 
-        for fusion_label, values in fusion_label_to_values.items():
-            merged = np.zeros((h, w), dtype=np.uint8)
-            for v in values:
-                merged |= extract_binary_mask(mask, v)
-
-            if not np.any(merged):
-                continue
-
-            cid = yolo_label_to_id[fusion_label]
-
-            bbox = bbox_from_binary_mask(merged)
-            if bbox:
-                xc, yc, bw, bh = convert_bbox_to_yolo(bbox, w, h)
-                yolo_lines.append(
-                    f"{cid} {xc:.6f} {yc:.6f} {bw:.6f} {bh:.6f}"
-                )
-
-            for poly in extract_polygons(merged, epsilon_ratio=POLYGON_EPSILON_RATIO):
-                add_cvat_polygon(image_el, fusion_label, poly)
-
-        # ------------------ Write YOLO ------------------
-
-        with open(yolo_dir / f"{mask_path.stem}.txt", "w") as f:
-            f.write("\n".join(yolo_lines))
+            # one contour pass feeds both CVAT and YOLO-seg
+            instances = mask_instances(
+                mask, value_to_label, fusion_label_to_values, fusion_lut, fused_values,
+                polygon_opts if use_yolo_seg or not use_coco else None
+            )
+            for label, binary, stats, comp_ids, polygons in instances:
+                cid = yolo_label_to_id[label]
+                bbox = bbox_from_component_stats(stats, comp_ids)
+
+                if use_yolo_seg:
+                    for poly in polygons:
+                        yolo_lines.append(
+                            f"{cid} {convert_polygon_to_yolo_seg(poly, w, h)}"
+                        )
+                else:
+                    xc, yc, bw, bh = convert_bbox_to_yolo(bbox, w, h)
+                    yolo_lines.append(
+                        f"{cid} {xc:.6f} {yc:.6f} {bw:.6f} {bh:.6f}"
+                    )
+
+                if use_coco:
+                    coco_writer.add_annotation(
+                        image_id, cid + 1, encode_rle(binary), bbox,
+                        area_from_component_stats(stats, comp_ids)
+                    )
+                else:
+                    for poly in polygons:
+                        add_cvat_polygon(image_el, label, poly)
+
+            # ------------------ Write YOLO ------------------
+
+            with open(yolo_dir / f"{Path(mask_name).stem}.txt", "w") as f:
+                f.write("\n".join(yolo_lines))
+
+            image_id += 1
 
     # ------------------------------------------------------
-    # Save CVAT
+    # Save CVAT (instances.json is finalised when the COCO writer exits)
     # ------------------------------------------------------
 
-    cvat_xml_path = cvat_dir / "annotations.xml"
-    ET.ElementTree(cvat_root).write(
-        cvat_xml_path, encoding="utf-8", xml_declaration=True
-    )
+    if not use_coco:
+        cvat_xml_path = cvat_dir / "annotations.xml"
+        ET.ElementTree(cvat_root).write(
+            cvat_xml_path, encoding="utf-8", xml_declaration=True
+        )
+
+    if polygon_stats is not None:
+        print_polygon_stats(polygon_stats)
 
     print("\nDone.")
     print(f"YOLO → {yolo_dir}")
-    print(f"CVAT → {cvat_xml_path}")
+    if use_coco:
+        print(f"COCO → {coco_json_path}")
+    else:
+        print(f"CVAT → {cvat_xml_path}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,167 @@
+import argparse
+import csv
+import os
+import time
+from pathlib import Path
+
+from frame_manifest import MANIFEST_NAME, OUTPUT_NAME_RE, csv_fields, load_manifest
+
+# Image / mask pairing by render job. Every output name is split into
+#
+#   node prefix   "segmentation-material" / "image" / ... → kind mask / image
+#   job           frame id ({node}_{id}_0001.png, frame_manifest.py) or the
+#                 job key of legacy names ({node}&env=...&char=genesis0001.png)
+#   frame         Blender's 4-digit frame suffix, stripped from the job
+#
+# and files are joined on the job, so the frame suffix no longer leaks into
+# `char` and nothing depends on two names parsing to the same dict.
+#
+#   python pairing.py --img-dir /tmp/blender-outputs --report unmatched.csv
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg")
+MASK_NODES = {"segmentation-material"}
+
+
+def node_kind(node):
+    n = node.lower()
+    return "mask" if n in MASK_NODES or "mask" in n or "segmentation" in n else "image"
+
+
+def split_output_name(name):
+    """(node, job, frame) of an output filename; frame is "" when absent."""
+    stem = name.rsplit(".", 1)[0]
+    if "&" not in stem:
+        m = OUTPUT_NAME_RE.match(stem)
+        if m:
+            return m["node"], m["id"], m["frame"]
+
+    frame = stem[-4:] if stem[-4:].isdigit() else ""
+    node, sep, key = stem[:len(stem) - len(frame)].partition("&")
+    if not sep:
+        return node, "", frame
+    if "type=" in key:
+        key = "&".join(p for p in key.split("&") if not p.startswith("type="))
+    return node, key, frame
+
+
+def meta_from_key(key):
+    meta = {}
+    for part in key.split("&"):
+        if "=" in part:
+            k, v = part.split("=", 1)
+            meta[k] = v
+    return meta
+
+
+def scan_outputs(img_dir):
+    """Sorted (name, path) of image files directly inside img_dir (no stat calls)."""
+    with os.scandir(img_dir) as it:
+        entries = [
+            (e.name, e.path) for e in it
+            if e.name.lower().endswith(IMAGE_EXTS) and e.is_file()
+        ]
+    entries.sort()
+    return entries
+
+
+def pair_files(entries, manifest=None):
+    """
+    Join (name, path) entries on their job. Returns (groups, unmatched):
+    groups maps job → {"image": Path, "mask": Path, "meta": dict} in first-seen
+    order, unmatched lists {"file", "job", "reason"} for every file that is
+    not in a complete pair or has no manifest record.
+    """
+    manifest = manifest or {}
+    by_job = {rec["job"]: rec for rec in manifest.values()}
+    groups = {}
+    frames = {}
+    unmatched = []
+
+    for name, path in entries:
+        node, job, frame = split_output_name(name)
+        if not job:
+            unmatched.append({"file": name, "job": "", "reason": "no job in name"})
+            continue
+        kind = node_kind(node)
+
+        entry = groups.get(job)
+        if entry is None:
+            rec = manifest.get(job) or by_job.get(job)
+            if rec is not None:
+                meta = csv_fields(rec)
+            elif "=" not in job:
+                unmatched.append({"file": name, "job": job, "reason": "frame id not in manifest"})
+                meta = {"frame_id": job}
+            else:
+                meta = meta_from_key(job)
+            entry = groups[job] = {"image": None, "mask": None, "meta": meta}
+
+        previous = entry[kind]
+        if previous is not None:
+            # re-rendered frame: keep the highest frame number
+            if frame > frames[job, kind]:
+                entry[kind] = path
+                frames[job, kind] = frame
+                dropped = os.path.basename(previous)
+            else:
+                dropped = name
+            unmatched.append({"file": dropped, "job": job, "reason": f"duplicate {kind}"})
+            continue
+        entry[kind] = path
+        frames[job, kind] = frame
+
+    for job, entry in groups.items():
+        for kind, other in (("image", "mask"), ("mask", "image")):
+            if entry[kind] is None:
+                unmatched.append({"file": os.path.basename(entry[other]), "job": job, "reason": f"no {kind}"})
+            else:
+                entry[kind] = Path(entry[kind])
+
+    return groups, unmatched
+
+
+def write_unmatched(unmatched, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["file", "job", "reason"])
+        writer.writeheader()
+        writer.writerows(unmatched)
+
+
+def summarize_unmatched(unmatched):
+    counts = {}
+    for u in unmatched:
+        counts[u["reason"]] = counts.get(u["reason"], 0) + 1
+    return counts
+
+
+# ----------------------------------------------------------
+# Main
+# ----------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Pair rendered images and masks and report unmatched files")
+    parser.add_argument("--img-dir", required=True)
+    parser.add_argument("--manifest", required=False, help=f"Frame manifest (default: <img-dir>/{MANIFEST_NAME})")
+    parser.add_argument("--report", required=False, help="Unmatched files CSV")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    entries = scan_outputs(args.img_dir)
+    scan_s = time.perf_counter() - t0
+    manifest = load_manifest(args.manifest or os.path.join(args.img_dir, MANIFEST_NAME))
+    t0 = time.perf_counter()
+    groups, unmatched = pair_files(entries, manifest)
+    pair_s = time.perf_counter() - t0
+
+    complete = sum(1 for g in groups.values() if g["image"] is not None and g["mask"] is not None)
+    print(f"📂 {len(entries)} files listed in {scan_s:.2f}s, paired in {pair_s:.2f}s")
+    print(f"✅ {complete} complete pairs of {len(groups)} jobs")
+    for reason, n in sorted(summarize_unmatched(unmatched).items(), key=lambda x: -x[1]):
+        print(f"⚠️ {reason}: {n}")
+    if args.report:
+        write_unmatched(unmatched, args.report)
+        print(f"Unmatched → {args.report}")
+
+
+if __name__ == "__main__":
+    main()
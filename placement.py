@@ -0,0 +1,162 @@
+import argparse
+import time
+import numpy as np
+
+from sampling import relative_jitter
+
+# Pre-render check that the character is actually in frame: project a set of
+# armature points (bone heads/tails or bbox corners, armature-local) through
+# the camera for many candidate placements at once and keep the ones whose
+# visible fraction is above a threshold.
+#
+#   python placement.py --candidates 20000     # throughput on a synthetic camera
+
+
+# ----------------------------------------------------------
+# Camera
+# ----------------------------------------------------------
+
+class CameraModel:
+    """
+    Pinhole model of a Blender perspective camera (looks down its local -Z,
+    +Y up), from the evaluated matrix_world and the camera data.
+    """
+
+    def __init__(self, matrix_world, lens, sensor_width, sensor_height, sensor_fit,
+                 res_x, res_y, shift_x=0.0, shift_y=0.0):
+        self.world_to_cam = np.linalg.inv(np.asarray(matrix_world, dtype=np.float64))
+        self.res_x = res_x
+        self.res_y = res_y
+
+        if sensor_fit == "VERTICAL" or (sensor_fit == "AUTO" and res_y > res_x):
+            sensor = sensor_height if sensor_fit == "VERTICAL" else sensor_width
+            self.focal_px = lens / sensor * res_y
+        else:
+            self.focal_px = lens / sensor_width * res_x
+        # shift is a fraction of the larger image dimension
+        self.cx = res_x / 2 + shift_x * max(res_x, res_y)
+        self.cy = res_y / 2 - shift_y * max(res_x, res_y)
+
+    def project(self, points):
+        """
+        (..., 3) world points → (..., 2) pixel coordinates (x right, y down)
+        and a (...) mask of points in front of the camera.
+        """
+        r = self.world_to_cam[:3, :3]
+        t = self.world_to_cam[:3, 3]
+        p = points @ r.T + t
+        depth = -p[..., 2]
+        in_front = depth > 1e-6
+        safe = np.where(in_front, depth, 1.0)
+        uv = np.empty(points.shape[:-1] + (2,))
+        uv[..., 0] = self.cx + self.focal_px * p[..., 0] / safe
+        uv[..., 1] = self.cy - self.focal_px * p[..., 1] / safe
+        return uv, in_front
+
+
+def look_at_matrix(location, target=(0.0, 0.0, 0.0)):
+    """matrix_world of a camera at `location` aimed at `target` (Track To, up = +Z)."""
+    loc = np.asarray(location, dtype=np.float64)
+    back = loc - np.asarray(target, dtype=np.float64)
+    back /= np.linalg.norm(back)
+    up = np.array([0.0, 0.0, 1.0])
+    if abs(back @ up) > 0.999:
+        up = np.array([0.0, 1.0, 0.0])
+    right = np.cross(up, back)
+    right /= np.linalg.norm(right)
+    m = np.eye(4)
+    m[:3, 0] = right
+    m[:3, 1] = np.cross(back, right)
+    m[:3, 2] = back
+    m[:3, 3] = loc
+    return m
+
+
+# ----------------------------------------------------------
+# Visibility
+# ----------------------------------------------------------
+
+def bbox_points(min_xyz, max_xyz, steps=3):
+    """Grid of steps³ points spanning an axis-aligned box (8 corners for steps=2)."""
+    axes = [np.linspace(lo, hi, steps) for lo, hi in zip(min_xyz, max_xyz)]
+    return np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3)
+
+
+def visible_fractions(camera: CameraModel, local_points, locations, rot_z_degs=(0.0,), margin=0.0):
+    """
+    Fraction of `local_points` (P, 3) inside the image for every candidate
+    location (N, 3) and Z rotation (R,): returns (N, R). The armature is
+    assumed unscaled, rotated about its origin. `margin` (px) shrinks the
+    accepted image area.
+    """
+    local_points = np.asarray(local_points, dtype=np.float64)
+    locations = np.asarray(locations, dtype=np.float64).reshape(-1, 3)
+    angles = np.radians(np.asarray(rot_z_degs, dtype=np.float64).reshape(-1))
+
+    c, s = np.cos(angles), np.sin(angles)
+    rotated = np.empty((len(angles),) + local_points.shape)
+    rotated[..., 0] = c[:, None] * local_points[:, 0] - s[:, None] * local_points[:, 1]
+    rotated[..., 1] = s[:, None] * local_points[:, 0] + c[:, None] * local_points[:, 1]
+    rotated[..., 2] = local_points[:, 2]
+
+    world = locations[:, None, None, :] + rotated[None]           # (N, R, P, 3)
+    uv, in_front = camera.project(world)
+    inside = (
+        in_front
+        & (uv[..., 0] >= margin) & (uv[..., 0] < camera.res_x - margin)
+        & (uv[..., 1] >= margin) & (uv[..., 1] < camera.res_y - margin)
+    )
+    return inside.mean(axis=-1)
+
+
+def find_placement(camera, local_points, first, base, rot_z_degs, threshold, rng,
+                   sigma_ratio=0.05, clamp_ratio=0.10, tries=64, margin=0.0):
+    """
+    Keep `first` if its worst visible fraction over all Z rotations reaches
+    `threshold`; otherwise draw `tries` jittered candidates around `base` in
+    one batch and take the first that passes (or the best one).
+    Returns (location, fraction, candidates evaluated).
+    """
+    frac = visible_fractions(camera, local_points, first, rot_z_degs, margin).min()
+    if frac >= threshold or tries <= 0:
+        return tuple(np.asarray(first, dtype=np.float64).tolist()), float(frac), 1
+
+    candidates = relative_jitter(
+        rng, np.broadcast_to(np.asarray(base, dtype=np.float64), (tries, 3)), sigma_ratio, clamp_ratio
+    )
+    fracs = visible_fractions(camera, local_points, candidates, rot_z_degs, margin).min(axis=1)
+    passing = np.flatnonzero(fracs >= threshold)
+    best = passing[0] if passing.size else int(np.argmax(fracs))
+    return tuple(candidates[best].tolist()), float(fracs[best]), 1 + tries
+
+
+# ----------------------------------------------------------
+# Main
+# ----------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized frustum check")
+    parser.add_argument("--candidates", type=int, default=10000)
+    parser.add_argument("--points", type=int, default=3, help="bbox grid steps per axis")
+    parser.add_argument("--rots", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    camera = CameraModel(look_at_matrix((2.5, -2.5, 1.75), (0, 0, 1.0)), 50.0, 36.0, 24.0, "AUTO", 720, 1280)
+    points = bbox_points((-0.3, -0.2, 0.0), (0.3, 0.2, 1.8), args.points)
+    rng = np.random.default_rng(args.seed)
+    locations = relative_jitter(rng, np.broadcast_to([0.55, -0.55, 0.2], (args.candidates, 3)), 0.5, 1.0)
+    angles = [i * 45 for i in range(args.rots)]
+
+    t0 = time.perf_counter()
+    fracs = visible_fractions(camera, points, locations, angles).min(axis=1)
+    dt = time.perf_counter() - t0
+
+    print(f"📐 {args.candidates} candidates × {len(angles)} rotations × {len(points)} points "
+          f"in {dt * 1000:.1f} ms → {args.candidates / dt:.0f} candidates/s")
+    for thr in (0.5, 0.9, 1.0):
+        print(f"   visible ≥ {thr:.0%}: {np.mean(fracs >= thr):.1%} of candidates")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,23 @@
-import bpy
-import math
+import argparse
 import os
-import json
-import mathutils
-from mathutils import Euler
 import platform
-import random
+import sys
+import tempfile
+
+# render_sweep.py and the other pipeline modules are imported from this
+# script's folder: run it by its path in the repository checkout
+# (blender -b scene.blend -P <repo>/render-genesis.py), not from Blender's Text
+# Editor, where __file__ is the text block name and resolves against the cwd.
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if not os.path.exists(os.path.join(SCRIPT_DIR, "render_sweep.py")):
+    raise SystemExit(f"❌ render_sweep.py not found in {SCRIPT_DIR}: run {os.path.basename(__file__)} "
+                     "by its path in the repository checkout (blender -b scene.blend -P <repo>/<script>)")
+sys.path.append(SCRIPT_DIR)
+from blender_args import script_args
+from render_telemetry import LOG_LEVELS, Telemetry
+from render_sweep import (
+    RenderPass, SweepConfig, dry_run_report, list_pose_files, parse_shard, print_dry_run, run_sweep,
+)
 
 # ────────────────────────────────────────────────────────────────
 # CROSS-PLATFORM BASE PATH RESOLVER
@@ -38,7 +50,15 @@ def targetPath(*parts):
 # ──────────────────────────────
 # FORCE Cycles to use GPU in headless mode
 # ──────────────────────────────
-if(platform.system().lower().startswith("linux")):
+def configure_gpu():
+    """
+    Device probing (prefs.get_devices) takes seconds, so this only runs
+    from main() right before rendering, never on import.
+    """
+    import bpy
+    if not platform.system().lower().startswith("linux"):
+        return
+
     # Set device to GPU
     bpy.context.preferences.addons["cycles"].preferences.compute_device_type = "CUDA" # or "OPTIX" or "HIP"
 
@@ -54,21 +74,21 @@ if(platform.system().lower().startswith("linux")):
     # Ensure scene uses Cycles GPU
     bpy.context.scene.render.engine = "CYCLES"
     bpy.context.scene.cycles.device = "GPU"
-    
+
     # Set Cycles render settings
     cycles = bpy.context.scene.cycles
-    
+
     cycles.tile_size = 1024
-    
+
     cycles.samples = 4096
     cycles.use_adaptive_sampling = True
     cycles.adaptive_threshold = 0.01
-    
+
     cycles.max_bounces = 12
     cycles.diffuse_bounces = 4
     cycles.glossy_bounces = 4
     cycles.transmission_bounces = 12
-    
+
     cycles.use_guiding = True
     cycles.guiding_training_samples = 64
 
@@ -108,380 +128,164 @@ textures = ["none"]
 
 # Pose JSON folder (each file contains {"pose": [..floats..]})
 poses_dir = targetPath("poses") # ("characters", characterArmature, "poses")
-pose_files = [os.path.join(poses_dir, f) for f in os.listdir(poses_dir) if f.endswith(".json")]
 
 
 # Define the Z-axis rotation angles for the body
 zAngles = [0, 45, 90, 135, 180]
 
-# ──────────────────────────────
-# UTILITIES
-# ──────────────────────────────
-def toggle_output_nodes(enable_node_name: str):
-    scene = bpy.context.scene
-    scene.use_nodes = True
-    for node in scene.node_tree.nodes:
-        if node.type != 'OUTPUT_FILE':
-            continue
-        node.mute = node.name != enable_node_name
-        print(f"{'✅ Enabled' if not node.mute else '⏸️ Disabled'} node '{node.name}'")
-
-def set_visibility(name: str, visible: bool):
-    obj = bpy.context.scene.objects.get(name)
-    if not obj:
-        print(f"⚠️ Object '{name}' not found.")
-        return
-    obj.hide_viewport = not visible
-    obj.hide_render = not visible
-    print(f"🔁 {name} visible={visible}")
-
-def set_environment_texture(path: str | None):
-    world = bpy.context.scene.world
-    if not world:
-        print("⚠️ No World in scene.")
-        return
-    world.use_nodes = True
-    tree = world.node_tree
-    env_node = next((n for n in tree.nodes if n.type == "TEX_ENVIRONMENT"), None)
-    if not env_node:
-        env_node = tree.nodes.new("ShaderNodeTexEnvironment")
-        env_node.location = (-300, 0)
-        bg_node = next((n for n in tree.nodes if n.type == "BACKGROUND"), None)
-        if bg_node:
-            tree.links.new(env_node.outputs["Color"], bg_node.inputs["Color"])
-
-    bg_node = next((n for n in tree.nodes if n.type == "BACKGROUND"), None)
-    if path and os.path.exists(path):
-        env_node.image = bpy.data.images.load(path, check_existing=True)
-        print(f"🌍 Loaded environment: {os.path.basename(path)}")
-    else:
-        env_node.image = None
-        if bg_node:
-            bg_node.inputs["Color"].default_value = (0.5, 0.5, 0.5, 1)
-        print("🌫️ Using default gray environment.")
-
-def set_camera_location(location_tuple):
-    cam = bpy.context.scene.camera
-    if cam:
-        cam.location = location_tuple
-        print(f"🎥 Set camera location to {tuple(round(v, 3) for v in location_tuple)}")
-    else:
-        print("⚠️ No active camera found.")
-
-def add_camera_position_variance(base_loc, variance_ratio=0.10):
-    """
-    Adds up to ±variance_ratio noise to each camera *position* axis.
-    base_loc is a tuple (x, y, z).
-    Returns a new tuple with randomized offsets.
-    """
-    noisy = []
-    for coord in base_loc:
-        max_delta = abs(coord) * variance_ratio
-        delta = random.uniform(-max_delta, max_delta)
-        noisy.append(coord + delta)
-    return tuple(noisy)
-
-def add_camera_position_gaussian(base_loc, sigma_ratio=0.05, clamp_ratio=0.15):
-    """
-    Adds Gaussian noise to each camera *position* axis.
-    - sigma_ratio: σ = percentage of base coordinate (default = 5%)
-    - clamp_ratio: hard cap for max deviation (default = 15%)
-
-    If a coordinate is zero, a fallback value (1.0) is used to allow noise.
-    """
-    noisy = []
-    for coord in base_loc:
-        # avoid zero-variance when coordinate = 0
-        coord_abs = abs(coord) if abs(coord) > 1e-6 else 1.0
-
-        sigma = coord_abs * sigma_ratio
-        clamp = coord_abs * clamp_ratio
-
-        # Gaussian noise
-        delta = random.gauss(0, sigma)
-
-        # clamp extreme values
-        delta = max(-clamp, min(clamp, delta))
-
-        noisy.append(coord + delta)
-
-    return tuple(noisy)
-
-def add_object_position_noise(
-    base_loc: tuple[float, float, float],
-    sigma_ratio=0.05,
-    clamp_ratio=0.15
-):
-    """
-    Gaussian XYZ noise for object location.
-    - sigma_ratio: % of base coordinate used as σ
-    - clamp_ratio: hard clamp as % of base coordinate
-    """
-    noisy = []
-    for coord in base_loc:
-        ref = abs(coord) if abs(coord) > 1e-6 else 1.0
-        sigma = ref * sigma_ratio
-        clamp = ref * clamp_ratio
-
-        delta = random.gauss(0, sigma)
-        delta = max(-clamp, min(clamp, delta))
-
-        noisy.append(coord + delta)
-
-    return tuple(noisy)
+# Write compact labels (bboxes, RLE, histogram) read straight from the
+# IndexMA pass after each segmentation render, next to the mask PNG
+exportLabelsInBlender = False
+
+# Check each segmentation render (frame_quality.py: near-empty, single class,
+# cropped) and skip the color render of rejected frames; their masks go to
+# rejected/ next to the outputs with the reasons in rejected/rejected.jsonl
+qualityGateInBlender = False
+
+# One JSONL record per frame (phase timings, samples, resolution, device,
+# memory); summarize with `python render_telemetry.py <file>`.
+# logLevel: "debug" (per-object chatter) | "info" | "warn" | "quiet"
+telemetryPath = os.path.join(tempfile.gettempdir(), "blender-telemetry", "render-genesis.jsonl")
+logLevel = "info"
+
+# Split one sweep across pods (jobs with index % shardCount == shardIndex)
+# and resume after a restart: finished jobs are appended to doneLedgerPath
+# and skipped on the next run (None = no ledger)
+shardIndex, shardCount = 0, 1
+doneLedgerPath = None
+
+# Camera / object jitter seed (see sampling.py); use the same seed on every
+# shard of a sweep. None = fresh seed per run, recorded in telemetry
+noiseSeed = None
+
+# Output names: "hash" writes {node}_{frame id}_0001.png plus one frames.jsonl
+# record per frame (axis values, seed, sampled noise; see frame_manifest.py)
+# next to the outputs; "meta" keeps the long {node}&env=...&char=... names
+outputNameFormat = "hash"
+
+# Preload every texture once into its own copy of the slot material and
+# switch textures by slot assignment instead of reloading the image node.
+# Estimated GPU texture memory is logged and stored in telemetry; above
+# textureBudgetMB (0 = no limit) the sweep falls back to per-texture reloads
+textureVariants = True
+textureBudgetMB = 0
+
+# One render per pass: the material pass writes the segmentation mask,
+# the color pass the RGB image
+passes = [
+    RenderPass(mainObjectId, "segmentation-material", {
+        mainMeshId: True,
+        secondMeshId: False,
+        "main-hair-material": True,
+        "main-eyes-material": True,
+        "main-eyelashes-material": True,
+        "main-eyebrows-material": True,
+        "main-hair-color": False,
+        "main-eyes-color": False,
+        "main-eyelashes-color": False,
+        "main-eyebrows-color": False,
+    }),
+    RenderPass(secondObjectId, "image", {
+        mainMeshId: False,
+        secondMeshId: True,
+        "main-hair-material": False,
+        "main-eyes-material": False,
+        "main-eyelashes-material": False,
+        "main-eyebrows-material": False,
+        "main-hair-color": True,
+        "main-eyes-color": True,
+        "main-eyelashes-color": True,
+        "main-eyebrows-color": True,
+    }),
+]
 
-def set_object_location(obj_name: str, location: tuple):
-    obj = bpy.context.scene.objects.get(obj_name)
-    if not obj:
-        print(f"⚠️ Object '{obj_name}' not found for positioning")
-        return
-    obj.location = location
-    # print(
-    #     f"📍 {obj_name} location → "
-    #     f"{tuple(round(v, 3) for v in location)}"
-    # )
-    
-def compute_object_position_from_camera(
-    cam_loc: tuple[float, float, float],
-    rel_pos: tuple[float, float, float]
-) -> tuple[float, float, float]:
-    """
-    Convert relative object position into world-space position
-    by scaling it with the current camera XYZ.
-    """
-    return (
-        cam_loc[0] * rel_pos[0],
-        cam_loc[1] * rel_pos[1],
-        cam_loc[2] * rel_pos[2],
+def build_sweep():
+    return SweepConfig(
+        script="render-genesis",
+        char=characterArmature,
+        passes=passes,
+        texture_mesh=secondMeshId,
+        texture_slot="main-male.001",
+        env_textures=envTextures,
+        camera_positions=camera_positions,
+        textures=textures,
+        pose_files=list_pose_files(poses_dir),
+        z_angles=zAngles,
+        camera_mode="location",
+        object_positions_relative=object_positions_relative,
+        pose_format="dict",
+        camera_sigma_ratio=0.1,   # 10% natural variation
+        camera_clamp_ratio=0.20,  # max allowed ±20% deviation
+        object_sigma_ratio=0.05,
+        object_clamp_ratio=0.10,
+        seed=noiseSeed,
+        export_labels=exportLabelsInBlender,
+        quality_gate=qualityGateInBlender,
+        name_format=outputNameFormat,
+        texture_variants=textureVariants,
+        texture_budget_mb=textureBudgetMB,
     )
 
-def set_mesh_texture(mesh_name: str, slot_name: str, texture_path: str):
-    """Assigns texture to specific material slot if exists."""
-    obj = bpy.context.scene.objects.get(mesh_name)
-    if not obj:
-        print(f"⚠️ Object '{mesh_name}' not found.")
-        return
-
-    mat_slot = next((m for m in obj.material_slots if m.name == slot_name), None)
-    if not mat_slot or not mat_slot.material:
-        print(f"⚠️ Material slot '{slot_name}' not found on '{mesh_name}'.")
+# ──────────────────────────────
+# MAIN (see render_sweep.run_sweep)
+# ──────────────────────────────
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render the genesis sweep: blender -b scene.blend -P render-genesis.py -- [options]"
+    )
+    parser.add_argument("--shard", default=f"{shardIndex}/{shardCount}", help="index/count")
+    parser.add_argument("--done-ledger", default=doneLedgerPath, help="Resume ledger JSONL")
+    parser.add_argument("--telemetry", default=telemetryPath)
+    parser.add_argument("--log-level", choices=list(LOG_LEVELS), default=logLevel)
+    parser.add_argument("--seed", type=int, default=noiseSeed, help="Noise seed")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Print frame counts, disk / GPU-hour estimates and missing assets, then exit (no Blender needed)")
+    parser.add_argument("--outputs-dir", required=False,
+                        help="Previous outputs to sample file sizes from (--dry-run)")
+    parser.add_argument("--asset-manifest", required=False,
+                        help="Write the env / texture / pose assets of this sweep for asset_cache.py, then exit")
+    args = parser.parse_args(script_args() if argv is None else argv)
+
+    if args.asset_manifest:
+        from asset_cache import asset_manifest, write_asset_manifest
+        write_asset_manifest(args.asset_manifest, asset_manifest(
+            targetPath(), envTextures + textures, {poses_dir: ".json"}
+        ))
         return
 
-    mat = mat_slot.material
-    mat.use_nodes = True
-    tree = mat.node_tree
-    tex_node = next((n for n in tree.nodes if n.type == "TEX_IMAGE"), None)
-    if not tex_node:
-        tex_node = tree.nodes.new("ShaderNodeTexImage")
-        tex_node.location = (-300, 0)
-        bsdf = next((n for n in tree.nodes if n.type == "BSDF_PRINCIPLED"), None)
-        if bsdf:
-            tree.links.new(tex_node.outputs["Color"], bsdf.inputs["Base Color"])
-
-    if os.path.exists(texture_path):
-        tex_node.image = bpy.data.images.load(texture_path, check_existing=True)
-        print(f"🧩 Applied texture '{os.path.basename(texture_path)}' to '{slot_name}'")
-    else:
-        print(f"⚠️ Texture file not found: {texture_path}")
-
-def apply_pose_dict(armature_obj, pose_dict):
-    """
-    Apply pose transforms to armature based on JSON-friendly data structure.
-    """
-    if armature_obj.type != 'ARMATURE':
-        raise ValueError("Provided object is not an armature")
-
-    bpy.context.view_layer.objects.active = armature_obj
-    bpy.ops.object.mode_set(mode='POSE')
-
-    for bone_name, data in pose_dict.items():
-        if bone_name not in armature_obj.pose.bones:
-            print(f"[WARN] Bone '{bone_name}' not found in armature; skipping")
-            continue
-
-        pb = armature_obj.pose.bones[bone_name]
-
-        # Apply transforms
-        if "rotation_quaternion" in data:
-            pb.rotation_mode = 'QUATERNION'
-            pb.rotation_quaternion = data["rotation_quaternion"]
-
-        if "location" in data:
-            pb.location = data["location"]
-
-        if "scale" in data:
-            pb.scale = data["scale"]
-
-    bpy.ops.object.mode_set(mode='OBJECT')
-    print("[OK] Pose applied successfully")
-    
-def load_pose_from_json_file(armature_obj, filepath):
-    with open(filepath, "r") as f:
-        pose_dict = json.load(f)
-    apply_pose_dict(armature_obj, pose_dict)
-
-def prepare_scene_for_object(armature_name: str, rotZ_deg: float):
-    arm = bpy.context.scene.objects.get(armature_name)
-    if not arm:
-        print(f"⚠️ Armature '{armature_name}' not found.")
+    if args.dry_run:
+        try:
+            sweep = build_sweep()
+        except FileNotFoundError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        report = dry_run_report(sweep, args.telemetry, args.outputs_dir, parse_shard(args.shard)[1])
+        if not print_dry_run(report):
+            sys.exit(1)
         return
 
-    arm.rotation_euler = Euler((0, 0, math.radians(rotZ_deg)))
-    print(f"✅ Rotated '{armature_name}' Z={rotZ_deg}°")
-
-    if armature_name == mainObjectId:
-        toggle_output_nodes("segmentation-material")
-        set_visibility(mainMeshId, True)
-        set_visibility(secondMeshId, False)
-
-        set_visibility("main-hair-material", True)
-        set_visibility("main-eyes-material", True)
-        set_visibility("main-eyelashes-material", True)
-        set_visibility("main-eyebrows-material", True)
-        set_visibility("main-hair-color", False)
-        set_visibility("main-eyes-color", False)
-        set_visibility("main-eyelashes-color", False)
-        set_visibility("main-eyebrows-color", False)
-        
-        
-    elif armature_name == secondObjectId:
-        toggle_output_nodes("image")
-        set_visibility(mainMeshId, False)
-        set_visibility(secondMeshId, True)
-
-        set_visibility("main-hair-material", False)
-        set_visibility("main-eyes-material", False)
-        set_visibility("main-eyelashes-material", False)
-        set_visibility("main-eyebrows-material", False)
-        set_visibility("main-hair-color", True)
-        set_visibility("main-eyes-color", True)
-        set_visibility("main-eyelashes-color", True)
-        set_visibility("main-eyebrows-color", True)
-
-def set_resolution_by_ar(ar: str = "9:16", base_width: int = 720):
-    """
-    Set Blender render resolution using an aspect-ratio string like:
-      - "9:16"  -> 720 × 1280
-      - "2:3"   -> 720 × 1080
-      - "3:4"   -> 720 × 960
-      - "1:1"   -> 720 × 720
+    import bpy
+    from scene_adapter import BpyScene
 
-    If input is invalid, fallback is "9:16".
-    """
-    scene = bpy.context.scene
+    configure_gpu()
+    sweep = build_sweep()
+    sweep.seed = args.seed
+    telemetry = Telemetry(args.telemetry, args.log_level)
+    scene = BpyScene(telemetry.log)
 
-    # --- Parse AR ---
-    try:
-        w_str, h_str = ar.split(":")
-        ar_w = float(w_str)
-        ar_h = float(h_str)
-    except Exception:
-        print(f"[WARN] Invalid AR '{ar}', using default 9:16")
-        ar_w, ar_h = 9.0, 16.0
-
-    # --- Compute resolution ---
-    # scale height relative to base width
-    height = int(base_width * (ar_h / ar_w))
+    def _on_render_stats(stats, *_):
+        telemetry.on_render_stats(str(stats))
 
-    # Apply to Blender
-    scene.render.resolution_x = int(base_width)
-    scene.render.resolution_y = height
-    scene.render.resolution_percentage = 100
-    scene.render.pixel_aspect_x = 1.0
-    scene.render.pixel_aspect_y = 1.0
+    bpy.app.handlers.render_stats.append(_on_render_stats)
 
-    print(f"✓ Resolution set: {base_width} × {height}  (AR {ar})")
+    # scene.set_resolution_by_ar("9:16", 1024)
 
-    return base_width, height
+    try:
+        run_sweep(scene, sweep, telemetry, *parse_shard(args.shard), args.done_ledger)
+    finally:
+        bpy.app.handlers.render_stats.remove(_on_render_stats)
+        telemetry.close()
 
-# ──────────────────────────────
-# MAIN LOOP (with per-loop progress)
-# ──────────────────────────────
-total_envs = len(envTextures)
-total_cams = len(camera_positions)
-total_rots = len(zAngles)
-total_poses = len(pose_files)
-total_textures = len(textures)
-total_obj_positions = len(object_positions_relative)
-total_objs = 2  # mainObjectId + secondObjectId
-total_combinations = total_envs * total_cams * total_textures * total_rots * total_poses * total_obj_positions * total_objs
-
-progress = 0
-
-# set_resolution_by_ar("9:16", 1024)
-
-for e_idx, env_path in enumerate(envTextures, start=1):
-    env_name = os.path.splitext(os.path.basename(env_path))[0] if os.path.exists(env_path) else "noenv"
-    set_environment_texture(env_path if os.path.exists(env_path) else None)
-
-    for c_idx, (cam_name, cam_pos) in enumerate(camera_positions.items(), start=1):
-        # apply ±20% random variance
-        # cam_pos_noisy = add_camera_position_variance(cam_pos, 0.20)
-        cam_pos_noisy = add_camera_position_gaussian(
-            cam_pos,
-            sigma_ratio=0.1,   # 10% natural variation
-            clamp_ratio=0.20    # max allowed ±20% deviation
-        )
-        set_camera_location(cam_pos_noisy)
-
-        for t_idx, tex_path in enumerate(textures, start=1):
-            if(os.path.exists(tex_path)):
-                tex_name = os.path.splitext(os.path.basename(tex_path))[0]
-                set_mesh_texture(secondMeshId, "main-male.001", tex_path)
-            else:
-                tex_name = "none"
-                
-            for o_idx, (obj_pos_name, obj_rel_pos) in enumerate(object_positions_relative.items(), start=1):
-                # Scale relative position by current camera position
-                obj_base_pos = compute_object_position_from_camera(
-                    cam_pos_noisy,
-                    obj_rel_pos
-                )
-
-                # Apply Gaussian noise in world space
-                obj_pos_noisy = add_object_position_noise(
-                    obj_base_pos,
-                    sigma_ratio=0.05,
-                    clamp_ratio=0.10
-                )
-                set_object_location(mainObjectId, obj_pos_noisy)
-                set_object_location(secondObjectId, obj_pos_noisy)
-
-                for r_idx, rotZ_deg in enumerate(zAngles, start=1):
-                    for p_idx, pose_path in enumerate(pose_files, start=1):
-                        pose_name = os.path.splitext(os.path.basename(pose_path))[0]
-
-                        print(f"\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-                        print(
-                            f"ENV: {env_name} ({e_idx}/{total_envs}) | "
-                            f"CAM: {cam_name} ({c_idx}/{total_cams}) | "
-                            f"OBJPOS: {obj_pos_name} ({o_idx}/{total_obj_positions}) | "
-                            f"TEX: {tex_name} ({t_idx}/{total_textures}) | "
-                            f"ROTZ: {rotZ_deg}° ({r_idx}/{total_rots}) | "
-                            f"POSE: {pose_name} ({p_idx}/{total_poses})"
-                        )
-                        print(f"Global progress: {progress}/{total_combinations} total")
-                        print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-
-                        mainArmature = bpy.data.objects[mainObjectId]
-                        load_pose_from_json_file(mainArmature, pose_path)
-                        
-                        secondArmature = bpy.data.objects[secondObjectId]
-                        load_pose_from_json_file(secondArmature, pose_path)
-
-                        for current_obj in [mainObjectId, secondObjectId]:
-                            progress += 1
-                            prepare_scene_for_object(current_obj, rotZ_deg)
-
-                            scene = bpy.context.scene
-                            tree = scene.node_tree
-                            for node in tree.nodes:
-                                if node.type == "OUTPUT_FILE" and not node.mute:
-                                    node.file_slots[0].path = (
-                                        f"{node.name}&env={env_name}&cam={cam_name}&tex={tex_name}&rotZ={rotZ_deg}&pose={pose_name}&zoom={obj_pos_name}&char={characterArmature}"
-                                    )
-                                    print(f"📂 Output path for '{node.name}' → {node.file_slots[0].path}")
-
-                            bpy.ops.render.render(write_still=True)
-                            print(f"🖼️ Render done for '{current_obj}' ({pose_name}) [{progress}/{total_combinations}] ✅\n")
 
+if __name__ == "__main__":
+    main()
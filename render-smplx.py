@@ -1,11 +1,23 @@
-import bpy
-import math
+import argparse
 import os
-import json
-import mathutils
-from mathutils import Euler
 import platform
-import random
+import sys
+import tempfile
+
+# render_sweep.py and the other pipeline modules are imported from this
+# script's folder: run it by its path in the repository checkout
+# (blender -b scene.blend -P <repo>/render-smplx.py), not from Blender's Text
+# Editor, where __file__ is the text block name and resolves against the cwd.
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+if not os.path.exists(os.path.join(SCRIPT_DIR, "render_sweep.py")):
+    raise SystemExit(f"❌ render_sweep.py not found in {SCRIPT_DIR}: run {os.path.basename(__file__)} "
+                     "by its path in the repository checkout (blender -b scene.blend -P <repo>/<script>)")
+sys.path.append(SCRIPT_DIR)
+from blender_args import script_args
+from render_telemetry import LOG_LEVELS, Telemetry
+from render_sweep import (
+    RenderPass, SweepConfig, dry_run_report, list_pose_files, parse_shard, print_dry_run, run_sweep,
+)
 
 # ────────────────────────────────────────────────────────────────
 # CROSS-PLATFORM BASE PATH RESOLVER
@@ -38,7 +50,15 @@ def targetPath(*parts):
 # ──────────────────────────────
 # FORCE Cycles to use GPU in headless mode
 # ──────────────────────────────
-if(platform.system().lower().startswith("linux")):
+def configure_gpu():
+    """
+    Device probing (prefs.get_devices) takes seconds, so this only runs
+    from main() right before rendering, never on import.
+    """
+    import bpy
+    if not platform.system().lower().startswith("linux"):
+        return
+
     # Set device to GPU
     bpy.context.preferences.addons["cycles"].preferences.compute_device_type = "CUDA" # or "OPTIX" or "HIP"
 
@@ -54,21 +74,21 @@ if(platform.system().lower().startswith("linux")):
     # Ensure scene uses Cycles GPU
     bpy.context.scene.render.engine = "CYCLES"
     bpy.context.scene.cycles.device = "GPU"
-    
+
     # Set Cycles render settings
     cycles = bpy.context.scene.cycles
-    
+
     cycles.tile_size = 1024
-    
+
     cycles.samples = 4096
     cycles.use_adaptive_sampling = True
     cycles.adaptive_threshold = 0.01
-    
+
     cycles.max_bounces = 12
     cycles.diffuse_bounces = 4
     cycles.glossy_bounces = 4
     cycles.transmission_bounces = 12
-    
+
     cycles.use_guiding = True
     cycles.guiding_training_samples = 64
 
@@ -104,133 +124,47 @@ textures = [
 
 # Pose JSON folder (each file contains {"pose": [..floats..]})
 poses_dir = targetPath("poses")
-pose_files = [os.path.join(poses_dir, f) for f in os.listdir(poses_dir) if f.endswith(".json")]
 
 
 # Define the Z-axis rotation angles for the body
 zAngles = [0] # [0, 45, 90, 135, 180]
 
-# ──────────────────────────────
-# UTILITIES
-# ──────────────────────────────
-def toggle_output_nodes(enable_node_name: str):
-    scene = bpy.context.scene
-    scene.use_nodes = True
-    for node in scene.node_tree.nodes:
-        if node.type != 'OUTPUT_FILE':
-            continue
-        node.mute = node.name != enable_node_name
-        print(f"{'✅ Enabled' if not node.mute else '⏸️ Disabled'} node '{node.name}'")
-
-def set_visibility(name: str, visible: bool):
-    obj = bpy.context.scene.objects.get(name)
-    if not obj:
-        print(f"⚠️ Object '{name}' not found.")
-        return
-    obj.hide_viewport = not visible
-    obj.hide_render = not visible
-    print(f"🔁 {name} visible={visible}")
-
-def set_environment_texture(path: str | None):
-    world = bpy.context.scene.world
-    if not world:
-        print("⚠️ No World in scene.")
-        return
-    world.use_nodes = True
-    tree = world.node_tree
-    env_node = next((n for n in tree.nodes if n.type == "TEX_ENVIRONMENT"), None)
-    if not env_node:
-        env_node = tree.nodes.new("ShaderNodeTexEnvironment")
-        env_node.location = (-300, 0)
-        bg_node = next((n for n in tree.nodes if n.type == "BACKGROUND"), None)
-        if bg_node:
-            tree.links.new(env_node.outputs["Color"], bg_node.inputs["Color"])
-
-    bg_node = next((n for n in tree.nodes if n.type == "BACKGROUND"), None)
-    if path and os.path.exists(path):
-        env_node.image = bpy.data.images.load(path, check_existing=True)
-        print(f"🌍 Loaded environment: {os.path.basename(path)}")
-    else:
-        env_node.image = None
-        if bg_node:
-            bg_node.inputs["Color"].default_value = (0.5, 0.5, 0.5, 1)
-        print("🌫️ Using default gray environment.")
-
-def set_camera_rotation(rotation_tuple):
-    cam = bpy.context.scene.camera
-    if cam:
-        cam.rotation_euler = rotation_tuple
-        print(f"🎥 Set camera rotation to {tuple(round(math.degrees(a), 1) for a in rotation_tuple)}°")
-    else:
-        print("⚠️ No active camera found.")
-
-def add_camera_variance(base_rot, variance_ratio=0.10):
-    """
-    Adds up to ±variance_ratio (default ±10%) noise to each Euler axis.
-    base_rot is a tuple (x, y, z) in radians.
-    Returns a new tuple with randomized offsets.
-    """
-    noisy = []
-    for angle in base_rot:
-        max_delta = abs(angle) * variance_ratio
-        delta = random.uniform(-max_delta, max_delta)
-        noisy.append(angle + delta)
-    return tuple(noisy)
-
-def add_camera_gaussian_noise(base_rot, sigma_ratio=0.05, clamp_ratio=0.15):
-    """
-    Adds Gaussian noise to each Euler axis.
-    - sigma_ratio: standard deviation as a fraction of the base rotation (default = 5%)
-    - clamp_ratio: hard cap to limit extreme values (default = ±15%)
-
-    If a rotation axis is zero, σ becomes a small constant so we still allow noise.
-    """
-    noisy = []
-    for angle in base_rot:
-        # avoid zero-variance when angle = 0
-        angle_abs = abs(angle) if abs(angle) > 1e-6 else 1.0
-
-        sigma = angle_abs * sigma_ratio
-        clamp = angle_abs * clamp_ratio
-
-        # Gaussian noise centered on 0
-        delta = random.gauss(0, sigma)
-
-        # Limit extreme noise
-        delta = max(-clamp, min(clamp, delta))
-
-        noisy.append(angle + delta)
-
-    return tuple(noisy)
-
-def set_mesh_texture(mesh_name: str, slot_name: str, texture_path: str):
-    """Assigns texture to specific material slot if exists."""
-    obj = bpy.context.scene.objects.get(mesh_name)
-    if not obj:
-        print(f"⚠️ Object '{mesh_name}' not found.")
-        return
-
-    mat_slot = next((m for m in obj.material_slots if m.name == slot_name), None)
-    if not mat_slot or not mat_slot.material:
-        print(f"⚠️ Material slot '{slot_name}' not found on '{mesh_name}'.")
-        return
-
-    mat = mat_slot.material
-    mat.use_nodes = True
-    tree = mat.node_tree
-    tex_node = next((n for n in tree.nodes if n.type == "TEX_IMAGE"), None)
-    if not tex_node:
-        tex_node = tree.nodes.new("ShaderNodeTexImage")
-        tex_node.location = (-300, 0)
-        bsdf = next((n for n in tree.nodes if n.type == "BSDF_PRINCIPLED"), None)
-        if bsdf:
-            tree.links.new(tex_node.outputs["Color"], bsdf.inputs["Base Color"])
-
-    if os.path.exists(texture_path):
-        tex_node.image = bpy.data.images.load(texture_path, check_existing=True)
-        print(f"🧩 Applied texture '{os.path.basename(texture_path)}' to '{slot_name}'")
-    else:
-        print(f"⚠️ Texture file not found: {texture_path}")
+# Write compact labels (bboxes, RLE, histogram) read straight from the
+# IndexMA pass after each segmentation render, next to the mask PNG
+exportLabelsInBlender = False
+
+# Check each segmentation render (frame_quality.py: near-empty, single class,
+# cropped) and skip the color render of rejected frames; their masks go to
+# rejected/ next to the outputs with the reasons in rejected/rejected.jsonl
+qualityGateInBlender = False
+
+# One JSONL record per frame (phase timings, samples, resolution, device,
+# memory); summarize with `python render_telemetry.py <file>`.
+# logLevel: "debug" (per-object chatter) | "info" | "warn" | "quiet"
+telemetryPath = os.path.join(tempfile.gettempdir(), "blender-telemetry", "render-smplx.jsonl")
+logLevel = "info"
+
+# Split one sweep across pods (jobs with index % shardCount == shardIndex)
+# and resume after a restart: finished jobs are appended to doneLedgerPath
+# and skipped on the next run (None = no ledger)
+shardIndex, shardCount = 0, 1
+doneLedgerPath = None
+
+# Camera / object jitter seed (see sampling.py); use the same seed on every
+# shard of a sweep. None = fresh seed per run, recorded in telemetry
+noiseSeed = None
+
+# Output names: "hash" writes {node}_{frame id}_0001.png plus one frames.jsonl
+# record per frame (axis values, seed, sampled noise; see frame_manifest.py)
+# next to the outputs; "meta" keeps the long {node}&env=...&char=... names
+outputNameFormat = "hash"
+
+# Preload every texture once into its own copy of the slot material and
+# switch textures by slot assignment instead of reloading the image node.
+# Estimated GPU texture memory is logged and stored in telemetry; above
+# textureBudgetMB (0 = no limit) the sweep falls back to per-texture reloads
+textureVariants = True
+textureBudgetMB = 0
 
 pose_to_bone_map = {
     0: "pelvis",
@@ -271,120 +205,97 @@ pose_to_bone_map = {
     52: "right_pinky1", 53: "right_pinky2", 54: "right_pinky3"
 }
 
-def apply_smplx_pose_mapped(filepath, armature_name, pose_to_bone_map):
-    if not os.path.exists(filepath):
-        print("Pose file not found:", filepath); return
-    with open(filepath, "r") as f:
-        data = json.load(f)
-    pose = data.get("pose") if isinstance(data, dict) else data
-
-    arm = bpy.data.objects.get(armature_name)
-    if not arm or arm.type != 'ARMATURE':
-        print("Armature not valid."); return
-
-    bpy.context.view_layer.objects.active = arm
-    bpy.ops.object.mode_set(mode='POSE')
-
-    for i, bone_name in pose_to_bone_map.items():
-        base = i * 3
-        if base + 2 >= len(pose): continue
-        rx, ry, rz = pose[base:base+3]
-        angle = math.sqrt(rx*rx + ry*ry + rz*rz)
-        if angle < 1e-8:
-            quat = mathutils.Quaternion((1, 0, 0, 0))
-        else:
-            axis = mathutils.Vector((rx, ry, rz)) / angle
-            quat = mathutils.Quaternion(axis, angle)
-        bone = arm.pose.bones.get(bone_name)
-        if not bone: continue
-        bone.rotation_mode = 'QUATERNION'
-        bone.rotation_quaternion = quat
-
-    bpy.ops.object.mode_set(mode='OBJECT')
-    bpy.context.view_layer.update()
-    print(f"✅ Pose '{os.path.basename(filepath)}' applied correctly to {armature_name}")
-
-
-def prepare_scene_for_object(armature_name: str, rotZ_deg: float):
-    arm = bpy.context.scene.objects.get(armature_name)
-    if not arm:
-        print(f"⚠️ Armature '{armature_name}' not found.")
-        return
-
-    arm.rotation_euler = Euler((0, 0, math.radians(rotZ_deg)))
-    print(f"✅ Rotated '{armature_name}' Z={rotZ_deg}°")
+# One render per pass: the material pass writes the segmentation mask,
+# the color pass the RGB image
+passes = [
+    RenderPass(mainObjectId, "segmentation-material", {mainMeshId: True, secondMeshId: False}),
+    RenderPass(secondObjectId, "image", {mainMeshId: False, secondMeshId: True}),
+]
 
-    if armature_name == mainObjectId:
-        toggle_output_nodes("segmentation-material")
-        set_visibility(mainMeshId, True)
-        set_visibility(secondMeshId, False)
-    elif armature_name == secondObjectId:
-        toggle_output_nodes("image")
-        set_visibility(mainMeshId, False)
-        set_visibility(secondMeshId, True)
+def build_sweep():
+    return SweepConfig(
+        script="render-smplx",
+        char=characterArmature,
+        passes=passes,
+        texture_mesh=secondMeshId,
+        texture_slot="SMPLX-male.001",
+        env_textures=envTextures,
+        camera_positions=camera_positions,
+        textures=textures,
+        pose_files=list_pose_files(poses_dir),
+        z_angles=zAngles,
+        camera_mode="rotation",
+        pose_format="smplx",
+        pose_bone_map=pose_to_bone_map,
+        skip_missing_textures=False,
+        camera_sigma_ratio=0.1,   # 10% natural variation
+        camera_clamp_ratio=0.20,  # max allowed ±20% deviation
+        seed=noiseSeed,
+        export_labels=exportLabelsInBlender,
+        quality_gate=qualityGateInBlender,
+        name_format=outputNameFormat,
+        texture_variants=textureVariants,
+        texture_budget_mb=textureBudgetMB,
+    )
 
 # ──────────────────────────────
-# MAIN LOOP (with per-loop progress)
+# MAIN (see render_sweep.run_sweep)
 # ──────────────────────────────
-total_envs = len(envTextures)
-total_cams = len(camera_positions)
-total_rots = len(zAngles)
-total_poses = len(pose_files)
-total_textures = len(textures)
-total_objs = 2  # mainObjectId + secondObjectId
-total_combinations = total_envs * total_cams * total_textures * total_rots * total_poses * total_objs
-
-progress = 0
-
-for e_idx, env_path in enumerate(envTextures, start=1):
-    env_name = os.path.splitext(os.path.basename(env_path))[0] if os.path.exists(env_path) else "noenv"
-    set_environment_texture(env_path if os.path.exists(env_path) else None)
-
-    for c_idx, (cam_name, cam_rot) in enumerate(camera_positions.items(), start=1):
-        # apply ±20% random variance
-        # cam_rot_noisy = add_camera_variance(cam_rot, 0.20)
-        cam_rot_noisy = add_camera_gaussian_noise(
-            cam_rot,
-            sigma_ratio=0.1,   # 10% natural variation
-            clamp_ratio=0.20    # max allowed ±20% deviation
-        )
-        set_camera_rotation(cam_rot_noisy)
-
-        for t_idx, tex_path in enumerate(textures, start=1):
-            tex_name = os.path.splitext(os.path.basename(tex_path))[0]
-            set_mesh_texture(secondMeshId, "SMPLX-male.001", tex_path)
-
-            for r_idx, rotZ_deg in enumerate(zAngles, start=1):
-                for p_idx, pose_path in enumerate(pose_files, start=1):
-                    pose_name = os.path.splitext(os.path.basename(pose_path))[0]
-
-                    print(f"\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-                    print(
-                        f"ENV: {env_name} ({e_idx}/{total_envs}) | "
-                        f"CAM: {cam_name} ({c_idx}/{total_cams}) | "
-                        f"TEX: {tex_name} ({t_idx}/{total_textures}) | "
-                        f"ROTZ: {rotZ_deg}° ({r_idx}/{total_rots}) | "
-                        f"POSE: {pose_name} ({p_idx}/{total_poses})"
-                    )
-                    print(f"Global progress: {progress}/{total_combinations} total")
-                    print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-
-                    apply_smplx_pose_mapped(pose_path, mainObjectId, pose_to_bone_map)
-                    apply_smplx_pose_mapped(pose_path, secondObjectId, pose_to_bone_map)
-
-                    for current_obj in [mainObjectId, secondObjectId]:
-                        progress += 1
-                        prepare_scene_for_object(current_obj, rotZ_deg)
-
-                        scene = bpy.context.scene
-                        tree = scene.node_tree
-                        for node in tree.nodes:
-                            if node.type == "OUTPUT_FILE" and not node.mute:
-                                node.file_slots[0].path = (
-                                    f"{node.name}&env={env_name}&cam={cam_name}&tex={tex_name}&rotZ={rotZ_deg}&pose={pose_name}&char={characterArmature}"
-                                )
-                                print(f"📂 Output path for '{node.name}' → {node.file_slots[0].path}")
-
-                        bpy.ops.render.render(write_still=True)
-                        print(f"🖼️ Render done for '{current_obj}' ({pose_name}) [{progress}/{total_combinations}] ✅\n")
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render the smplx sweep: blender -b scene.blend -P render-smplx.py -- [options]"
+    )
+    parser.add_argument("--shard", default=f"{shardIndex}/{shardCount}", help="index/count")
+    parser.add_argument("--done-ledger", default=doneLedgerPath, help="Resume ledger JSONL")
+    parser.add_argument("--telemetry", default=telemetryPath)
+    parser.add_argument("--log-level", choices=list(LOG_LEVELS), default=logLevel)
+    parser.add_argument("--seed", type=int, default=noiseSeed, help="Noise seed")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Print frame counts, disk / GPU-hour estimates and missing assets, then exit (no Blender needed)")
+    parser.add_argument("--outputs-dir", required=False,
+                        help="Previous outputs to sample file sizes from (--dry-run)")
+    parser.add_argument("--asset-manifest", required=False,
+                        help="Write the env / texture / pose assets of this sweep for asset_cache.py, then exit")
+    args = parser.parse_args(script_args() if argv is None else argv)
+
+    if args.asset_manifest:
+        from asset_cache import asset_manifest, write_asset_manifest
+        write_asset_manifest(args.asset_manifest, asset_manifest(
+            targetPath(), envTextures + textures, {poses_dir: ".json"}
+        ))
+        return
+
+    if args.dry_run:
+        try:
+            sweep = build_sweep()
+        except FileNotFoundError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        report = dry_run_report(sweep, args.telemetry, args.outputs_dir, parse_shard(args.shard)[1])
+        if not print_dry_run(report):
+            sys.exit(1)
+        return
+
+    import bpy
+    from scene_adapter import BpyScene
+
+    configure_gpu()
+    sweep = build_sweep()
+    sweep.seed = args.seed
+    telemetry = Telemetry(args.telemetry, args.log_level)
+    scene = BpyScene(telemetry.log)
+
+    def _on_render_stats(stats, *_):
+        telemetry.on_render_stats(str(stats))
+
+    bpy.app.handlers.render_stats.append(_on_render_stats)
+
+    try:
+        run_sweep(scene, sweep, telemetry, *parse_shard(args.shard), args.done_ledger)
+    finally:
+        bpy.app.handlers.render_stats.remove(_on_render_stats)
+        telemetry.close()
+
 
+if __name__ == "__main__":
+    main()
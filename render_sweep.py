@@ -0,0 +1,759 @@
+import argparse
+import itertools
+import json
+import os
+import random
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
+from frame_manifest import (
+    MANIFEST_NAME, ManifestWriter, frame_id, frame_record, output_name, parse_output_name,
+)
+from render_telemetry import Telemetry, load_records, summarize
+from sampling import SweepSampler, job_rng, new_seed
+from scene_adapter import texture_file_bytes
+
+# Sweep logic shared by render-genesis.py / render-smplx.py, written against
+# the SceneAdapter interface (scene_adapter.py) so it runs without Blender:
+#
+#   python render_sweep.py --poses 500 --rots 5 --shard 0/4
+#
+# expands a synthetic sweep, runs it on FakeScene and reports planning and
+# pose-application throughput plus the simulated Blender time.
+
+
+# ----------------------------------------------------------
+# Configuration
+# ----------------------------------------------------------
+
+@dataclass
+class RenderPass:
+    """One render per job: pose `object_id`, write through `output_node`."""
+    object_id: str
+    output_node: str
+    visibility: dict = field(default_factory=dict)  # object name → visible
+
+
+@dataclass
+class SweepConfig:
+    script: str
+    char: str
+    passes: list
+    texture_mesh: str
+    texture_slot: str
+    env_textures: list
+    camera_positions: dict
+    textures: list
+    pose_files: list
+    z_angles: list
+    camera_mode: str = "location"             # "location" | "rotation"
+    object_positions_relative: dict | None = None
+    pose_format: str = "dict"                 # "dict" (bone → transforms) | "smplx" (axis-angle list)
+    pose_bone_map: dict | None = None         # smplx joint index → bone name
+    skip_missing_textures: bool = True        # missing file ⇒ tex "none", slot untouched
+    texture_variants: bool = True             # preload one material per texture, switch by slot assignment
+    texture_budget_mb: float = 0.0            # GPU texture budget for the variants (0 = no limit)
+    camera_sigma_ratio: float = 0.1
+    camera_clamp_ratio: float = 0.20
+    object_sigma_ratio: float = 0.05
+    object_clamp_ratio: float = 0.10
+    seed: int | None = None                   # noise seed; None = fresh seed, logged in telemetry
+    min_visible_fraction: float = 0.0         # frustum check on placement (0 = off), worst case over z_angles
+    placement_tries: int = 64                 # resampled candidates when the first placement fails
+    export_labels: bool = False
+    label_node: str = "segmentation-material"
+    quality_gate: bool = False                # check the label pass, skip later passes of bad frames
+    quality_thresholds: dict = field(default_factory=dict)  # frame_quality.reject_reasons kwargs
+    strict_scene: bool = True                 # missing objects / output nodes abort the sweep at startup
+    name_format: str = "hash"                 # "hash" ({node}_{id}_ + frames.jsonl) | "meta" ({node}&env=...)
+    manifest_path: str | None = None          # None = frames.jsonl next to the outputs
+
+
+class Job(NamedTuple):
+    index: int
+    env: int
+    cam: int
+    tex: int
+    obj_pos: int
+    rot: int
+    pose: int
+
+
+# ----------------------------------------------------------
+# Planning
+# ----------------------------------------------------------
+
+def axis_sizes(config: SweepConfig):
+    return {
+        "env": len(config.env_textures),
+        "cam": len(config.camera_positions),
+        "tex": len(config.textures),
+        "obj_pos": len(config.object_positions_relative) if config.object_positions_relative else 1,
+        "rot": len(config.z_angles),
+        "pose": len(config.pose_files),
+    }
+
+
+def count_jobs(config: SweepConfig):
+    n = 1
+    for size in axis_sizes(config).values():
+        n *= size
+    return n
+
+
+def plan_jobs(config: SweepConfig, shard_index=0, shard_count=1):
+    """
+    Jobs in the original nested loop order (env → cam → tex → objpos →
+    rotZ → pose). Sharding keeps every shard_count-th job, so shards stay
+    balanced across all axes.
+    """
+    sizes = axis_sizes(config)
+    ranges = [range(n) for n in sizes.values()]
+    for index, combo in enumerate(itertools.product(*ranges)):
+        if index % shard_count == shard_index:
+            yield Job(index, *combo)
+
+
+def parse_shard(text):
+    """'2/8' → (2, 8)."""
+    idx, count = (int(x) for x in text.split("/"))
+    if not 0 <= idx < count:
+        raise ValueError(f"Shard index out of range: {text}")
+    return idx, count
+
+
+def list_pose_files(poses_dir):
+    """Pose JSONs of a folder, sorted so every pod plans the same job order."""
+    return sorted(os.path.join(poses_dir, f) for f in os.listdir(poses_dir) if f.endswith(".json"))
+
+
+def stem(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def axis_names(config: SweepConfig):
+    """
+    Filename value of every axis entry, resolved once per sweep
+    (missing env ⇒ "noenv", missing texture ⇒ "none" when skipped).
+    """
+    return {
+        "env": [stem(p) if os.path.exists(p) else "noenv" for p in config.env_textures],
+        "cam": list(config.camera_positions),
+        "tex": [
+            "none" if config.skip_missing_textures and not os.path.exists(p) else stem(p)
+            for p in config.textures
+        ],
+        "obj_pos": list(config.object_positions_relative or {}),
+        "rot": list(config.z_angles),
+        "pose": [stem(p) for p in config.pose_files],
+    }
+
+
+def scene_requirements(config: SweepConfig):
+    """(object names, File Output node names) the sweep touches."""
+    objects = []
+    for p in config.passes:
+        objects.append(p.object_id)
+        objects.extend(p.visibility)
+    if any(os.path.exists(t) or not config.skip_missing_textures for t in config.textures):
+        objects.append(config.texture_mesh)
+    return objects, [p.output_node for p in config.passes]
+
+
+def job_meta(config: SweepConfig, names, job: Job):
+    """Ordered filename metadata of a job, as written after `{node}&`."""
+    meta = {
+        "env": names["env"][job.env],
+        "cam": names["cam"][job.cam],
+        "tex": names["tex"][job.tex],
+        "rotZ": names["rot"][job.rot],
+        "pose": names["pose"][job.pose],
+    }
+    if names["obj_pos"]:
+        meta["zoom"] = names["obj_pos"][job.obj_pos]
+    meta["char"] = config.char
+    return meta
+
+
+def job_key(meta):
+    return "&".join(f"{k}={v}" for k, v in meta.items())
+
+
+# ----------------------------------------------------------
+# Resume ledger
+# ----------------------------------------------------------
+
+def load_done(path):
+    """Job keys already rendered (one JSON record per line)."""
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path, encoding="utf-8") as f:
+        return {json.loads(line)["job"] for line in f if line.strip()}
+
+
+def mark_done(path, key):
+    if not path:
+        return
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"job": key, "ts": time.time()}) + "\n")
+
+
+# ----------------------------------------------------------
+# Sweep
+# ----------------------------------------------------------
+
+class PoseCache:
+    """Parsed pose files, so each JSON is read once per sweep."""
+
+    def __init__(self, pose_format):
+        self.pose_format = pose_format
+        self.poses = {}
+
+    def get(self, path):
+        if path not in self.poses:
+            if not os.path.exists(path):
+                self.poses[path] = None
+            else:
+                with open(path, "r") as f:
+                    data = json.load(f)
+                if self.pose_format == "smplx":
+                    data = data.get("pose") if isinstance(data, dict) else data
+                self.poses[path] = data
+        return self.poses[path]
+
+
+def apply_pose(scene, config: SweepConfig, armature_name, pose):
+    if config.pose_format == "smplx":
+        scene.apply_smplx_pose(armature_name, pose, config.pose_bone_map)
+    else:
+        scene.apply_pose_dict(armature_name, pose)
+
+
+def reject_frame(target, key, reasons, stats, ext=".png"):
+    """
+    Move a rejected label-pass file into rejected/ next to it and append
+    the reasons to rejected/rejected.jsonl.
+    """
+    out_dir, stem = target
+    reject_dir = os.path.join(out_dir, "rejected")
+    os.makedirs(reject_dir, exist_ok=True)
+    src = os.path.join(out_dir, stem + ext)
+    if os.path.exists(src):
+        os.replace(src, os.path.join(reject_dir, stem + ext))
+    with open(os.path.join(reject_dir, "rejected.jsonl"), "a", encoding="utf-8") as f:
+        f.write(json.dumps({"file": stem + ext, "job": key, "reasons": reasons, **stats}) + "\n")
+
+
+def check_placement(scene, config: SweepConfig, sampler, job, location, armature_name, log):
+    """
+    Frustum check of an object placement in its current pose against every
+    z_angle; failing placements are resampled around the un-jittered base
+    from a stream seeded by the placement and pose indices, so reruns pick
+    the same location. Returns (location, worst visible fraction).
+    """
+    from placement import find_placement
+
+    camera = scene.camera_model()
+    points = scene.armature_points(armature_name)
+    if camera is None or points is None or not len(points):
+        return location, 1.0
+
+    rng = job_rng(sampler.seed, (job.env, job.cam, job.tex, job.obj_pos, job.pose))
+    new_location, visible, evaluated = find_placement(
+        camera, points, location, sampler.object_base_for(job), config.z_angles,
+        config.min_visible_fraction, rng,
+        config.object_sigma_ratio, config.object_clamp_ratio, config.placement_tries,
+    )
+    if evaluated > 1:
+        status = "resampled" if visible >= config.min_visible_fraction else "⚠️ best effort"
+        log("info" if visible >= config.min_visible_fraction else "warn",
+            f"📐 Placement {status}: visible {visible:.0%} after {evaluated} candidates")
+    return new_location, visible
+
+
+def load_texture_variants(scene, config: SweepConfig, telemetry: Telemetry):
+    """
+    Preload one material per texture unless the textures exceed
+    config.texture_budget_mb. The budget is checked on the file headers
+    first, so an oversized set is never loaded; formats without a readable
+    header are checked after loading and released again. Returns whether the
+    sweep switches variants (else it reloads the texture per change).
+    """
+    log = telemetry.log
+    budget = config.texture_budget_mb * 2**20
+    if budget:
+        estimate = sum(texture_file_bytes(p) or 0 for p in config.textures if os.path.exists(p))
+        if estimate > budget:
+            log("warn", f"⚠️ Texture variants need ≥{estimate / 2**20:.0f} MB > "
+                        f"{config.texture_budget_mb:.0f} MB budget, reloading per texture instead")
+            return False
+
+    with telemetry.phase("texture_load"):
+        prepared = scene.prepare_texture_variants(config.texture_mesh, config.texture_slot, config.textures)
+    if not prepared:
+        return False
+    n_variants, gpu_bytes = prepared
+    gpu_mb = gpu_bytes / 2**20
+    telemetry.static_fields["texture_gpu_mb"] = round(gpu_mb, 1)
+    if budget and gpu_bytes > budget:
+        scene.release_texture_variants(config.texture_mesh, config.texture_slot)
+        log("warn", f"⚠️ {n_variants} texture variants need ~{gpu_mb:.0f} MB > "
+                    f"{config.texture_budget_mb:.0f} MB budget, reloading per texture instead")
+        return False
+    log("info", f"🧩 {n_variants} texture variants preloaded (~{gpu_mb:.0f} MB of GPU textures)")
+    return True
+
+
+def run_sweep(scene, config: SweepConfig, telemetry: Telemetry,
+              shard_index=0, shard_count=1, done_path=None):
+    """
+    Resolve the scene objects / output nodes once (missing ones raise
+    ValueError with strict_scene), then render every job of this shard not
+    yet in the done ledger and append its parameters to the frame manifest
+    (frame_manifest.py). Scene state (env, camera, texture, placement) is
+    only re-applied when its axis changes. Camera noise is per (env, cam),
+    object noise per (env, cam, tex, objpos), all drawn up front from
+    config.seed (see sampling.py), so shards sharing a seed place every
+    frame identically. Returns the number of renders.
+    """
+    log = telemetry.log
+    missing = scene.bind(*scene_requirements(config))
+    if missing:
+        message = f"Scene is missing {', '.join(missing)}"
+        if config.strict_scene:
+            raise ValueError(message)
+        log("warn", f"⚠️ {message}")
+
+    sizes = axis_sizes(config)
+    passes = config.passes
+    total = count_jobs(config) * len(passes)
+    done = load_done(done_path)
+    if done:
+        log("info", f"⏭️ {len(done)} jobs already done in {done_path}")
+
+    read_labels = (config.export_labels or config.quality_gate) and scene.ensure_index_viewer()
+    export_labels = config.export_labels and read_labels
+    quality_gate = config.quality_gate and read_labels
+    if read_labels:
+        from label_export import labels_from_index_pass, write_frame_labels
+    if quality_gate:
+        from frame_quality import check_frame
+
+    seed = new_seed() if config.seed is None else config.seed
+    log("info", f"🎲 Noise seed {seed}")
+    telemetry.static_fields = {
+        "script": config.script, "char": config.char, "seed": seed, **scene.render_settings()
+    }
+
+    texture_variants = config.texture_variants and sizes["tex"] > 1 and load_texture_variants(scene, config, telemetry)
+
+    names = axis_names(config)
+    obj_items = list((config.object_positions_relative or {}).items())
+    sampler = SweepSampler(
+        seed, sizes["env"], list(config.camera_positions.values()), sizes["tex"],
+        [rel for _, rel in obj_items],
+        config.camera_sigma_ratio, config.camera_clamp_ratio,
+        config.object_sigma_ratio, config.object_clamp_ratio,
+    )
+    poses = PoseCache(config.pose_format)
+    hashed_names = config.name_format == "hash"
+    manifest = None
+    if hashed_names:
+        # next to the rendered files unless given; resolved once, before any render
+        target = scene.output_file_stem(passes[0].output_node) if passes else None
+        out_dir = target[0] if target else ""
+        path = config.manifest_path or (os.path.join(out_dir, MANIFEST_NAME) if out_dir else None)
+        if path:
+            manifest = ManifestWriter(path)
+            log("info", f"🧾 Frame manifest → {path}")
+        else:
+            log("warn", "⚠️ No output directory for the frame manifest, set manifest_path to record frames.")
+    applied = {}
+    renders = 0
+
+    for job in plan_jobs(config, shard_index, shard_count):
+        meta = job_meta(config, names, job)
+        key = job_key(meta)
+        if key in done:
+            continue
+        fid = frame_id(key, seed)
+
+        if applied.get("env") != job.env:
+            env_path = config.env_textures[job.env]
+            with telemetry.phase("env_load"):
+                scene.set_environment_texture(env_path if os.path.exists(env_path) else None)
+            applied["env"] = job.env
+
+        if applied.get("cam") != (job.env, job.cam):
+            cam_noisy = sampler.camera_for(job)
+            if config.camera_mode == "rotation":
+                scene.set_camera_rotation(cam_noisy)
+            else:
+                scene.set_camera_location(cam_noisy)
+            applied["cam"] = (job.env, job.cam)
+
+        if applied.get("tex") != job.tex:
+            tex_path = config.textures[job.tex]
+            if os.path.exists(tex_path) or not config.skip_missing_textures:
+                with telemetry.phase("texture_load"):
+                    if texture_variants:
+                        scene.set_texture_variant(config.texture_mesh, config.texture_slot, job.tex)
+                    else:
+                        scene.set_mesh_texture(config.texture_mesh, config.texture_slot, tex_path)
+            applied["tex"] = job.tex
+
+        placement_key = (job.env, job.cam, job.tex, job.obj_pos)
+        if obj_items and applied.get("placement") != placement_key:
+            # relative position scaled by the noisy camera, jittered in world space
+            obj_pos_noisy = sampler.object_for(job)
+            with telemetry.phase("placement"):
+                for p in passes:
+                    scene.set_object_location(p.object_id, obj_pos_noisy)
+            applied["placement"] = placement_key
+            applied["object"] = obj_pos_noisy
+            checked = {}
+
+        progress = job.index * len(passes)
+        header = (
+            f"ENV: {meta['env']} ({job.env + 1}/{sizes['env']}) | "
+            f"CAM: {meta['cam']} ({job.cam + 1}/{sizes['cam']}) | "
+        )
+        if obj_items:
+            header += f"OBJPOS: {meta['zoom']} ({job.obj_pos + 1}/{sizes['obj_pos']}) | "
+        header += (
+            f"TEX: {meta['tex']} ({job.tex + 1}/{sizes['tex']}) | "
+            f"ROTZ: {meta['rotZ']}° ({job.rot + 1}/{sizes['rot']}) | "
+            f"POSE: {meta['pose']} ({job.pose + 1}/{sizes['pose']})"
+        )
+        log("info",
+            f"\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n{header}"
+            f"\nGlobal progress: {progress}/{total} total"
+            "\n━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+        )
+
+        with telemetry.phase("pose"):
+            pose_path = config.pose_files[job.pose]
+            pose = poses.get(pose_path)
+            if pose is None:
+                log("warn", f"⚠️ Pose file not found: {pose_path}")
+            else:
+                for p in passes:
+                    apply_pose(scene, config, p.object_id, pose)
+
+        if obj_items and config.min_visible_fraction > 0:
+            # checked on the posed bones, once per placement and pose (rotZ is inside the check)
+            with telemetry.phase("placement"):
+                if job.pose not in checked:
+                    checked[job.pose] = check_placement(
+                        scene, config, sampler, job, sampler.object_for(job), passes[0].object_id, log
+                    )
+                location, applied["visible"] = checked[job.pose]
+                if location != applied["object"]:
+                    for p in passes:
+                        scene.set_object_location(p.object_id, location)
+                    applied["object"] = location
+
+        files = {}
+        reasons = []
+        for p in passes:
+            progress += 1
+            with telemetry.phase("visibility"):
+                scene.set_object_rotation_z(p.object_id, meta["rotZ"])
+                scene.toggle_output_nodes(p.output_node)
+                for name, visible in p.visibility.items():
+                    scene.set_visibility(name, visible)
+
+            with telemetry.phase("outputs"):
+                if hashed_names:
+                    scene.set_output_paths(lambda node_name: output_name(node_name, fid))
+                else:
+                    scene.set_output_paths(lambda node_name: f"{node_name}&{key}")
+
+            with telemetry.phase("render"):
+                scene.render()
+            renders += 1
+
+            label_mask = target = None
+            if hashed_names or (read_labels and p.output_node == config.label_node):
+                target = scene.output_file_stem(p.output_node)
+                if target is not None:
+                    files[p.output_node] = target[1] + ".png"
+            if read_labels and p.output_node == config.label_node:
+                pixels = scene.read_index_pass()
+                if pixels is not None:
+                    label_mask = labels_from_index_pass(*pixels)
+
+            if export_labels and label_mask is not None and target is not None:
+                with telemetry.phase("label_export"):
+                    path = write_frame_labels(label_mask, *target)
+                    log("debug", f"🏷️ Labels → {path}")
+
+            if quality_gate and label_mask is not None:
+                with telemetry.phase("quality_gate"):
+                    stats, reasons = check_frame(label_mask, **config.quality_thresholds)
+                    if reasons and target is not None:
+                        reject_frame(target, key, reasons, stats)
+            extra = {"visible": round(applied["visible"], 3)} if "visible" in applied else {}
+            if hashed_names:
+                extra["frame_id"] = fid
+            if reasons:
+                extra["rejected"] = reasons
+            telemetry.end_frame(progress=progress, total=total, object=p.object_id, **meta, **extra)
+            if reasons:
+                log("warn", f"🚮 Rejected ({meta['pose']}): {'; '.join(reasons)}, skipping remaining passes\n")
+                break
+            log("info", f"🖼️ Render done for '{p.object_id}' ({meta['pose']}) [{progress}/{total}] ✅\n")
+
+        if manifest:
+            record = frame_record(
+                fid, key, meta, seed, sampler.camera_for(job),
+                applied.get("object"), applied.get("visible"), files
+            )
+            if reasons:
+                record["rejected"] = reasons
+            manifest.write(record)
+
+        mark_done(done_path, key)
+
+    if texture_variants:
+        scene.release_texture_variants(config.texture_mesh, config.texture_slot)
+    if manifest:
+        manifest.close()
+    return renders
+
+
+# ----------------------------------------------------------
+# Dry run
+# ----------------------------------------------------------
+
+# bytes per rendered pixel when no previous outputs can be sampled
+# (8-bit RGB PNG of a lit character vs. a flat label mask PNG)
+DEFAULT_BYTES_PER_PX = {"image": 1.5, "segmentation-material": 0.05}
+DEFAULT_RESOLUTION = (1024, 1024)
+TELEMETRY_TAIL = 5000
+
+
+def missing_assets(config: SweepConfig):
+    """Referenced env / texture / pose paths that do not exist."""
+    return {
+        "env": [p for p in config.env_textures if not os.path.exists(p)],
+        "texture": [p for p in config.textures if not os.path.exists(p)],
+        "pose": [p for p in config.pose_files if not os.path.exists(p)],
+    }
+
+
+def telemetry_tail(path, script=None, tail=TELEMETRY_TAIL):
+    """Last `tail` telemetry records of `script` (all scripts if none match)."""
+    if not path or not os.path.exists(path):
+        return []
+    from collections import deque
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in deque(f, maxlen=tail) if line.strip()]
+    own = [r for r in records if r.get("script") == script]
+    return own or records
+
+
+def sample_output_sizes(outputs_dir, limit=500):
+    """Mean file size per File Output node, from up to `limit` existing files."""
+    sizes = {}
+    if not outputs_dir or not os.path.isdir(outputs_dir):
+        return {}
+    with os.scandir(outputs_dir) as it:
+        for entry in itertools.islice((e for e in it if e.is_file()), limit):
+            if entry.name == MANIFEST_NAME:
+                continue
+            decoded = parse_output_name(entry.name)
+            node = decoded[0] if decoded else entry.name.split("&", 1)[0]
+            sizes.setdefault(node, []).append(entry.stat().st_size)
+    return {node: sum(v) / len(v) for node, v in sizes.items()}
+
+
+def dry_run_report(config: SweepConfig, telemetry_path=None, outputs_dir=None, shard_count=1):
+    """
+    Expands the sweep arithmetically (no job iteration, so million-frame
+    sweeps take milliseconds): frame counts, outputs, disk and time estimates
+    from previous outputs / telemetry, and missing asset paths.
+    """
+    sizes = axis_sizes(config)
+    jobs = count_jobs(config)
+    renders = jobs * len(config.passes)
+    files = {p.output_node: jobs for p in config.passes}
+    if config.export_labels:
+        files["labels.json"] = jobs
+
+    records = telemetry_tail(telemetry_path, config.script)
+    sampled = sample_output_sizes(outputs_dir)
+    resolution = tuple(records[-1]["resolution"]) if records and records[-1].get("resolution") else DEFAULT_RESOLUTION
+    bytes_per_file = {}
+    for node in files:
+        if node in sampled:
+            bytes_per_file[node] = sampled[node]
+        elif node in DEFAULT_BYTES_PER_PX:
+            bytes_per_file[node] = DEFAULT_BYTES_PER_PX[node] * resolution[0] * resolution[1]
+    disk_bytes = sum(files[n] * b for n, b in bytes_per_file.items())
+
+    seconds = None
+    if records:
+        frame_s = sorted(r["frame_s"] for r in records)
+        seconds = {
+            "mean": renders * sum(frame_s) / len(frame_s),
+            "p90": renders * frame_s[int(0.9 * (len(frame_s) - 1))],
+        }
+
+    return {
+        "axes": sizes,
+        "jobs": jobs,
+        "renders": renders,
+        "shards": shard_count,
+        "renders_per_shard": -(-renders // shard_count),
+        "files": files,
+        "bytes_per_file": bytes_per_file,
+        "bytes_per_file_source": "sampled" if sampled else f"estimated at {resolution[0]}×{resolution[1]}",
+        "disk_gb": disk_bytes / 1e9,
+        "telemetry_frames": len(records),
+        "render_seconds": seconds,
+        "missing": missing_assets(config),
+        "skip_missing_textures": config.skip_missing_textures,
+    }
+
+
+def print_dry_run(report):
+    """Prints the report; returns False when required assets are missing."""
+    axes = " × ".join(f"{n} {k}" for k, n in report["axes"].items())
+    print(f"🧮 {axes} = {report['jobs']} jobs → {report['renders']} renders")
+    if report["shards"] > 1:
+        print(f"   {report['renders_per_shard']} renders per shard ({report['shards']} shards)")
+    for node, n in report["files"].items():
+        size = report["bytes_per_file"].get(node)
+        size_txt = f", ~{size / 1e6:.2f} MB each" if size else ""
+        print(f"📄 {node}: {n} files{size_txt}")
+    print(f"💾 ~{report['disk_gb']:.1f} GB ({report['bytes_per_file_source']})")
+
+    if report["render_seconds"]:
+        mean_h = report["render_seconds"]["mean"] / 3600
+        p90_h = report["render_seconds"]["p90"] / 3600
+        print(f"⏱️ ~{mean_h:.1f} GPU h (p90 {p90_h:.1f} h) from {report['telemetry_frames']} telemetry frames")
+        if report["shards"] > 1:
+            print(f"   ~{mean_h / report['shards']:.1f} h per shard")
+    else:
+        print("⏱️ No telemetry yet, no time estimate")
+
+    ok = True
+    for kind, paths in report["missing"].items():
+        if not paths:
+            continue
+        # missing textures are rendered as tex=none when skipped, missing envs as gray
+        required = kind == "pose" or (kind == "texture" and not report["skip_missing_textures"])
+        ok &= not required
+        print(f"{'❌' if required else '⚠️'} {len(paths)} missing {kind} path(s):")
+        for p in paths[:10]:
+            print(f"   {p}")
+        if len(paths) > 10:
+            print(f"   … {len(paths) - 10} more")
+    return ok
+
+
+# ----------------------------------------------------------
+# Simulation
+# ----------------------------------------------------------
+
+def write_synthetic_poses(pose_dir, n_poses, n_bones, pose_format):
+    paths = []
+    for i in range(n_poses):
+        if pose_format == "smplx":
+            data = {"pose": [random.uniform(-0.5, 0.5) for _ in range(n_bones * 3)]}
+        else:
+            data = {
+                f"bone_{b:03d}": {"rotation_quaternion": [1.0, 0.0, 0.0, 0.0], "location": [0.0, 0.0, 0.0]}
+                for b in range(n_bones)
+            }
+        path = os.path.join(pose_dir, f"pose{i:05d}.json")
+        with open(path, "w") as f:
+            json.dump(data, f)
+        paths.append(path)
+    return paths
+
+
+def main():
+    from scene_adapter import FakeScene
+
+    parser = argparse.ArgumentParser(
+        description="Run a synthetic render sweep on the in-memory FakeScene"
+    )
+    parser.add_argument("--envs", type=int, default=1)
+    parser.add_argument("--cams", type=int, default=3)
+    parser.add_argument("--textures", type=int, default=1)
+    parser.add_argument("--obj-positions", type=int, default=2, help="0 = no object placement (smplx)")
+    parser.add_argument("--rots", type=int, default=5)
+    parser.add_argument("--poses", type=int, default=100)
+    parser.add_argument("--bones", type=int, default=55)
+    parser.add_argument("--pose-format", choices=["dict", "smplx"], default="dict")
+    parser.add_argument("--shard", default="0/1", help="index/count")
+    parser.add_argument("--seed", type=int, default=0, help="Noise seed")
+    parser.add_argument("--min-visible", type=float, default=0.0, help="Frustum check threshold (0 = off)")
+    parser.add_argument("--done-ledger", required=False, help="Resume ledger JSONL")
+    parser.add_argument("--telemetry", required=False, help="Telemetry JSONL output")
+    parser.add_argument("--manifest", required=False, help="Frame manifest JSONL output (frame_manifest.py)")
+    parser.add_argument("--log-level", choices=["debug", "info", "warn", "quiet"], default="quiet")
+    args = parser.parse_args()
+
+    shard_index, shard_count = parse_shard(args.shard)
+    passes = [
+        RenderPass("main-seg", "segmentation-material", {"mesh-material": True, "mesh-color": False}),
+        RenderPass("main-seg-dup", "image", {"mesh-material": False, "mesh-color": True}),
+    ]
+
+    with tempfile.TemporaryDirectory(prefix="render-sweep-") as tmp:
+        pose_files = write_synthetic_poses(tmp, args.poses, args.bones, args.pose_format)
+        config = SweepConfig(
+            script="simulate",
+            char="fake",
+            passes=passes,
+            texture_mesh="mesh-color",
+            texture_slot="slot",
+            env_textures=[f"env{i}.exr" for i in range(args.envs)],
+            camera_positions={f"cam{i}": (2.5, -2.5, 1.0 + i) for i in range(args.cams)},
+            textures=[f"tex{i}.png" for i in range(args.textures)],
+            pose_files=pose_files,
+            z_angles=[i * 45 for i in range(args.rots)],
+            object_positions_relative={
+                f"pos{i}": (0.2 * (i + 1), 0.2 * (i + 1), 0.1 * (i + 1)) for i in range(args.obj_positions)
+            } or None,
+            pose_format=args.pose_format,
+            pose_bone_map={i: f"bone_{i:03d}" for i in range(args.bones)},
+            skip_missing_textures=False,
+            seed=args.seed,
+            min_visible_fraction=args.min_visible,
+            manifest_path=args.manifest,
+        )
+
+        t0 = time.perf_counter()
+        n_jobs = sum(1 for _ in plan_jobs(config, shard_index, shard_count))
+        plan_s = time.perf_counter() - t0
+
+        objects = [p.object_id for p in passes] + ["mesh-material", "mesh-color"]
+        scene = FakeScene(objects=objects, log=lambda level, msg: None)
+        telemetry = Telemetry(args.telemetry, args.log_level)
+
+        t0 = time.perf_counter()
+        renders = run_sweep(scene, config, telemetry, shard_index, shard_count, args.done_ledger)
+        sweep_s = time.perf_counter() - t0
+        telemetry.close()
+
+    pose_calls = sum(1 for name, _ in scene.calls if name.startswith("apply_"))
+    print(f"🧮 {count_jobs(config)} jobs total, {n_jobs} in shard {shard_index}/{shard_count} "
+          f"(planned in {plan_s * 1000:.1f} ms)")
+    print(f"🎬 {renders} renders in {sweep_s:.2f}s wall "
+          f"({renders / sweep_s if sweep_s else 0:.0f} renders/s, "
+          f"{pose_calls / sweep_s if sweep_s else 0:.0f} pose applications/s)")
+    print(f"⏱️ Simulated Blender time: {scene.clock / 3600:.2f} h")
+    if args.telemetry:
+        phases = summarize(load_records(args.telemetry))["phases"]
+        for name, p in phases.items():
+            print(f"   {name:14s} mean {p['mean'] * 1000:8.3f} ms  p99 {p['p99'] * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+import argparse
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Structured per-frame telemetry for the Blender sweeps (no bpy import, so it
+# also runs as a plain-Python summarizer):
+#
+#   telemetry = Telemetry("/tmp/render.jsonl", log_level="info")
+#   with telemetry.phase("pose"): ...
+#   with telemetry.phase("render"): bpy.ops.render.render(write_still=True)
+#   telemetry.end_frame(frame=..., pose=...)   # one JSONL record
+#
+#   python render_telemetry.py /tmp/render.jsonl   # throughput + tail latencies
+
+LOG_LEVELS = {"debug": 10, "info": 20, "warn": 30, "quiet": 100}
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return rss / (1 << 20) if sys.platform == "darwin" else rss / 1024
+
+
+def parse_peak_memory(stats: str):
+    """
+    'Peak:' figure from a Cycles render stats line, in MB
+    (e.g. '... | Mem:512.3M, Peak:1.02G | ...').
+    """
+    idx = stats.find("Peak:")
+    if idx < 0:
+        return None
+    token = stats[idx + 5:].strip().split()[0].rstrip(",|")
+    units = {"K": 1 / 1024, "M": 1.0, "G": 1024.0}
+    try:
+        if token[-1] in units:
+            return float(token[:-1]) * units[token[-1]]
+        return float(token)
+    except (ValueError, IndexError):
+        return None
+
+
+class Telemetry:
+    def __init__(self, path=None, log_level="info", static_fields=None):
+        self.path = path
+        self.level = LOG_LEVELS[log_level]
+        self.static_fields = static_fields or {}
+        self.phases = {}
+        self.frames = 0
+        self.frame_start = time.perf_counter()
+        self.render_peak_mb = None
+        self.f = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self.f = open(path, "a", encoding="utf-8")
+
+    # ------------------ console ------------------
+
+    def log(self, level, msg):
+        if LOG_LEVELS[level] >= self.level:
+            print(msg)
+
+    # ------------------ timings ------------------
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a block; repeated phases within a frame are summed. Phases that
+        run outside a frame (env / texture loads) go into the next record.
+        """
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - t0
+
+    def on_render_stats(self, stats):
+        """bpy.app.handlers.render_stats callback: keeps the render peak memory."""
+        peak = parse_peak_memory(stats)
+        if peak is not None:
+            self.render_peak_mb = max(self.render_peak_mb or 0.0, peak)
+
+    def end_frame(self, **fields):
+        now = time.perf_counter()
+        self.frames += 1
+        record = {
+            "ts": time.time(),
+            "frame_s": round(now - self.frame_start, 6),
+            "phases": {k: round(v, 6) for k, v in self.phases.items()},
+            "peak_rss_mb": peak_rss_mb(),
+            "render_peak_mb": self.render_peak_mb,
+            **self.static_fields,
+            **fields,
+        }
+        if self.f:
+            self.f.write(json.dumps(record) + "\n")
+            self.f.flush()
+        self.phases = {}
+        self.render_peak_mb = None
+        self.frame_start = now
+        return record
+
+    def close(self):
+        if self.f:
+            self.f.close()
+            self.f = None
+
+
+# ----------------------------------------------------------
+# Summarizer
+# ----------------------------------------------------------
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def load_records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize(records):
+    if not records:
+        return {"frames": 0}
+    span = records[-1]["ts"] - records[0]["ts"] + records[0]["frame_s"]
+    series = {"frame": sorted(r["frame_s"] for r in records)}
+    for r in records:
+        for name, sec in r["phases"].items():
+            series.setdefault(name, []).append(sec)
+
+    summary = {
+        "frames": len(records),
+        "wall_s": span,
+        "frames_per_hour": 3600 * len(records) / span if span else None,
+        "peak_rss_mb": max((r.get("peak_rss_mb") or 0) for r in records),
+        "render_peak_mb": max((r.get("render_peak_mb") or 0) for r in records),
+        "phases": {},
+    }
+    for name, values in series.items():
+        values = sorted(values)
+        summary["phases"][name] = {
+            "count": len(values),
+            "mean": sum(values) / len(values),
+            "p50": percentile(values, 0.50),
+            "p90": percentile(values, 0.90),
+            "p99": percentile(values, 0.99),
+            "max": values[-1],
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize render telemetry JSONL")
+    parser.add_argument("telemetry", help="JSONL written by Telemetry")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args()
+
+    summary = summarize(load_records(args.telemetry))
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+    if not summary["frames"]:
+        print("No frames recorded.")
+        return
+
+    print(
+        f"🖼️ {summary['frames']} frames in {summary['wall_s']:.1f}s "
+        f"→ {summary['frames_per_hour']:.1f} frames/h | "
+        f"peak RSS {summary['peak_rss_mb']:.0f} MB, render peak {summary['render_peak_mb']:.0f} MB"
+    )
+    print(f"\n{'phase':14s} {'count':>6s} {'mean s':>8s} {'p50':>8s} {'p90':>8s} {'p99':>8s} {'max':>8s}")
+    for name, p in summary["phases"].items():
+        print(
+            f"{name:14s} {p['count']:6d} {p['mean']:8.3f} {p['p50']:8.3f} "
+            f"{p['p90']:8.3f} {p['p99']:8.3f} {p['max']:8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -20,17 +20,12 @@ echo "🐍 Upgrading pip and installing pipenv..."
 python3 -m pip install --upgrade pip
 pip install pipenv
 pip install gdown
-pip install tqdm pandas minio
+pip install tqdm pandas numpy minio
 
 echo "☁️ Installing rclone..."
 curl https://rclone.org/install.sh | bash
 echo "Rclone version: $(rclone --version | head -n 1)"
 
-echo "☁️ Installing MinIO Client (mc)..."
-curl -fsSL https://dl.min.io/client/mc/release/linux-amd64/mc -o /usr/local/bin/mc
-chmod +x /usr/local/bin/mc
-echo "MinIO Client version: $(mc --version)"
-
 echo "✅ Installed versions:"
 echo "Git version: $(git --version)"
 echo "Python version: $(python3 --version)"
@@ -39,13 +34,13 @@ echo "Pipenv version: $(pipenv --version)"
 echo "Zip version: $(zip -v | head -n 1)"
 
 
-# Configure MinIO alias if all env variables are present
-if [[ -n "$RUNPOD_SECRET_MINIO_HOST" && -n "$RUNPOD_SECRET_MINIO_PORT" && -n "$RUNPOD_SECRET_MINIO_USER" && -n "$RUNPOD_SECRET_MINIO_SECRET" ]]; then
-    echo "☁️ Configuring MinIO alias..."
-    mc alias set myminio "${RUNPOD_SECRET_MINIO_HOST}:${RUNPOD_SECRET_MINIO_PORT}" "$RUNPOD_SECRET_MINIO_USER" "$RUNPOD_SECRET_MINIO_SECRET"
-    echo "✅ MinIO alias 'myminio' is configured."
+# MinIO credentials are read from the environment by asset_cache.py / uploader.py
+if [[ -n "$RUNPOD_SECRET_MINIO_HOST" && -n "$RUNPOD_SECRET_MINIO_USER" && -n "$RUNPOD_SECRET_MINIO_SECRET" ]]; then
+    MINIO_READY=1
+    echo "✅ MinIO credentials found."
 else
-    echo "⚠️ MinIO environment variables are not fully set. Skipping mc alias configuration."
+    MINIO_READY=0
+    echo "⚠️ MinIO environment variables are not fully set. Asset prefetch will be skipped."
 fi
 
 # GitHub CLI Authentication (non-interactive)
@@ -132,6 +127,25 @@ EOF
 echo "Running GPU configuration..."
 /workspace/blender/blender -b -P /workspace/configure_cycles_gpu.py || echo "⚠️ Could not configure CUDA (may require matching drivers)."
 
+#####################################################################
+# 📦 Sweep assets: fetch only what the render script references
+#####################################################################
+
+REPO_DIR="${REPO_DIR:-/workspace/blender-sythetic-data}"
+RENDER_SCRIPT="${RENDER_SCRIPT:-render-genesis.py}"
+ASSET_SOURCE="${ASSET_SOURCE:-minio://public/shared/blender}"
+ASSET_DEST="${ASSET_DEST:-/workspace/data-assets}"
+ASSET_EXTRA="${ASSET_EXTRA:-samplex-render-workflow.blend}"
+
+if [[ "$MINIO_READY" == 1 && -f "$REPO_DIR/$RENDER_SCRIPT" ]]; then
+    echo "📦 Prefetching the assets of $RENDER_SCRIPT into $ASSET_DEST..."
+    python3 "$REPO_DIR/$RENDER_SCRIPT" --asset-manifest /workspace/assets.json
+    python3 "$REPO_DIR/asset_cache.py" --manifest /workspace/assets.json \
+        --source "$ASSET_SOURCE" --dest "$ASSET_DEST" --extra $ASSET_EXTRA
+else
+    echo "⚠️ Skipping asset prefetch (needs MinIO credentials and $REPO_DIR/$RENDER_SCRIPT)."
+fi
+
 echo -e "\n🎉 Blender headless environment installed and ready!"
 echo "You can now render using:"
 echo "    /workspace/blender/blender -b /workspace/scene.blend -P /workspace/your_script.py"
@@ -0,0 +1,104 @@
+import numpy as np
+
+# Seeded noise for the render sweep. Every camera and object jitter of a
+# sweep is drawn up front into arrays, each cell from its own job_rng stream
+# keyed on the axis indices, so a seed fixes the placement of every frame and
+# adding envs / cameras / textures / positions leaves existing frames as they
+# were:
+#
+#   sampler = SweepSampler(seed, n_envs, camera_bases, n_textures, object_rel)
+#   sampler.camera[env, cam]                  → noisy camera (x, y, z)
+#   sampler.objects[env, cam, tex, obj_pos]   → noisy object location
+#
+# Other per-job randomness uses job_rng(seed, job_index) the same way.
+
+CAMERA_STREAM = 0
+OBJECT_STREAM = 1
+
+
+def new_seed():
+    """Fresh 63-bit seed (logged / stored so the sweep can be replayed)."""
+    return int(np.random.SeedSequence().entropy % (1 << 63))
+
+
+def job_rng(seed, job_index):
+    """Independent stream per job; job_index may be an int or a tuple of ints."""
+    key = list(job_index) if isinstance(job_index, tuple) else [job_index]
+    return np.random.default_rng([seed, *key])
+
+
+def truncated_normal(rng, shape, limit):
+    """
+    Standard normal samples truncated to [-limit, limit] by resampling the
+    tails (instead of clamping them onto the bounds); zeros when limit <= 0.
+    """
+    if limit <= 0:
+        return np.zeros(shape)
+    x = rng.standard_normal(shape)
+    out = np.abs(x) > limit
+    while out.any():
+        x[out] = rng.standard_normal(int(out.sum()))
+        out = np.abs(x) > limit
+    return x
+
+
+def relative_jitter(rng, base, sigma_ratio, clamp_ratio):
+    """
+    base + N(0, σ) per axis with σ = sigma_ratio·|base| truncated at
+    clamp_ratio·|base|; axes at 0 use 1.0 as reference so they still move.
+    """
+    base = np.asarray(base, dtype=np.float64)
+    if sigma_ratio <= 0:
+        return base.copy()
+    ref = np.where(np.abs(base) > 1e-6, np.abs(base), 1.0)
+    return base + ref * sigma_ratio * truncated_normal(rng, base.shape, clamp_ratio / sigma_ratio)
+
+
+class SweepSampler:
+    """
+    camera:  (n_envs, n_cams, 3) noisy camera location / rotation
+    object_bases: (n_envs, n_cams, n_obj_positions, 3) object_rel scaled by
+             the noisy camera location
+    objects: (n_envs, n_cams, n_textures, n_obj_positions, 3) jittered
+             object_bases, or None without object positions
+
+    All cells are drawn at construction, but each from its own stream
+    (one small draw per cell, not one batched draw per array): a batched
+    draw would renumber every cell's noise when an axis grows, and the
+    tail resampling of truncated_normal makes the stream length depend on
+    earlier draws. Construction costs ~50 µs per cell.
+    """
+
+    def __init__(self, seed, n_envs, camera_bases, n_textures=1, object_rel=None,
+                 camera_sigma_ratio=0.1, camera_clamp_ratio=0.20,
+                 object_sigma_ratio=0.05, object_clamp_ratio=0.10):
+        self.seed = seed
+        cams = np.asarray(camera_bases, dtype=np.float64).reshape(-1, 3)
+
+        self.camera = np.empty((n_envs, len(cams), 3))
+        for env in range(n_envs):
+            for cam, base in enumerate(cams):
+                rng = job_rng(seed, (CAMERA_STREAM, env, cam))
+                self.camera[env, cam] = relative_jitter(rng, base, camera_sigma_ratio, camera_clamp_ratio)
+
+        self.object_bases = None
+        self.objects = None
+        if object_rel is not None and len(object_rel):
+            rel = np.asarray(object_rel, dtype=np.float64).reshape(-1, 3)
+            self.object_bases = self.camera[:, :, None, :] * rel[None, None, :, :]
+            self.objects = np.empty((n_envs, len(cams), n_textures, len(rel), 3))
+            for env, cam, tex, pos in np.ndindex(self.objects.shape[:4]):
+                rng = job_rng(seed, (OBJECT_STREAM, env, cam, tex, pos))
+                self.objects[env, cam, tex, pos] = relative_jitter(
+                    rng, self.object_bases[env, cam, pos], object_sigma_ratio, object_clamp_ratio
+                )
+
+    def camera_for(self, job):
+        return tuple(self.camera[job.env, job.cam].tolist())
+
+    def object_for(self, job):
+        return tuple(self.objects[job.env, job.cam, job.tex, job.obj_pos].tolist())
+
+    def object_base_for(self, job):
+        """Un-jittered object location (object_rel × noisy camera)."""
+        return tuple(self.object_bases[job.env, job.cam, job.obj_pos].tolist())
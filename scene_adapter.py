@@ -0,0 +1,710 @@
+import math
+import os
+import struct
+import time
+from abc import ABC, abstractmethod
+
+# Thin scene interface used by render_sweep.py:
+#   - BpyScene  drives the real Blender scene (bpy is only imported here)
+#   - FakeScene records calls in memory and simulates their cost, so job
+#     planning, resume, sharding and pose throughput run in plain Python.
+
+
+class SceneAdapter(ABC):
+    """
+    Everything the sweep needs from a scene. Missing objects/nodes are
+    reported through `log` and skipped, like the original render scripts.
+    """
+
+    def __init__(self, log=None):
+        self.log = log or (lambda level, msg: print(msg))
+
+    @abstractmethod
+    def render_settings(self) -> dict: ...
+    @abstractmethod
+    def bind(self, object_names: list, output_node_names: list) -> list: ...
+    @abstractmethod
+    def toggle_output_nodes(self, enable_node_name: str): ...
+    @abstractmethod
+    def set_output_paths(self, path_for_node) -> dict: ...
+    @abstractmethod
+    def set_visibility(self, name: str, visible: bool): ...
+    @abstractmethod
+    def set_environment_texture(self, path: str | None): ...
+    @abstractmethod
+    def set_camera_location(self, location: tuple): ...
+    @abstractmethod
+    def set_camera_rotation(self, rotation: tuple): ...
+    @abstractmethod
+    def set_object_location(self, obj_name: str, location: tuple): ...
+    @abstractmethod
+    def set_object_rotation_z(self, obj_name: str, rotZ_deg: float): ...
+    @abstractmethod
+    def set_mesh_texture(self, mesh_name: str, slot_name: str, texture_path: str): ...
+    @abstractmethod
+    def prepare_texture_variants(self, mesh_name: str, slot_name: str, texture_paths: list): ...
+    @abstractmethod
+    def set_texture_variant(self, mesh_name: str, slot_name: str, index: int) -> bool: ...
+    @abstractmethod
+    def release_texture_variants(self, mesh_name: str, slot_name: str): ...
+    @abstractmethod
+    def apply_pose_dict(self, armature_name: str, pose_dict: dict): ...
+    @abstractmethod
+    def apply_smplx_pose(self, armature_name: str, pose: list, bone_map: dict): ...
+    @abstractmethod
+    def render(self): ...
+
+    # placement check (see placement.py)
+    @abstractmethod
+    def camera_model(self): ...
+    @abstractmethod
+    def armature_points(self, armature_name: str): ...
+
+    # in-Blender label export (see label_export.py)
+    @abstractmethod
+    def ensure_index_viewer(self) -> bool: ...
+    @abstractmethod
+    def read_index_pass(self): ...
+    @abstractmethod
+    def output_file_stem(self, node_name: str): ...
+
+
+def texture_bytes(width, height, channels, is_float=False):
+    """Device memory of an image texture: RGB is padded to RGBA, floats take 4 bytes."""
+    channels = 4 if channels >= 3 else channels
+    return width * height * channels * (4 if is_float else 1)
+
+
+def texture_file_bytes(path):
+    """
+    texture_bytes of a PNG / JPEG from its header, without decoding it;
+    None for other formats (EXR, HDR, ...) and unreadable files.
+    """
+    try:
+        with open(path, "rb") as f:
+            head = f.read(26)
+            if head[:8] == b"\x89PNG\r\n\x1a\n" and head[12:16] == b"IHDR":
+                width, height, depth, color = struct.unpack(">IIBB", head[16:26])
+                channels = {0: 1, 2: 3, 3: 3, 4: 2, 6: 4}.get(color, 4)
+                return texture_bytes(width, height, channels, depth > 8)  # 16-bit PNGs load as float
+            if head[:2] != b"\xff\xd8":
+                return None
+            f.seek(2)
+            while (segment := f.read(4))[:1] == b"\xff" and len(segment) == 4:
+                marker, length = segment[1], int.from_bytes(segment[2:], "big")
+                if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):  # start of frame
+                    _, height, width, channels = struct.unpack(">BHHB", f.read(6))
+                    return texture_bytes(width, height, channels)
+                f.seek(length - 2, os.SEEK_CUR)
+    except (OSError, struct.error):
+        return None
+    return None
+
+
+# ----------------------------------------------------------
+# Blender backend
+# ----------------------------------------------------------
+
+class BpyScene(SceneAdapter):
+    def __init__(self, log=None):
+        super().__init__(log)
+        import bpy
+        import mathutils
+        self.bpy = bpy
+        self.mathutils = mathutils
+        self.texture_variants = {}  # (mesh, slot) → (slot index, base material, [material or None], new images)
+        self.handles = {}           # object name → bpy object, filled by bind()
+        self.file_outputs = None    # File Output node name → node
+        self.world_nodes = None     # (environment node, background node)
+
+    @property
+    def scene(self):
+        return self.bpy.context.scene
+
+    def render_settings(self):
+        prefs = self.bpy.context.preferences.addons["cycles"].preferences
+        render = self.scene.render
+        return {
+            "engine": render.engine,
+            "device": f"{prefs.compute_device_type}/{self.scene.cycles.device}",
+            "samples": self.scene.cycles.samples,
+            "resolution": [
+                render.resolution_x * render.resolution_percentage // 100,
+                render.resolution_y * render.resolution_percentage // 100,
+            ],
+        }
+
+    def bind(self, object_names, output_node_names):
+        """
+        Resolve the objects and File Output nodes the sweep touches once per
+        sweep; per-frame calls then use these references instead of name
+        lookups and node scans. Returns what could not be resolved.
+        """
+        scene = self.scene
+        missing = []
+        self.handles = {}
+        for name in dict.fromkeys(object_names):
+            obj = scene.objects.get(name)
+            if obj is None:
+                missing.append(f"object '{name}'")
+            else:
+                self.handles[name] = obj
+        scene.use_nodes = True
+        self.file_outputs = {n.name: n for n in scene.node_tree.nodes if n.type == "OUTPUT_FILE"}
+        missing += [f"File Output node '{n}'" for n in dict.fromkeys(output_node_names) if n not in self.file_outputs]
+        if scene.camera is None:
+            missing.append("active camera")
+        return missing
+
+    def _object(self, name):
+        obj = self.handles.get(name)
+        return obj if obj is not None else self.scene.objects.get(name)
+
+    def _file_outputs(self):
+        if self.file_outputs is None:
+            self.scene.use_nodes = True
+            self.file_outputs = {n.name: n for n in self.scene.node_tree.nodes if n.type == "OUTPUT_FILE"}
+        return self.file_outputs
+
+    def toggle_output_nodes(self, enable_node_name: str):
+        for node in self._file_outputs().values():
+            mute = node.name != enable_node_name
+            if node.mute != mute:
+                node.mute = mute
+            self.log("debug", f"{'✅ Enabled' if not node.mute else '⏸️ Disabled'} node '{node.name}'")
+
+    def set_output_paths(self, path_for_node):
+        paths = {}
+        for node in self._file_outputs().values():
+            if not node.mute:
+                node.file_slots[0].path = path_for_node(node.name)
+                paths[node.name] = node.file_slots[0].path
+                self.log("debug", f"📂 Output path for '{node.name}' → {node.file_slots[0].path}")
+        return paths
+
+    def set_visibility(self, name: str, visible: bool):
+        obj = self._object(name)
+        if not obj:
+            self.log("warn", f"⚠️ Object '{name}' not found.")
+            return
+        if obj.hide_render == visible or obj.hide_viewport == visible:
+            obj.hide_viewport = not visible
+            obj.hide_render = not visible
+        self.log("debug", f"🔁 {name} visible={visible}")
+
+    def _world_nodes(self):
+        """(environment, background) nodes of the World, resolved once."""
+        if self.world_nodes is None:
+            world = self.scene.world
+            if not world:
+                return None
+            world.use_nodes = True
+            tree = world.node_tree
+            env_node = next((n for n in tree.nodes if n.type == "TEX_ENVIRONMENT"), None)
+            bg_node = next((n for n in tree.nodes if n.type == "BACKGROUND"), None)
+            if not env_node:
+                env_node = tree.nodes.new("ShaderNodeTexEnvironment")
+                env_node.location = (-300, 0)
+                if bg_node:
+                    tree.links.new(env_node.outputs["Color"], bg_node.inputs["Color"])
+            self.world_nodes = (env_node, bg_node)
+        return self.world_nodes
+
+    def set_environment_texture(self, path: str | None):
+        nodes = self._world_nodes()
+        if not nodes:
+            self.log("warn", "⚠️ No World in scene.")
+            return
+        env_node, bg_node = nodes
+        if path and os.path.exists(path):
+            env_node.image = self.bpy.data.images.load(path, check_existing=True)
+            self.log("debug", f"🌍 Loaded environment: {os.path.basename(path)}")
+        else:
+            env_node.image = None
+            if bg_node:
+                bg_node.inputs["Color"].default_value = (0.5, 0.5, 0.5, 1)
+            self.log("debug", "🌫️ Using default gray environment.")
+
+    def set_camera_location(self, location):
+        cam = self.scene.camera
+        if cam:
+            cam.location = location
+            self.log("debug", f"🎥 Set camera location to {tuple(round(v, 3) for v in location)}")
+        else:
+            self.log("warn", "⚠️ No active camera found.")
+
+    def set_camera_rotation(self, rotation):
+        cam = self.scene.camera
+        if cam:
+            cam.rotation_euler = rotation
+            self.log("debug", f"🎥 Set camera rotation to {tuple(round(math.degrees(a), 1) for a in rotation)}°")
+        else:
+            self.log("warn", "⚠️ No active camera found.")
+
+    def set_object_location(self, obj_name: str, location):
+        obj = self._object(obj_name)
+        if not obj:
+            self.log("warn", f"⚠️ Object '{obj_name}' not found for positioning")
+            return
+        obj.location = location
+
+    def set_object_rotation_z(self, obj_name: str, rotZ_deg: float):
+        arm = self._object(obj_name)
+        if not arm:
+            self.log("warn", f"⚠️ Armature '{obj_name}' not found.")
+            return
+        arm.rotation_euler = self.mathutils.Euler((0, 0, math.radians(rotZ_deg)))
+        self.log("debug", f"✅ Rotated '{obj_name}' Z={rotZ_deg}°")
+
+    def set_mesh_texture(self, mesh_name: str, slot_name: str, texture_path: str):
+        """Assigns texture to specific material slot if exists."""
+        obj = self._object(mesh_name)
+        if not obj:
+            self.log("warn", f"⚠️ Object '{mesh_name}' not found.")
+            return
+
+        mat_slot = next((m for m in obj.material_slots if m.name == slot_name), None)
+        if not mat_slot or not mat_slot.material:
+            self.log("warn", f"⚠️ Material slot '{slot_name}' not found on '{mesh_name}'.")
+            return
+
+        tex_node = self._texture_node(mat_slot.material)
+        if os.path.exists(texture_path):
+            tex_node.image = self.bpy.data.images.load(texture_path, check_existing=True)
+            self.log("debug", f"🧩 Applied texture '{os.path.basename(texture_path)}' to '{slot_name}'")
+        else:
+            self.log("warn", f"⚠️ Texture file not found: {texture_path}")
+
+    def _texture_node(self, mat):
+        """The material's image node, created and linked to Base Color if missing."""
+        mat.use_nodes = True
+        tree = mat.node_tree
+        tex_node = next((n for n in tree.nodes if n.type == "TEX_IMAGE"), None)
+        if not tex_node:
+            tex_node = tree.nodes.new("ShaderNodeTexImage")
+            tex_node.location = (-300, 0)
+            bsdf = next((n for n in tree.nodes if n.type == "BSDF_PRINCIPLED"), None)
+            if bsdf:
+                tree.links.new(tex_node.outputs["Color"], bsdf.inputs["Base Color"])
+        return tex_node
+
+    def prepare_texture_variants(self, mesh_name: str, slot_name: str, texture_paths: list):
+        """
+        Load every texture once and build one copy of the slot material per
+        texture, so a switch is a single slot assignment (no image reload,
+        no node search). Returns (variants, estimated GPU bytes), or None
+        if the slot is missing. Missing files get no variant.
+        """
+        obj = self._object(mesh_name)
+        if not obj:
+            self.log("warn", f"⚠️ Object '{mesh_name}' not found.")
+            return None
+        slot_index = next((i for i, m in enumerate(obj.material_slots) if m.name == slot_name), None)
+        if slot_index is None or not obj.material_slots[slot_index].material:
+            self.log("warn", f"⚠️ Material slot '{slot_name}' not found on '{mesh_name}'.")
+            return None
+
+        base = obj.material_slots[slot_index].material
+        known_images = set(self.bpy.data.images.keys())
+        materials, images = [], []
+        gpu_bytes = 0
+        for path in texture_paths:
+            if not os.path.exists(path):
+                materials.append(None)
+                continue
+            image = self.bpy.data.images.load(path, check_existing=True)
+            if image.name not in known_images:
+                images.append(image)
+            mat = base.copy()
+            mat.name = f"{base.name}@{os.path.splitext(os.path.basename(path))[0]}"
+            self._texture_node(mat).image = image
+            materials.append(mat)
+            gpu_bytes += texture_bytes(image.size[0], image.size[1], image.channels, image.is_float)
+        self.texture_variants[mesh_name, slot_name] = (slot_index, base, materials, images)
+        self.log("debug", f"🧩 {sum(m is not None for m in materials)} texture variants for '{slot_name}'")
+        return sum(m is not None for m in materials), gpu_bytes
+
+    def set_texture_variant(self, mesh_name: str, slot_name: str, index: int):
+        slot_index, _, materials, _ = self.texture_variants[mesh_name, slot_name]
+        if materials[index] is None:
+            self.log("warn", f"⚠️ No texture variant {index} for '{slot_name}'")
+            return False
+        self._object(mesh_name).material_slots[slot_index].material = materials[index]
+        return True
+
+    def release_texture_variants(self, mesh_name: str, slot_name: str):
+        """
+        Put the base material back in the slot (variant names would hide it
+        from set_mesh_texture's slot lookup) and remove the material copies
+        and the images loaded for them.
+        """
+        entry = self.texture_variants.pop((mesh_name, slot_name), None)
+        if entry is None:
+            return
+        slot_index, base, materials, images = entry
+        self._object(mesh_name).material_slots[slot_index].material = base
+        for mat in materials:
+            if mat is not None:
+                self.bpy.data.materials.remove(mat)
+        for image in images:
+            self.bpy.data.images.remove(image)
+
+    def apply_pose_dict(self, armature_name: str, pose_dict: dict):
+        """
+        Apply pose transforms to armature based on JSON-friendly data structure.
+        """
+        bpy = self.bpy
+        armature_obj = self._object(armature_name)
+        if armature_obj is None or armature_obj.type != 'ARMATURE':
+            raise ValueError("Provided object is not an armature")
+
+        bpy.context.view_layer.objects.active = armature_obj
+        bpy.ops.object.mode_set(mode='POSE')
+
+        for bone_name, data in pose_dict.items():
+            if bone_name not in armature_obj.pose.bones:
+                self.log("warn", f"[WARN] Bone '{bone_name}' not found in armature; skipping")
+                continue
+
+            pb = armature_obj.pose.bones[bone_name]
+
+            # Apply transforms
+            if "rotation_quaternion" in data:
+                pb.rotation_mode = 'QUATERNION'
+                pb.rotation_quaternion = data["rotation_quaternion"]
+
+            if "location" in data:
+                pb.location = data["location"]
+
+            if "scale" in data:
+                pb.scale = data["scale"]
+
+        bpy.ops.object.mode_set(mode='OBJECT')
+        self.log("debug", "[OK] Pose applied successfully")
+
+    def apply_smplx_pose(self, armature_name: str, pose: list, bone_map: dict):
+        """
+        SMPL-X axis-angle pose vector → bone quaternions via bone_map
+        (joint index → bone name).
+        """
+        bpy = self.bpy
+        mathutils = self.mathutils
+        arm = self._object(armature_name)
+        if not arm or arm.type != 'ARMATURE':
+            self.log("warn", "⚠️ Armature not valid."); return
+
+        bpy.context.view_layer.objects.active = arm
+        bpy.ops.object.mode_set(mode='POSE')
+
+        for i, bone_name in bone_map.items():
+            base = i * 3
+            if base + 2 >= len(pose): continue
+            rx, ry, rz = pose[base:base+3]
+            angle = math.sqrt(rx*rx + ry*ry + rz*rz)
+            if angle < 1e-8:
+                quat = mathutils.Quaternion((1, 0, 0, 0))
+            else:
+                axis = mathutils.Vector((rx, ry, rz)) / angle
+                quat = mathutils.Quaternion(axis, angle)
+            bone = arm.pose.bones.get(bone_name)
+            if not bone: continue
+            bone.rotation_mode = 'QUATERNION'
+            bone.rotation_quaternion = quat
+
+        bpy.ops.object.mode_set(mode='OBJECT')
+        bpy.context.view_layer.update()
+        self.log("debug", f"✅ Pose applied correctly to {armature_name}")
+
+    def render(self):
+        self.bpy.ops.render.render(write_still=True)
+
+    def camera_model(self):
+        """Active camera with constraints evaluated (e.g. Track To after a move)."""
+        from placement import CameraModel
+        cam = self.scene.camera
+        if not cam or cam.data.type != "PERSP":
+            return None
+        self.bpy.context.view_layer.update()
+        render = self.scene.render
+        data = cam.data
+        return CameraModel(
+            [list(row) for row in cam.matrix_world], data.lens, data.sensor_width, data.sensor_height,
+            data.sensor_fit,
+            render.resolution_x * render.resolution_percentage // 100,
+            render.resolution_y * render.resolution_percentage // 100,
+            data.shift_x, data.shift_y,
+        )
+
+    def armature_points(self, armature_name: str):
+        """
+        Posed bone heads and tails through the armature's world matrix minus
+        its location and Z rotation (the placement check applies those per
+        candidate and z_angle), as an (2·bones, 3) array. Read it after the
+        pose is applied and the view layer updated (see camera_model).
+        """
+        import numpy as np
+        arm = self._object(armature_name)
+        if not arm or arm.type != 'ARMATURE':
+            return None
+        bones = arm.pose.bones
+        heads = np.empty(len(bones) * 3, dtype=np.float32)
+        tails = np.empty(len(bones) * 3, dtype=np.float32)
+        bones.foreach_get("head", heads)
+        bones.foreach_get("tail", tails)
+        points = np.concatenate([heads, tails]).reshape(-1, 3)
+
+        c, s = math.cos(arm.rotation_euler.z), math.sin(arm.rotation_euler.z)
+        unrotate_z = np.array([[c, s, 0.0], [-s, c, 0.0], [0.0, 0.0, 1.0]])
+        basis = unrotate_z @ np.array([list(row) for row in arm.matrix_world.to_3x3()])
+        return points @ basis.T
+
+    def set_resolution_by_ar(self, ar: str = "9:16", base_width: int = 720):
+        """
+        Set Blender render resolution using an aspect-ratio string like:
+          - "9:16"  -> 720 × 1280
+          - "2:3"   -> 720 × 1080
+          - "3:4"   -> 720 × 960
+          - "1:1"   -> 720 × 720
+
+        If input is invalid, fallback is "9:16".
+        """
+        scene = self.scene
+
+        # --- Parse AR ---
+        try:
+            w_str, h_str = ar.split(":")
+            ar_w = float(w_str)
+            ar_h = float(h_str)
+        except Exception:
+            self.log("warn", f"[WARN] Invalid AR '{ar}', using default 9:16")
+            ar_w, ar_h = 9.0, 16.0
+
+        # --- Compute resolution ---
+        # scale height relative to base width
+        height = int(base_width * (ar_h / ar_w))
+
+        # Apply to Blender
+        scene.render.resolution_x = int(base_width)
+        scene.render.resolution_y = height
+        scene.render.resolution_percentage = 100
+        scene.render.pixel_aspect_x = 1.0
+        scene.render.pixel_aspect_y = 1.0
+
+        self.log("info", f"✓ Resolution set: {base_width} × {height}  (AR {ar})")
+
+        return base_width, height
+
+    def ensure_index_viewer(self):
+        """
+        Route the IndexMA pass into a Viewer node so its pixels can be read
+        from bpy.data.images["Viewer Node"] after bpy.ops.render.render.
+        """
+        scene = self.scene
+        scene.use_nodes = True
+        self.bpy.context.view_layer.use_pass_material_index = True
+        tree = scene.node_tree
+        rl_node = next((n for n in tree.nodes if n.type == "R_LAYERS"), None)
+        if not rl_node:
+            self.log("warn", "⚠️ No Render Layers node, in-Blender label export disabled.")
+            return False
+        viewer = next((n for n in tree.nodes if n.type == "VIEWER"), None)
+        if not viewer:
+            viewer = tree.nodes.new("CompositorNodeViewer")
+            viewer.location = (rl_node.location.x + 300, rl_node.location.y - 300)
+        tree.links.new(rl_node.outputs["IndexMA"], viewer.inputs["Image"])
+        return True
+
+    def read_index_pass(self):
+        """(flat RGBA float32 pixels, width, height) of the Viewer Node image."""
+        import numpy as np
+        img = self.bpy.data.images.get("Viewer Node")
+        if not img:
+            self.log("warn", "⚠️ Cannot export labels: viewer image missing.")
+            return None
+        w, h = img.size
+        pixels = np.empty(w * h * 4, dtype=np.float32)
+        img.pixels.foreach_get(pixels)
+        return pixels, w, h
+
+    def output_file_stem(self, node_name: str):
+        """(directory, stem) of the file the File Output node just wrote."""
+        node = self._file_outputs().get(node_name)
+        if not node:
+            self.log("warn", f"⚠️ Cannot export labels: node '{node_name}' missing.")
+            return None
+        # File Output appends the 4-digit frame number to the slot path
+        stem = f"{node.file_slots[0].path}{self.scene.frame_current:04d}"
+        return self.bpy.path.abspath(node.base_path), stem
+
+
+# ----------------------------------------------------------
+# In-memory backend
+# ----------------------------------------------------------
+
+# simulated seconds per call (per bone for pose calls)
+FAKE_COSTS = {
+    "set_environment_texture": 0.5,
+    "set_mesh_texture": 0.2,
+    "prepare_texture_variants": 0.2,   # per variant, once per sweep
+    "set_texture_variant": 0.001,
+    "release_texture_variants": 0.01,
+    "apply_pose_dict": 0.0002,
+    "apply_smplx_pose": 0.0002,
+    "render": 30.0,
+}
+
+
+def fake_index_pass(height=24, width=16):
+    """Label mask of a small centred figure: body (1) and head (2) on background."""
+    import numpy as np
+    mask = np.zeros((height, width), dtype=np.uint8)
+    mask[height // 4:height - 2, width // 4:width - width // 4] = 1
+    mask[2:height // 4, width // 2 - 2:width // 2 + 2] = 2
+    return mask
+
+
+class FakeScene(SceneAdapter):
+    """
+    Records every call in `calls` and advances a virtual `clock` by the
+    simulated cost (optionally sleeping for real with sleep_scale > 0).
+    `index_pass` is the label mask read_index_pass hands back (Blender
+    layout), `out_dir` the directory output_file_stem reports.
+    """
+
+    def __init__(self, objects=(), output_nodes=("segmentation-material", "image"),
+                 costs=None, sleep_scale=0.0, log=None, frame=1, texture_sizes=None,
+                 index_pass=None, out_dir=""):
+        super().__init__(log)
+        self.objects = {
+            name: {"location": (0, 0, 0), "rotation_z": 0.0, "visible": True}
+            for name in objects
+        }
+        self.nodes = {name: {"mute": False, "path": ""} for name in output_nodes}
+        self.costs = {**FAKE_COSTS, **(costs or {})}
+        self.sleep_scale = sleep_scale
+        self.clock = 0.0
+        self.calls = []
+        self.rendered = []
+        self.camera = {"location": (0, 0, 0), "rotation": (0, 0, 0)}
+        self.frame = frame
+        self.texture_sizes = texture_sizes or {}  # path → simulated GPU bytes of its variant
+        self.variants = {}                        # (mesh, slot) → active variant index, None before the first switch
+        self.index_pass = fake_index_pass() if index_pass is None else index_pass
+        self.out_dir = out_dir
+
+    def _call(self, name, *args, units=1):
+        self.calls.append((name, args))
+        cost = self.costs.get(name, 0.0) * units
+        self.clock += cost
+        if self.sleep_scale and cost:
+            time.sleep(cost * self.sleep_scale)
+
+    def _object(self, name):
+        obj = self.objects.get(name)
+        if obj is None:
+            self.log("warn", f"⚠️ Object '{name}' not found.")
+        return obj
+
+    def render_settings(self):
+        return {"engine": "FAKE", "device": "CPU", "samples": 0, "resolution": [0, 0]}
+
+    def bind(self, object_names, output_node_names):
+        self._call("bind")
+        missing = [f"object '{n}'" for n in dict.fromkeys(object_names) if n not in self.objects]
+        return missing + [f"File Output node '{n}'" for n in dict.fromkeys(output_node_names) if n not in self.nodes]
+
+    def toggle_output_nodes(self, enable_node_name):
+        self._call("toggle_output_nodes", enable_node_name)
+        for name, node in self.nodes.items():
+            node["mute"] = name != enable_node_name
+
+    def set_output_paths(self, path_for_node):
+        self._call("set_output_paths")
+        paths = {}
+        for name, node in self.nodes.items():
+            if not node["mute"]:
+                node["path"] = paths[name] = path_for_node(name)
+        return paths
+
+    def set_visibility(self, name, visible):
+        self._call("set_visibility", name, visible)
+        obj = self._object(name)
+        if obj:
+            obj["visible"] = visible
+
+    def set_environment_texture(self, path):
+        self._call("set_environment_texture", path)
+
+    def set_camera_location(self, location):
+        self._call("set_camera_location", location)
+        self.camera["location"] = tuple(location)
+
+    def set_camera_rotation(self, rotation):
+        self._call("set_camera_rotation", rotation)
+        self.camera["rotation"] = tuple(rotation)
+
+    def set_object_location(self, obj_name, location):
+        self._call("set_object_location", obj_name, location)
+        obj = self._object(obj_name)
+        if obj:
+            obj["location"] = tuple(location)
+
+    def set_object_rotation_z(self, obj_name, rotZ_deg):
+        self._call("set_object_rotation_z", obj_name, rotZ_deg)
+        obj = self._object(obj_name)
+        if obj:
+            obj["rotation_z"] = rotZ_deg
+
+    def set_mesh_texture(self, mesh_name, slot_name, texture_path):
+        self._call("set_mesh_texture", mesh_name, slot_name, texture_path)
+
+    def prepare_texture_variants(self, mesh_name, slot_name, texture_paths):
+        self._call("prepare_texture_variants", mesh_name, slot_name, units=len(texture_paths))
+        if self._object(mesh_name) is None:
+            return None
+        self.variants[mesh_name, slot_name] = None
+        return len(texture_paths), sum(self.texture_sizes.get(p, 0) for p in texture_paths)
+
+    def set_texture_variant(self, mesh_name, slot_name, index):
+        self._call("set_texture_variant", mesh_name, slot_name, index)
+        self.variants[mesh_name, slot_name] = index
+        return True
+
+    def release_texture_variants(self, mesh_name, slot_name):
+        self._call("release_texture_variants", mesh_name, slot_name)
+        self.variants.pop((mesh_name, slot_name), None)
+
+    def apply_pose_dict(self, armature_name, pose_dict):
+        self._call("apply_pose_dict", armature_name, units=len(pose_dict))
+
+    def apply_smplx_pose(self, armature_name, pose, bone_map):
+        self._call("apply_smplx_pose", armature_name, units=len(bone_map))
+
+    def render(self):
+        self._call("render")
+        self.rendered.append({n: node["path"] for n, node in self.nodes.items() if not node["mute"]})
+
+    def camera_model(self):
+        # camera tracks the origin, like a Track To constraint
+        from placement import CameraModel, look_at_matrix
+        return CameraModel(look_at_matrix(self.camera["location"], (0, 0, 1.0)),
+                           50.0, 36.0, 24.0, "AUTO", 720, 1280)
+
+    def armature_points(self, armature_name):
+        from placement import bbox_points
+        return bbox_points((-0.3, -0.2, 0.0), (0.3, 0.2, 1.8)) if armature_name in self.objects else None
+
+    def ensure_index_viewer(self):
+        return True
+
+    def read_index_pass(self):
+        import numpy as np
+        self._call("read_index_pass")
+        h, w = np.shape(self.index_pass)
+        rgba = np.zeros((h, w, 4), dtype=np.float32)
+        rgba[..., 0] = np.asarray(self.index_pass)[::-1]  # bottom row first
+        rgba[..., 3] = 1.0
+        return rgba.ravel(), w, h
+
+    def output_file_stem(self, node_name):
+        return self.out_dir, f"{self.nodes[node_name]['path']}{self.frame:04d}"
@@ -1,4 +1,11 @@
 import bpy, json, os
+import argparse
+import hashlib
+import sys
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))  # repo root: blender -P does not add it
+from blender_args import script_args
 
 def get_scene_structure(include_vertex_groups=True):
     """
@@ -99,3 +106,208 @@ def save_scene_structure(filepath, include_vertex_groups=True):
     with open(filepath, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2)
     print(f"✅ Scene info saved to: {filepath}")
+
+
+# ----------------------------------------------------------
+# Bulk export: foreach_get into NumPy, arrays in .npz + slim JSON index
+# ----------------------------------------------------------
+
+def _floats(collection, attr, width):
+    """(len(collection), width) float32 array of a float property, in one foreach_get."""
+    buf = np.empty(len(collection) * width, dtype=np.float32)
+    collection.foreach_get(attr, buf)
+    return buf.reshape(-1, width)
+
+
+def _matrices(collection, attr):
+    # foreach_get flattens matrices column-major: transpose back to row-major
+    return _floats(collection, attr, 16).reshape(-1, 4, 4).transpose(0, 2, 1)
+
+
+def _digest(*arrays):
+    h = hashlib.blake2b(digest_size=8)
+    for a in arrays:
+        h.update(np.ascontiguousarray(a).tobytes())
+    return h.hexdigest()
+
+
+def get_scene_arrays():
+    """
+    Object transforms and armature poses of bpy.data as arrays:
+    (objects, armatures) with objects = {names, types, parents, matrix_world,
+    location, rotation_euler, scale} and armatures = {name: {bone_names,
+    matrix, location, rotation_quaternion, rotation_euler, scale}}.
+    """
+    objs = bpy.data.objects
+    names = [o.name for o in objs]
+    index = {n: i for i, n in enumerate(names)}
+    objects = {
+        "names": names,
+        "types": [o.type for o in objs],
+        "parents": np.array([index[o.parent.name] if o.parent else -1 for o in objs], dtype=np.int32),
+        "matrix_world": _matrices(objs, "matrix_world"),
+        "location": _floats(objs, "location", 3),
+        "rotation_euler": _floats(objs, "rotation_euler", 3),
+        "scale": _floats(objs, "scale", 3),
+    }
+    armatures = {}
+    for o in objs:
+        if o.type != "ARMATURE":
+            continue
+        bones = o.pose.bones
+        armatures[o.name] = {
+            "bone_names": [pb.name for pb in bones],
+            "matrix": _matrices(bones, "matrix"),
+            "location": _floats(bones, "location", 3),
+            "rotation_quaternion": _floats(bones, "rotation_quaternion", 4),
+            "rotation_euler": _floats(bones, "rotation_euler", 3),
+            "scale": _floats(bones, "scale", 3),
+        }
+    return objects, armatures
+
+
+def save_scene_bulk(out_dir, name="scene", only_changed=False, include_materials=True, compress=False):
+    """
+    Writes {name}.npz (object transforms, pose bone matrices / channels) and
+    {name}.json (object, mesh and armature index plus a digest per object).
+    With only_changed and a previous export, only objects whose transform
+    (and pose, for armatures) digest changed go into a numbered delta
+    {name}.0001.npz, ... appended to the index's "arrays" chain;
+    load_scene_bulk replays base + deltas. Returns the number of exported objects.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    json_path = os.path.join(out_dir, f"{name}.json")
+
+    previous = None
+    if os.path.exists(json_path):
+        with open(json_path, encoding="utf-8") as f:
+            previous = json.load(f)
+    delta = only_changed and previous is not None
+    chain = previous["arrays"] if delta else []
+    npz_name = f"{name}.{len(chain):04d}.npz" if delta else f"{name}.npz"
+    npz_path = os.path.join(out_dir, npz_name)
+
+    objects, armatures = get_scene_arrays()
+    digests = {}
+    for i, obj_name in enumerate(objects["names"]):
+        pose = armatures.get(obj_name)
+        digests[obj_name] = _digest(objects["matrix_world"][i], *([pose["matrix"]] if pose else []))
+    old_digests = previous.get("digests", {}) if delta else {}
+    changed = [i for i, n in enumerate(objects["names"]) if old_digests.get(n) != digests[n]]
+    changed_names = {objects["names"][i] for i in changed}
+
+    arrays = {"object_names": np.array([objects["names"][i] for i in changed])}
+    for key in ("matrix_world", "location", "rotation_euler", "scale"):
+        arrays[f"object_{key}"] = objects[key][changed]
+    # armatures of this file are armature0.. in "armature_names" order
+    exported_armatures = [n for n in armatures if n in changed_names]
+    arrays["armature_names"] = np.array(exported_armatures)
+    for j, arm_name in enumerate(exported_armatures):
+        pose = armatures[arm_name]
+        arrays[f"armature{j}_bone_names"] = np.array(pose["bone_names"])
+        for key in ("matrix", "location", "rotation_quaternion", "rotation_euler", "scale"):
+            arrays[f"armature{j}_{key}"] = pose[key]
+    armature_index = [
+        {"name": arm_name, "prefix": f"armature{i}", "bones": len(pose["bone_names"]),
+         "exported": arm_name in changed_names}
+        for i, (arm_name, pose) in enumerate(armatures.items())
+    ]
+
+    meshes = []
+    for o in bpy.data.objects:
+        if o.type != "MESH":
+            continue
+        arm_mod = next((md for md in o.modifiers if md.type == "ARMATURE" and md.object), None)
+        parent_arm = o.parent if (o.parent and o.parent.type == "ARMATURE") else None
+        entry = {
+            "name": o.name,
+            "vertex_count": len(o.data.vertices),
+            "armature": parent_arm.name if parent_arm else (arm_mod.object.name if arm_mod else None),
+        }
+        if include_materials:
+            entry["materials"] = [slot.material.name for slot in o.material_slots if slot.material]
+        meshes.append(entry)
+
+    if changed or not delta:
+        (np.savez_compressed if compress else np.savez)(npz_path, **arrays)
+        chain = [*chain, npz_name]
+    if previous is not None and not delta:
+        # a full export starts a new chain: the old deltas are unreachable
+        for old in previous.get("arrays", [])[1:]:
+            if os.path.exists(os.path.join(out_dir, old)):
+                os.remove(os.path.join(out_dir, old))
+    index = {
+        "arrays": chain,
+        "objects": [
+            {"name": n, "type": t, "parent": objects["names"][p] if p >= 0 else None}
+            for n, t, p in zip(objects["names"], objects["types"], objects["parents"].tolist())
+        ],
+        "armatures": armature_index,
+        "meshes": meshes,
+        "unchanged": [n for n in objects["names"] if n not in changed_names],
+        "digests": digests,
+    }
+    tmp = f"{json_path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index, f, separators=(",", ":"))
+    os.replace(tmp, json_path)
+    if changed or not delta:
+        print(f"✅ {len(changed)}/{len(objects['names'])} objects exported to: {npz_path}")
+    else:
+        print(f"✅ No changes since the last export: {json_path}")
+    return len(changed)
+
+
+def load_scene_bulk(out_dir, name="scene"):
+    """
+    (index dict, arrays dict) written by save_scene_bulk: the base npz with
+    every delta of the chain applied, laid out like a full export.
+    """
+    with open(os.path.join(out_dir, f"{name}.json"), encoding="utf-8") as f:
+        index = json.load(f)
+    objects, armatures = {}, {}
+    for npz_name in index["arrays"]:
+        with np.load(os.path.join(out_dir, npz_name)) as data:
+            for i, obj_name in enumerate(data["object_names"].tolist()):
+                objects[obj_name] = {
+                    key: data[f"object_{key}"][i]
+                    for key in ("matrix_world", "location", "rotation_euler", "scale")
+                }
+            for j, arm_name in enumerate(data["armature_names"].tolist()):
+                armatures[arm_name] = {
+                    key[len(f"armature{j}_"):]: data[key]
+                    for key in data.files if key.startswith(f"armature{j}_")
+                }
+
+    names = [o["name"] for o in index["objects"]]
+    arrays = {"object_names": np.array(names)}
+    for key in ("matrix_world", "location", "rotation_euler", "scale"):
+        arrays[f"object_{key}"] = np.array([objects[n][key] for n in names], dtype=np.float32)
+    for entry in index["armatures"]:
+        for key, value in armatures[entry["name"]].items():
+            arrays[f"{entry['prefix']}_{key}"] = value
+    return index, arrays
+
+
+def main(argv=None):
+    """
+    blender -b scene.blend -P scene_export_utils.py -- --out-dir /tmp/scene [--only-changed] [--json]
+    """
+    if argv is None:
+        argv = script_args()
+    parser = argparse.ArgumentParser(description="Export the scene structure (bulk npz + JSON index, or full JSON)")
+    parser.add_argument("--out-dir", default="/tmp/blender-outputs/scene")
+    parser.add_argument("--name", default="scene")
+    parser.add_argument("--only-changed", action="store_true", help="Skip objects unchanged since the last export")
+    parser.add_argument("--compress", action="store_true")
+    parser.add_argument("--json", action="store_true", help="Full per-object JSON (get_scene_structure) instead")
+    args = parser.parse_args(argv)
+
+    if args.json:
+        save_scene_structure(os.path.join(args.out_dir, f"{args.name}_structure.json"))
+    else:
+        save_scene_bulk(args.out_dir, args.name, args.only_changed, compress=args.compress)
+
+
+if __name__ == "__main__":
+    main()
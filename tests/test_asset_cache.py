@@ -0,0 +1,47 @@
+import os
+
+import pytest
+
+from asset_cache import AssetCache, LocalSource, asset_manifest, prefetch
+
+
+def quiet(*args):
+    pass
+
+
+def make_source(root):
+    (root / "tex").mkdir(parents=True)
+    (root / "poses").mkdir()
+    (root / "tex" / "skin.png").write_bytes(b"skin" * 100)
+    (root / "poses" / "a.json").write_text("{}")
+    (root / "poses" / "b.json").write_text("[]")
+    return asset_manifest(str(root), [str(root / "tex" / "skin.png")], {str(root / "poses"): ".json"})
+
+
+def test_prefetch_links_and_reuses_the_cache(tmp_path):
+    manifest = make_source(tmp_path / "src")
+    source, cache = LocalSource(str(tmp_path / "src")), AssetCache(str(tmp_path / "cache"))
+
+    first = prefetch(manifest, source, str(tmp_path / "dest"), cache, workers=2, log=quiet)
+    assert (first["fetched"], first["hits"], first["failed"], first["missing"]) == (3, 0, [], [])
+    assert (tmp_path / "dest" / "tex" / "skin.png").read_bytes() == b"skin" * 100
+
+    again = prefetch(manifest, source, str(tmp_path / "dest2"), AssetCache(str(tmp_path / "cache")), log=quiet)
+    assert (again["fetched"], again["hits"]) == (0, 3)
+    assert os.path.samefile(tmp_path / "dest2" / "poses" / "a.json", tmp_path / "dest" / "poses" / "a.json")
+
+
+def test_same_size_corruption_fails_the_sha256_check(tmp_path):
+    make_source(tmp_path / "src")
+    source, cache = LocalSource(str(tmp_path / "src")), AssetCache(str(tmp_path / "cache"))
+    size, etag = source.stat("tex/skin.png")
+
+    class Corrupting(LocalSource):
+        def fetch(self, key, dest):
+            with open(dest, "wb") as f:
+                f.write(b"x" * size)
+
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        cache.fetch(Corrupting(source.root), "tex/skin.png", size, etag)
+    assert cache.lookup("tex/skin.png", size, etag) is None
+    assert not [n for n in os.listdir(cache.objects) if n.endswith(".part")]
@@ -0,0 +1,35 @@
+import cv2
+import numpy as np
+
+from calibrate_thresholds import ApproxCache, cache_components, evaluate
+from organize_masks_annotation import build_fusion_lut
+
+
+def two_part_mask():
+    mask = np.zeros((60, 80), dtype=np.uint8)
+    mask[5:30, 5:40] = 3
+    mask[32:36, 50:55] = 4    # small part, under any min area
+    mask[40:55, 10:70] = 7
+    return mask
+
+
+def test_fused_groups_keep_every_component():
+    fusion = {"legs": [4, 7]}
+    cached = [cache_components(two_part_mask(), [3, 4, 7], cv2.CHAIN_APPROX_SIMPLE, fusion, build_fusion_lut(fusion))]
+    assert [fused for fused, _ in cached[0]["classes"]] == [False, True]
+
+    r = evaluate(cached, ApproxCache(), 0.0, 0.001, 100, 0.0, 1)
+    assert r["dropped_area_pct"] == 0.0
+    assert r["polygons_per_image"] == 3
+    assert r["vertices_per_image"] == 12
+
+
+def test_approx_cache_is_keyed_per_image_and_component():
+    mask = two_part_mask()
+    cached = [cache_components(mask, [3, 4, 7], cv2.CHAIN_APPROX_SIMPLE) for _ in range(2)]
+    approx = ApproxCache(max_vertices=3, iou_tolerance=0.5)
+
+    r = evaluate(cached, approx, 0.0, 0.001, 100, 0.0, 1)
+    assert len(approx.cache) == 2 * 2   # parts 3 and 7 in both images; 4 is dropped
+    assert r["dropped_area_pct"] > 0
+    assert r["vertices_per_image"] <= 2 * 4
@@ -0,0 +1,43 @@
+import numpy as np
+
+from dedup import KEY_BITS, DedupIndex, dhash
+
+
+def flip_bits(key, positions):
+    for p in positions:
+        key ^= 1 << p
+    return key
+
+
+def test_lookup_finds_the_closest_key_within_the_radius():
+    rng = np.random.default_rng(3)
+    keys = [int(rng.integers(0, 2**63)) << 64 | int(rng.integers(0, 2**63)) for _ in range(50)]
+    index = DedupIndex(radius=6)
+    for i, key in enumerate(keys):
+        index.add(key, f"f{i}")
+
+    near = flip_bits(keys[7], [0, 31, 64, 90, 127, 100])        # 6 bits, spread over several bands
+    assert index.query(near) == (6, "f7")
+    assert index.query(keys[7]) == (0, "f7")
+    assert index.query(flip_bits(keys[7], range(0, KEY_BITS, 16))) is None   # 8 bits away
+
+
+def test_index_persists_across_runs(tmp_path):
+    path = tmp_path / "dedup_index.jsonl"
+    first = DedupIndex(radius=2, path=path)
+    first.add(0xABC, "a")
+    first.add(1 << 127, "b")
+    first.close()
+
+    second = DedupIndex(radius=2, path=path)
+    assert len(second) == 2
+    assert second.query((1 << 127) | 1) == (1, "b")
+    second.close()
+
+
+def test_dhash_is_stable_under_small_noise():
+    rng = np.random.default_rng(0)
+    img = np.tile(np.linspace(0, 255, 64), (64, 1)) * rng.uniform(0.5, 1.0, (64, 1))
+    noisy = img + rng.normal(0, 1.0, img.shape)
+    assert (dhash(img) ^ dhash(noisy)).bit_count() <= 4
+    assert dhash(img) != dhash(img[:, ::-1])
@@ -0,0 +1,41 @@
+from frame_manifest import (
+    ManifestWriter, csv_fields, frame_id, frame_record, load_manifest, output_name, parse_output_name,
+)
+
+
+def test_frame_id_is_stable_hex_and_seeded():
+    fid = frame_id("env=a&cam=b", 0)
+    assert fid == frame_id("env=a&cam=b", 0)
+    assert len(fid) == 16 and int(fid, 16) >= 0
+    assert fid != frame_id("env=a&cam=b", 1)
+    assert fid != frame_id("env=a&cam=c", 0)
+
+
+def test_output_names_parse_back_to_node_and_id():
+    fid = frame_id("k", 7)
+    assert parse_output_name(f"/out/{output_name('segmentation-material', fid)}0001.png") == (
+        "segmentation-material", fid
+    )
+    assert parse_output_name("image&env=a&char=genesis0001.png") is None
+    assert parse_output_name(f"image_{fid[:-1]}_0001.png") is None
+
+
+def test_manifest_appends_and_keeps_the_latest_record(tmp_path):
+    path = tmp_path / "nested" / "frames.jsonl"
+    first = frame_record("a" * 16, "k", {"env": "e0"}, 3, (1.0, 2.0, 3.0), files={"image": "x.png"})
+    writer = ManifestWriter(str(path))
+    writer.write(first)
+    writer.write({**first, "visible": 0.5})
+    writer.close()
+    writer = ManifestWriter(str(path))
+    writer.write(frame_record("b" * 16, "k2", {"env": "e1"}, 3, (0, 0, 0), obj=(1, 1, 1), visible=0.25))
+    writer.close()
+
+    records = load_manifest(str(path))
+    assert list(records) == ["a" * 16, "b" * 16]
+    assert records["a" * 16]["visible"] == 0.5
+    assert csv_fields(records["b" * 16]) == {
+        "frame_id": "b" * 16, "env": "e1", "seed": 3,
+        "cam_x": 0, "cam_y": 0, "cam_z": 0, "obj_x": 1, "obj_y": 1, "obj_z": 1, "visible": 0.25,
+    }
+    assert load_manifest(str(tmp_path / "missing.jsonl")) == {}
@@ -0,0 +1,38 @@
+import numpy as np
+
+from frame_quality import check_frame, frame_stats, reject_reasons
+
+
+def figure(h=40, w=40):
+    mask = np.zeros((h, w), dtype=np.uint8)
+    mask[8:36, 12:28] = 1
+    mask[4:8, 16:24] = 2
+    return mask
+
+
+def test_a_centred_multi_class_figure_is_kept():
+    stats, reasons = check_frame(figure())
+    assert reasons == []
+    assert stats["classes"] == 2
+    assert stats["truncated_edges"] == []
+
+
+def test_degenerate_frames_get_one_reason_per_check():
+    empty = np.zeros((40, 40), dtype=np.uint8)
+    assert [r.split()[0] for r in reject_reasons(frame_stats(empty))] == ["foreground", "classes"]
+
+    full = np.ones((40, 40), dtype=np.uint8)
+    reasons = reject_reasons(frame_stats(full))
+    assert any(r.startswith("dominant class covers 1.00") for r in reasons)
+    assert "truncated at top/bottom/left/right" in reasons
+
+
+def test_thresholds_and_downsample_are_configurable():
+    cropped = figure()
+    cropped[:, :20] = 0
+    cropped[20:, 20:] = 1   # bottom-right corner: touches two edges
+    stats = frame_stats(cropped, downsample=1)
+    assert stats["truncated_edges"] == ["bottom", "right"]
+    assert reject_reasons(stats) == []
+    assert reject_reasons(stats, max_truncated_edges=1) == ["truncated at bottom/right"]
+    assert reject_reasons(stats, min_classes=3) == ["classes 2 < 3"]
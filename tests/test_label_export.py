@@ -0,0 +1,71 @@
+import json
+
+import numpy as np
+
+from label_export import (
+    decode_rle, encode_rle, labels_from_index_pass, load_frame_labels, summarize_label_mask, write_frame_labels,
+)
+
+
+def blender_pixels(mask):
+    """Flat RGBA float buffer of a label mask, bottom row first like image.pixels."""
+    h, w = mask.shape
+    rgba = np.zeros((h, w, 4), dtype=np.float32)
+    rgba[..., 0] = mask[::-1]
+    rgba[..., 1] = 7.0   # only channel 0 carries the index
+    rgba[..., 3] = 1.0
+    return rgba.ravel(), w, h
+
+
+def test_labels_from_index_pass_flips_rows_and_reads_channel_0():
+    mask = np.zeros((3, 4), dtype=np.uint8)
+    mask[0, 1] = 2   # top row
+    mask[2, 3] = 5   # bottom row
+    pixels, w, h = blender_pixels(mask)
+
+    labels = labels_from_index_pass(pixels + 0.02, w, h)
+    assert labels.dtype == np.uint8
+    assert np.array_equal(labels, mask)
+
+
+def test_labels_from_index_pass_widens_to_uint16():
+    mask = np.array([[0, 300], [1, 0]])
+    labels = labels_from_index_pass(*blender_pixels(mask))
+    assert labels.dtype == np.uint16
+    assert np.array_equal(labels, mask)
+
+
+def test_rle_is_column_major_and_round_trips_a_mask_with_a_hole():
+    ring = np.ones((3, 3), dtype=bool)
+    ring[1, 1] = False
+    rle = encode_rle(ring)
+    assert rle == {"size": [3, 3], "counts": [0, 4, 1, 4]}
+    assert np.array_equal(decode_rle(rle), ring)
+
+    strip = np.zeros((2, 3), dtype=bool)
+    strip[:, 1] = True
+    assert encode_rle(strip)["counts"] == [2, 2, 2]
+
+
+def test_summarize_label_mask_reports_bbox_area_and_names():
+    mask = np.zeros((4, 5), dtype=np.uint8)
+    mask[1:3, 2:5] = 3
+    mask[3, 0] = 1
+    summary = summarize_label_mask(mask, {3: "shirt"})
+
+    assert summary["size"] == [4, 5]
+    assert summary["histogram"] == {"0": 13, "1": 1, "3": 6}
+    one, three = summary["labels"]
+    assert (one["value"], one["bbox"], one["area"]) == (1, [0, 3, 1, 1], 1)
+    assert (three["bbox"], three["area"], three["label"]) == ([2, 1, 3, 2], 6, "shirt")
+    assert "label" not in one
+
+
+def test_frame_labels_round_trip(tmp_path):
+    rng = np.random.default_rng(0)
+    mask = rng.integers(0, 4, size=(6, 9)).astype(np.uint8)
+    path = write_frame_labels(mask, str(tmp_path), "seg0001", {1: "skin"})
+
+    assert path == str(tmp_path / "seg0001.labels.json")
+    assert json.loads((tmp_path / "seg0001.labels.json").read_text())["size"] == [6, 9]
+    assert np.array_equal(load_frame_labels(path), mask)
@@ -0,0 +1,35 @@
+import json
+
+import numpy as np
+import pytest
+
+from label_store import INDEX_NAME, LabelStore, LabelStoreWriter
+
+
+def test_masks_round_trip_across_shards(tmp_path):
+    rng = np.random.default_rng(0)
+    masks = {f"m{i}.png": rng.integers(0, 50, size=(4, 6), dtype=np.uint8) for i in range(5)}
+    masks["wide.png"] = np.full((3, 3), 1000, dtype=np.uint16)
+
+    writer = LabelStoreWriter(tmp_path, shard_size=2)
+    for name, mask in masks.items():
+        writer.append(name, mask)
+    writer.close()
+
+    store = LabelStore(tmp_path)
+    assert len(store) == 6
+    assert [s["shape"] for s in store.shards] == [[2, 4, 6], [2, 4, 6], [1, 4, 6], [1, 3, 3]]
+    for name, mask in masks.items():
+        got = store.get(name)
+        assert got.dtype == mask.dtype
+        assert np.array_equal(got, mask)
+    assert isinstance(store.shard(0), np.memmap)
+    assert np.array_equal(store.shard(1)[1], masks["m3.png"])
+
+
+def test_unknown_store_version_is_rejected(tmp_path):
+    LabelStoreWriter(tmp_path).close()
+    index = json.loads((tmp_path / INDEX_NAME).read_text())
+    (tmp_path / INDEX_NAME).write_text(json.dumps({**index, "version": 99}))
+    with pytest.raises(ValueError, match="Unsupported label store version 99"):
+        LabelStore(tmp_path)
@@ -0,0 +1,43 @@
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from mask_io import read_mask, read_mask_pil
+
+
+def index_mask():
+    mask = np.zeros((6, 5), dtype=np.uint8)
+    mask[1:4, 1:3] = 7
+    mask[4, :] = 200
+    return mask
+
+
+def test_grayscale_8_and_16_bit_decode_as_stored(tmp_path):
+    mask = index_mask()
+    cv2.imwrite(str(tmp_path / "m8.png"), mask)
+    cv2.imwrite(str(tmp_path / "m16.png"), mask.astype(np.uint16) * 300)
+
+    assert np.array_equal(read_mask(tmp_path / "m8.png"), mask)
+    wide = read_mask(tmp_path / "m16.png")
+    assert wide.dtype == np.uint16
+    assert np.array_equal(wide, mask.astype(np.uint16) * 300)
+
+
+def test_rgba_masks_use_the_pass_index_channel(tmp_path):
+    mask = index_mask()
+    rgba = np.dstack([mask, mask, mask, np.full_like(mask, 255)])
+    Image.fromarray(rgba, "RGBA").save(tmp_path / "rgba.png")
+
+    assert np.array_equal(read_mask(tmp_path / "rgba.png"), mask)
+    assert np.array_equal(read_mask_pil(tmp_path / "rgba.png"), mask)
+
+
+def test_differing_color_channels_are_rejected(tmp_path):
+    mask = index_mask()
+    rgb = np.dstack([mask, mask // 2, mask])
+    Image.fromarray(rgb, "RGB").save(tmp_path / "rgb.png")
+
+    with pytest.raises(ValueError, match="differing color channels"):
+        read_mask(tmp_path / "rgb.png")
+    assert np.array_equal(read_mask(tmp_path / "rgb.png", check_channels=False), mask)
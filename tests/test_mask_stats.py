@@ -0,0 +1,40 @@
+import cv2
+import numpy as np
+
+from label_store import LabelStore, build_store
+from mask_stats import collect_dataset_stats, per_image_histograms, summarize
+
+
+def test_per_image_histograms_match_bincount():
+    rng = np.random.default_rng(1)
+    chunk = rng.integers(0, 6, size=(3, 4, 5), dtype=np.uint8)
+    hist = per_image_histograms(chunk, 8)
+    assert hist.shape == (3, 8)
+    for img, row in zip(chunk, hist):
+        assert np.array_equal(row, np.bincount(img.ravel(), minlength=8))
+
+
+def test_dataset_stats_over_a_packed_store(tmp_path):
+    masks = []
+    for i in range(5):
+        mask = np.zeros((10, 10), dtype=np.uint8)
+        mask[:i + 1, :2] = 3     # 2, 4, ... 10 px
+        if i % 2:
+            mask[9, 9] = 8
+        masks.append(mask)
+        cv2.imwrite(str(tmp_path / f"m{i}.png"), mask)
+
+    build_store(tmp_path, tmp_path / "store", shard_size=2)
+    store = LabelStore(tmp_path / "store")
+    assert len(store.shards) == 3
+
+    n, totals, areas, ratios = collect_dataset_stats(store, chunk_size=1)
+    assert n == 5
+    assert totals == {3: 30, 8: 2}
+    assert areas[3].tolist() == [2, 4, 6, 8, 10]
+    assert np.allclose(ratios[8], [0.01, 0.01])
+
+    stats = summarize(n, totals, areas, ratios, {3: "shirt", 5: "hat"}, 5, 0.0)
+    assert stats["classes"]["3"]["images_below_min_area"] == 2
+    assert stats["classes"]["8"]["images_empty"] == 3
+    assert stats["classes"]["5"] == {"label": "hat", "pixels": 0, "images_present": 0, "images_empty": 5}
@@ -0,0 +1,106 @@
+import json
+
+import cv2
+import numpy as np
+import pytest
+
+from label_export import decode_rle, encode_rle
+from organize_masks_annotation import (
+    CocoWriter, build_fusion_lut, convert_polygon_to_yolo_seg, fused_masks, mask_instances, polygon_iou, simplify_contour,
+)
+
+
+def test_fusion_lut_maps_values_to_group_slots():
+    lut = build_fusion_lut({"arm": [3, 4], "leg": [7]})
+    mask = np.array([[0, 3, 4], [7, 5, 3]], dtype=np.uint16)
+    assert lut[mask].tolist() == [[0, 1, 1], [2, 0, 1]]
+
+
+def test_fusion_groups_sharing_a_value_each_get_it(capsys):
+    fusion = {"arm": [3, 4], "hand": [4, 5], "leg": [7]}
+    lut = build_fusion_lut(fusion)
+    assert "arm, hand share pass indices" in capsys.readouterr().out
+    assert lut[[3, 4, 5, 7]].tolist() == [0, 0, 0, 3]
+
+    mask = np.array([[3, 4, 5, 7, 0]], dtype=np.uint16)
+    groups = {label: (m > 0).tolist() for label, m in fused_masks(mask, {0, 3, 4, 5, 7}, fusion, lut)}
+    assert groups == {
+        "arm": [[True, True, False, False, False]],
+        "hand": [[False, True, True, False, False]],
+        "leg": [[False, False, False, True, False]],
+    }
+
+
+def circle_contour(radius=80):
+    mask = np.zeros((200, 200), dtype=np.uint8)
+    cv2.circle(mask, (100, 100), radius, 255, -1)
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_NONE)
+    return contours[0]
+
+
+def test_vertex_budget_stops_at_the_absolute_iou_floor():
+    cnt = circle_contour()
+    loose = simplify_contour(cnt, 0.0005, max_vertices=4, iou_tolerance=0.5)
+    tight = simplify_contour(cnt, 0.0005, max_vertices=4, iou_tolerance=0.02)
+
+    assert len(loose) <= 4
+    assert len(tight) > 4
+    assert polygon_iou(cnt, tight) >= 0.98
+
+
+def test_no_budget_keeps_the_epsilon_polygon():
+    cnt = circle_contour()
+    approx = simplify_contour(cnt, 0.001)
+    assert np.array_equal(approx, cv2.approxPolyDP(cnt, 0.001 * cv2.arcLength(cnt, True), True))
+
+
+def ring_mask():
+    mask = np.zeros((5, 6), dtype=bool)
+    mask[1:4, 1:5] = True
+    mask[2, 2] = False   # hole
+    return mask
+
+
+def test_coco_writer_output_parses_and_rle_round_trips(tmp_path):
+    path = tmp_path / "instances.json"
+    mask = ring_mask()
+    with CocoWriter(path, [{"id": 1, "name": "shirt"}]) as writer:
+        writer.add_image(0, "a.png", 6, 5)
+        writer.add_image(1, "b.png", 6, 5)
+        writer.add_annotation(0, 1, encode_rle(mask), (1, 1, 4, 3), int(mask.sum()))
+        writer.add_annotation(1, 1, encode_rle(mask.T[:5, :5]), (1, 1, 3, 3), 8)
+
+    coco = json.loads(path.read_text())
+    assert [img["file_name"] for img in coco["images"]] == ["a.png", "b.png"]
+    first, second = coco["annotations"]
+    assert (first["id"], second["id"]) == (1, 2)
+    assert first["bbox"] == [1, 1, 4, 3]
+    assert first["segmentation"]["counts"][:6] == [6, 3, 2, 1, 1, 1]   # column-major, through the hole
+    assert np.array_equal(decode_rle(first["segmentation"]), mask)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["instances.json"]
+
+
+def test_failed_run_leaves_no_partial_coco_json(tmp_path):
+    path = tmp_path / "instances.json"
+    with pytest.raises(RuntimeError):
+        with CocoWriter(path, []) as writer:
+            writer.add_image(0, "a.png", 6, 5)
+            raise RuntimeError("mask decode failed")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_yolo_seg_lines_come_from_the_instance_polygons():
+    mask = np.zeros((200, 100), dtype=np.uint8)
+    mask[20:120, 10:60] = 3
+    instances = list(mask_instances(
+        mask, {3: "shirt"}, {}, build_fusion_lut({}), set(),
+        dict(epsilon_ratio=0.001, chain_approx=cv2.CHAIN_APPROX_SIMPLE),
+    ))
+    (label, _, _, _, polygons), = instances
+    assert label == "shirt"
+    assert sorted(polygons[0]) == [(10, 20), (10, 119), (59, 20), (59, 119)]
+
+    coords = [float(c) for c in convert_polygon_to_yolo_seg(polygons[0], 100, 200).split()]
+    assert len(coords) == 8
+    assert sorted(zip(coords[::2], coords[1::2])) == [(0.1, 0.1), (0.1, 0.595), (0.59, 0.1), (0.59, 0.595)]
+    assert list(mask_instances(mask, {3: "shirt"}, {}, build_fusion_lut({}), set()))[0][4] == []
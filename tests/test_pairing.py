@@ -0,0 +1,28 @@
+from pairing import pair_files
+
+
+def entries(*names):
+    return [(name, f"/out/{name}") for name in sorted(names)]
+
+
+def test_duplicate_keeps_highest_frame_and_reports_the_other():
+    groups, unmatched = pair_files(entries(
+        "image&env=e&char=a0001.png",
+        "image&env=e&char=a0002.png",
+        "segmentation-material&env=e&char=a0001.png",
+    ))
+
+    assert groups["env=e&char=a"]["image"].name == "image&env=e&char=a0002.png"
+    assert unmatched == [{"file": "image&env=e&char=a0001.png", "job": "env=e&char=a", "reason": "duplicate image"}]
+
+
+def test_duplicate_with_lower_frame_reports_itself():
+    # scan order is not frame order once names differ before the suffix
+    groups, unmatched = pair_files([
+        ("image&env=e&char=a0003.png", "/out/image&env=e&char=a0003.png"),
+        ("image&env=e&char=a0001.png", "/out/image&env=e&char=a0001.png"),
+    ])
+
+    assert groups["env=e&char=a"]["image"].name == "image&env=e&char=a0003.png"
+    assert {"file": "image&env=e&char=a0001.png", "job": "env=e&char=a",
+            "reason": "duplicate image"} in unmatched
@@ -0,0 +1,285 @@
+import json
+import struct
+
+import numpy as np
+import pytest
+
+from frame_manifest import MANIFEST_NAME, frame_id, load_manifest
+from label_export import load_frame_labels
+from render_sweep import (
+    RenderPass, SweepConfig, count_jobs, dry_run_report, load_done, parse_shard, plan_jobs, print_dry_run, run_sweep,
+    write_synthetic_poses,
+)
+from render_telemetry import Telemetry
+from scene_adapter import FakeScene, SceneAdapter, texture_bytes, texture_file_bytes
+
+PASSES = [
+    RenderPass("main-seg", "segmentation-material", {"mesh-material": True}),
+    RenderPass("main-seg-dup", "image", {"mesh-material": False}),
+]
+OBJECTS = ["main-seg", "main-seg-dup", "mesh-material", "mesh-color"]
+
+
+def make_config(tmp_path, textures=(), poses=2, **kwargs):
+    return SweepConfig(
+        script="test",
+        char="fake",
+        passes=PASSES,
+        texture_mesh="mesh-color",
+        texture_slot="slot",
+        env_textures=["env0.exr"],
+        camera_positions={"cam0": (2.5, -2.5, 1.0), "cam1": (2.5, -2.5, 2.0)},
+        textures=list(textures) or ["tex0.png"],
+        pose_files=write_synthetic_poses(str(tmp_path), poses, 4, "dict"),
+        z_angles=[0, 90],
+        pose_bone_map={i: f"bone_{i:03d}" for i in range(4)},
+        skip_missing_textures=False,
+        seed=0,
+        **kwargs,
+    )
+
+
+def sweep(scene, config, **kwargs):
+    return run_sweep(scene, config, Telemetry(None, "quiet"), **kwargs)
+
+
+def call_names(scene):
+    return [name for name, _ in scene.calls]
+
+
+def write_png_header(path, width, height, depth=8, color=6):
+    ihdr = struct.pack(">IIBBBBB", width, height, depth, color, 0, 0, 0)
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n" + struct.pack(">I", len(ihdr)) + b"IHDR" + ihdr + b"\0\0\0\0")
+    return str(path)
+
+
+# ----------------------------------------------------------
+# Planning, sharding, resume
+# ----------------------------------------------------------
+
+def test_scene_adapter_requires_every_method():
+    class Partial(SceneAdapter):
+        def render(self):
+            pass
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+def test_plan_jobs_follows_the_nested_loop_order(tmp_path):
+    config = make_config(tmp_path, ["tex0.png", "tex1.png"], poses=3)
+    jobs = list(plan_jobs(config))
+
+    assert len(jobs) == count_jobs(config) == 1 * 2 * 2 * 1 * 2 * 3
+    assert [j.index for j in jobs] == list(range(len(jobs)))
+    assert [(j.env, j.cam, j.tex, j.obj_pos, j.rot, j.pose) for j in jobs[:4]] == [
+        (0, 0, 0, 0, 0, 0), (0, 0, 0, 0, 0, 1), (0, 0, 0, 0, 0, 2), (0, 0, 0, 0, 1, 0),
+    ]
+
+
+def test_shards_partition_the_jobs(tmp_path):
+    config = make_config(tmp_path, poses=5)
+    shards = [[j.index for j in plan_jobs(config, i, 3)] for i in range(3)]
+
+    assert sorted(sum(shards, [])) == list(range(count_jobs(config)))
+    assert max(map(len, shards)) - min(map(len, shards)) <= 1
+    assert parse_shard("2/3") == (2, 3)
+    with pytest.raises(ValueError):
+        parse_shard("3/3")
+
+
+def test_sharded_sweeps_render_every_job_once(tmp_path):
+    config = make_config(tmp_path, poses=3)
+    rendered = []
+    for i in range(2):
+        scene = FakeScene(objects=OBJECTS, log=lambda level, msg: None)
+        sweep(scene, config, shard_index=i, shard_count=2)
+        rendered += [paths["segmentation-material"] for paths in scene.rendered if "segmentation-material" in paths]
+
+    assert len(rendered) == len(set(rendered)) == count_jobs(config)
+
+
+def test_done_ledger_resumes_without_rerendering(tmp_path):
+    config = make_config(tmp_path, poses=3)
+    ledger = str(tmp_path / "done.jsonl")
+    first = FakeScene(objects=OBJECTS, log=lambda level, msg: None)
+    assert sweep(first, config, shard_index=0, shard_count=2, done_path=ledger) == 6 * len(PASSES)
+
+    # a restart of the same shard renders nothing, the full sweep only the rest
+    again = FakeScene(objects=OBJECTS, log=lambda level, msg: None)
+    assert sweep(again, config, shard_index=0, shard_count=2, done_path=ledger) == 0
+    rest = FakeScene(objects=OBJECTS, log=lambda level, msg: None)
+    assert sweep(rest, config, done_path=ledger) == (count_jobs(config) - 6) * len(PASSES)
+    assert len(load_done(ledger)) == count_jobs(config)
+
+
+# ----------------------------------------------------------
+# Texture variants
+# ----------------------------------------------------------
+
+def test_texture_file_bytes_reads_png_and_jpeg_headers(tmp_path):
+    assert texture_file_bytes(write_png_header(tmp_path / "a.png", 640, 480)) == texture_bytes(640, 480, 4)
+    assert texture_file_bytes(write_png_header(tmp_path / "b.png", 64, 32, depth=16, color=2)) == \
+        texture_bytes(64, 32, 3, is_float=True)
+
+    jpeg = tmp_path / "c.jpg"
+    app0 = b"\xff\xe0" + struct.pack(">H", 16) + b"JFIF\0" + bytes(9)
+    sof0 = b"\xff\xc0" + struct.pack(">HBHHB", 17, 8, 300, 200, 3) + bytes(9)
+    jpeg.write_bytes(b"\xff\xd8" + app0 + sof0)
+    assert texture_file_bytes(str(jpeg)) == texture_bytes(200, 300, 3)
+
+    (tmp_path / "d.exr").write_bytes(b"v/1\x01" + bytes(32))
+    assert texture_file_bytes(str(tmp_path / "d.exr")) is None
+
+
+def test_variants_are_switched_and_released_at_sweep_end(tmp_path):
+    textures = [write_png_header(tmp_path / f"t{i}.png", 256, 256) for i in range(3)]
+    scene = FakeScene(objects=OBJECTS, log=lambda level, msg: None)
+    sweep(scene, make_config(tmp_path, textures, texture_budget_mb=1))
+
+    names = call_names(scene)
+    assert names.count("prepare_texture_variants") == 1
+    assert "set_mesh_texture" not in names
+    assert names.count("set_texture_variant") == 3 * 2  # per tex change, under each camera
+    assert names[-1] == "release_texture_variants"
+    assert scene.variants == {}
+
+
+def test_budget_is_checked_on_headers_before_loading(tmp_path):
+    textures = [write_png_header(tmp_path / f"t{i}.png", 2048, 2048) for i in range(2)]  # 16 MB each
+    scene = FakeScene(objects=OBJECTS, log=lambda level, msg: None)
+    sweep(scene, make_config(tmp_path, textures, texture_budget_mb=20))
+
+    names = call_names(scene)
+    assert "prepare_texture_variants" not in names
+    assert "release_texture_variants" not in names
+    assert names.count("set_mesh_texture") == 2 * 2
+
+
+def test_over_budget_after_loading_releases_the_variants(tmp_path):
+    textures = []
+    for i in range(2):
+        (tmp_path / f"t{i}.exr").write_bytes(b"v/1\x01")
+        textures.append(str(tmp_path / f"t{i}.exr"))
+    scene = FakeScene(objects=OBJECTS, log=lambda level, msg: None,
+                      texture_sizes={p: 16 * 2**20 for p in textures})
+    sweep(scene, make_config(tmp_path, textures, texture_budget_mb=20))
+
+    names = call_names(scene)
+    assert names.index("prepare_texture_variants") < names.index("release_texture_variants")
+    assert names.index("release_texture_variants") < names.index("set_mesh_texture")
+    assert "set_texture_variant" not in names
+    assert scene.variants == {}
+
+
+# ----------------------------------------------------------
+# Label export and quality gate
+# ----------------------------------------------------------
+
+def test_label_pass_is_exported_per_job(tmp_path):
+    out = tmp_path / "out"
+    out.mkdir()
+    scene = FakeScene(objects=OBJECTS, log=lambda level, msg: None, out_dir=str(out))
+    config = make_config(tmp_path, export_labels=True, quality_gate=True)
+
+    assert sweep(scene, config) == count_jobs(config) * len(PASSES)
+    exported = sorted(out.glob("*.labels.json"))
+    assert len(exported) == count_jobs(config)
+    assert np.array_equal(load_frame_labels(str(exported[0])), scene.index_pass)
+    assert not (out / "rejected").exists()
+
+
+def test_quality_gate_rejects_and_skips_remaining_passes(tmp_path):
+    out = tmp_path / "out"
+    out.mkdir()
+    empty = np.zeros((24, 16), dtype=np.uint8)
+    scene = FakeScene(objects=OBJECTS, log=lambda level, msg: None, out_dir=str(out), index_pass=empty)
+    config = make_config(tmp_path, quality_gate=True)
+
+    assert sweep(scene, config) == count_jobs(config)  # label pass only
+    rejected = [json.loads(line) for line in (out / "rejected" / "rejected.jsonl").read_text().splitlines()]
+    assert len(rejected) == count_jobs(config)
+    assert any(r.startswith("foreground") for r in rejected[0]["reasons"])
+    assert not list(out.glob("*.labels.json"))
+
+
+# ----------------------------------------------------------
+# Frame manifest
+# ----------------------------------------------------------
+
+def test_manifest_records_every_rendered_job(tmp_path):
+    out = tmp_path / "out"
+    config = make_config(tmp_path, poses=3)
+    ledger = str(tmp_path / "done.jsonl")
+    sweep(FakeScene(objects=OBJECTS, log=lambda level, msg: None), config,
+          shard_index=0, shard_count=2, done_path=ledger)
+
+    # resumed run: the manifest path comes from the output dir, not the first rendered job
+    scene = FakeScene(objects=OBJECTS, log=lambda level, msg: None, out_dir=str(out))
+    sweep(scene, config, done_path=ledger)
+
+    records = load_manifest(str(out / MANIFEST_NAME))
+    assert len(records) == count_jobs(config) - 6
+    for fid, rec in records.items():
+        assert fid == frame_id(rec["job"], config.seed)
+        assert set(rec["files"]) == {p.output_node for p in PASSES}
+
+
+# ----------------------------------------------------------
+# Placement
+# ----------------------------------------------------------
+
+def test_placement_is_checked_once_per_placement_and_pose(tmp_path):
+    class CountingScene(FakeScene):
+        checks = 0
+
+        def armature_points(self, armature_name):
+            self.checks += 1
+            return super().armature_points(armature_name)
+
+    config = make_config(tmp_path, poses=3, object_positions_relative={"near": (0.2, 0.2, 0.1)},
+                         min_visible_fraction=0.5)
+    scene = CountingScene(objects=OBJECTS, log=lambda level, msg: None)
+    sweep(scene, config)
+
+    assert scene.checks == count_jobs(config) // len(config.z_angles)
+    located = [args for name, args in scene.calls if name == "set_object_location"]
+    assert located and all(len(args[1]) == 3 for args in located)
+
+
+# ----------------------------------------------------------
+# Dry run
+# ----------------------------------------------------------
+
+def test_dry_run_counts_and_estimates_from_telemetry(tmp_path):
+    config = make_config(tmp_path, export_labels=True)
+    telemetry_path = str(tmp_path / "render.jsonl")
+    telemetry = Telemetry(telemetry_path, "quiet")
+    scene = FakeScene(objects=OBJECTS, log=lambda level, msg: None, out_dir=str(tmp_path))
+    run_sweep(scene, config, telemetry)
+    telemetry.close()
+
+    outputs = tmp_path / "outputs"
+    outputs.mkdir()
+    (outputs / "image_0123456789abcdef_0001.png").write_bytes(bytes(3000))
+    (outputs / "image_fedcba9876543210_0001.png").write_bytes(bytes(1000))
+
+    report = dry_run_report(config, telemetry_path, str(outputs), shard_count=4)
+    jobs = count_jobs(config)
+    assert (report["jobs"], report["renders"]) == (jobs, jobs * len(PASSES))
+    assert report["renders_per_shard"] == -(-jobs * len(PASSES) // 4)
+    assert report["files"] == {"segmentation-material": jobs, "image": jobs, "labels.json": jobs}
+    assert report["bytes_per_file"]["image"] == 2000  # sampled; the mask node falls back to the per-px default
+    assert report["telemetry_frames"] == jobs * len(PASSES)
+    assert report["render_seconds"]["mean"] >= 0
+    assert report["missing"]["texture"] == ["tex0.png"]
+    assert not print_dry_run(report)  # missing textures are required without skip_missing_textures
+
+
+def test_dry_run_without_history_uses_default_sizes(tmp_path):
+    config = make_config(tmp_path)
+    report = dry_run_report(config)
+    assert report["render_seconds"] is None
+    assert report["bytes_per_file"]["image"] == 1.5 * 1024 * 1024
+    assert report["bytes_per_file_source"] == "estimated at 1024×1024"
@@ -0,0 +1,50 @@
+import pytest
+
+from render_telemetry import Telemetry, load_records, parse_peak_memory, percentile, summarize
+
+
+def record(ts, frame_s, **phases):
+    return {"ts": ts, "frame_s": frame_s, "phases": phases, "peak_rss_mb": 100.0, "render_peak_mb": None}
+
+
+def test_parse_peak_memory_units():
+    assert parse_peak_memory("Fra:1 Mem:512.3M, Peak:1.5G | Time:00:01") == 1536.0
+    assert parse_peak_memory("Mem:1M, Peak:512K") == 0.5
+    assert parse_peak_memory("Mem:1M") is None
+
+
+def test_summarize_throughput_and_phase_percentiles():
+    records = [record(10.0 + i, 1.0, render=0.5 + i, pose=0.1) for i in range(10)]
+    records[3]["render_peak_mb"] = 2048.0
+    summary = summarize(records)
+
+    assert summary["frames"] == 10
+    assert summary["wall_s"] == pytest.approx(10.0)
+    assert summary["frames_per_hour"] == pytest.approx(3600.0)
+    assert summary["render_peak_mb"] == 2048.0
+    render = summary["phases"]["render"]
+    assert (render["count"], render["p50"], render["max"]) == (10, 4.5, 9.5)
+    assert render["mean"] == pytest.approx(5.0)
+    assert summary["phases"]["frame"]["p99"] == 1.0
+    assert summarize([]) == {"frames": 0}
+    assert percentile([], 0.5) == 0.0
+
+
+def test_phases_are_summed_per_frame_and_written_as_jsonl(tmp_path):
+    path = tmp_path / "logs" / "render.jsonl"
+    telemetry = Telemetry(str(path), "quiet", {"script": "test"})
+    for _ in range(2):
+        with telemetry.phase("pose"):
+            pass
+    telemetry.on_render_stats("Mem:10M, Peak:20M")
+    telemetry.end_frame(pose="p0")
+    with telemetry.phase("render"):
+        pass
+    telemetry.end_frame(pose="p1")
+    telemetry.close()
+
+    first, second = load_records(str(path))
+    assert set(first["phases"]) == {"pose"}
+    assert (first["script"], first["pose"], first["render_peak_mb"]) == ("test", "p0", 20.0)
+    assert set(second["phases"]) == {"render"}
+    assert second["render_peak_mb"] is None
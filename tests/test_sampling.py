@@ -0,0 +1,35 @@
+import numpy as np
+
+from sampling import SweepSampler, relative_jitter, truncated_normal
+
+CAMERAS = [(2.5, -2.5, 1.0), (2.5, -2.5, 2.0)]
+OBJECTS = [(0.2, 0.2, 0.1), (0.4, 0.4, 0.2)]
+
+
+def test_truncated_normal_with_zero_limit_returns_zeros():
+    rng = np.random.default_rng(0)
+    assert not truncated_normal(rng, (4, 3), 0.0).any()
+    assert np.array_equal(relative_jitter(rng, [1.0, 2.0, 3.0], 0.1, 0.0), [1.0, 2.0, 3.0])
+
+
+def test_noise_stays_within_clamp():
+    sampler = SweepSampler(7, 3, CAMERAS, 2, OBJECTS, camera_sigma_ratio=0.1, camera_clamp_ratio=0.2)
+    bases = np.broadcast_to(np.asarray(CAMERAS), sampler.camera.shape)
+    assert (np.abs(sampler.camera - bases) <= 0.2 * np.abs(bases) + 1e-12).all()
+
+
+def test_draws_do_not_shift_when_the_sweep_grows():
+    small = SweepSampler(7, 1, CAMERAS[:1], 1, OBJECTS[:1])
+    large = SweepSampler(7, 2, CAMERAS, 3, OBJECTS)
+
+    assert np.array_equal(small.camera[0, 0], large.camera[0, 0])
+    assert np.array_equal(small.objects[0, 0, 0, 0], large.objects[0, 0, 0, 0])
+    assert not np.array_equal(large.camera[0, 0], large.camera[1, 0])
+
+
+def test_same_seed_same_noise():
+    a = SweepSampler(3, 2, CAMERAS, 2, OBJECTS)
+    b = SweepSampler(3, 2, CAMERAS, 2, OBJECTS)
+    c = SweepSampler(4, 2, CAMERAS, 2, OBJECTS)
+    assert np.array_equal(a.objects, b.objects)
+    assert not np.array_equal(a.objects, c.objects)
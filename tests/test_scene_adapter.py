@@ -0,0 +1,90 @@
+import sys
+import types
+
+import pytest
+
+from render_sweep import RenderPass, SweepConfig, run_sweep, scene_requirements
+from render_telemetry import Telemetry
+from scene_adapter import BpyScene, FakeScene
+
+
+class Recorder:
+    """Stand-in bpy object that counts attribute writes."""
+
+    def __init__(self, **attrs):
+        self.__dict__.update(attrs)
+        self.__dict__["writes"] = 0
+
+    def __setattr__(self, name, value):
+        self.__dict__["writes"] += 1
+        self.__dict__[name] = value
+
+
+class Lookups(dict):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.gets = 0
+
+    def get(self, key, default=None):
+        self.gets += 1
+        return super().get(key, default)
+
+
+def file_output(name):
+    return Recorder(name=name, type="OUTPUT_FILE", mute=False, file_slots=[types.SimpleNamespace(path="")])
+
+
+@pytest.fixture
+def bpy_scene(monkeypatch):
+    scene = Recorder(
+        objects=Lookups({"body": Recorder(hide_render=False, hide_viewport=False)}),
+        node_tree=types.SimpleNamespace(nodes=[file_output("image"), file_output("mask"),
+                                               types.SimpleNamespace(name="Composite", type="COMPOSITE")]),
+        camera=object(),
+        use_nodes=False,
+    )
+    monkeypatch.setitem(sys.modules, "bpy", types.SimpleNamespace(context=types.SimpleNamespace(scene=scene)))
+    monkeypatch.setitem(sys.modules, "mathutils", types.SimpleNamespace())
+    return BpyScene(log=lambda level, msg: None), scene
+
+
+def test_bind_resolves_handles_once_and_reports_missing(bpy_scene):
+    adapter, scene = bpy_scene
+    missing = adapter.bind(["body", "body", "hat"], ["image", "depth"])
+    assert missing == ["object 'hat'", "File Output node 'depth'"]
+    assert set(adapter.file_outputs) == {"image", "mask"}
+
+    gets = scene.objects.gets
+    for _ in range(3):
+        adapter.set_visibility("body", False)
+    assert scene.objects.gets == gets
+    assert scene.objects["body"].writes == 2   # hidden once, then no-op writes are skipped
+
+    scene.node_tree.nodes = []                 # per-frame calls no longer scan the node tree
+    adapter.toggle_output_nodes("mask")
+    assert adapter.set_output_paths(lambda node: f"{node}_x_") == {"mask": "mask_x_"}
+    adapter.toggle_output_nodes("mask")
+    assert adapter.file_outputs["image"].writes == 1
+
+
+def make_config(**kwargs):
+    return SweepConfig(
+        script="test", char="fake",
+        passes=[RenderPass("body", "image", {"hat": False})],
+        texture_mesh="mesh", texture_slot="slot",
+        env_textures=["env.exr"], camera_positions={"cam": (1.0, 1.0, 1.0)},
+        textures=["tex.png"], pose_files=["pose.json"], z_angles=[0],
+        pose_bone_map={}, skip_missing_textures=True, seed=0, name_format="meta",
+        **kwargs,
+    )
+
+
+def test_missing_scene_handles_abort_unless_relaxed():
+    config = make_config()
+    assert scene_requirements(config) == (["body", "hat"], ["image"])
+
+    with pytest.raises(ValueError, match="Scene is missing object 'hat'"):
+        run_sweep(FakeScene(objects=["body"], log=lambda level, msg: None), config, Telemetry(None, "quiet"))
+
+    relaxed = make_config(strict_scene=False)
+    assert run_sweep(FakeScene(objects=["body"], log=lambda level, msg: None), relaxed, Telemetry(None, "quiet")) == 1
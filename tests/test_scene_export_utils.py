@@ -0,0 +1,78 @@
+import importlib
+import sys
+import types
+
+import numpy as np
+import pytest
+
+
+class Collection(list):
+    """bpy_prop_collection stand-in: foreach_get flattens matrices column-major like Blender."""
+
+    def foreach_get(self, attr, buf):
+        values = [np.asarray(getattr(item, attr), dtype=np.float32).T.ravel() for item in self]
+        if values:
+            buf[:] = np.concatenate(values)
+
+
+def make_object(name, type="EMPTY", bones=()):
+    obj = types.SimpleNamespace(
+        name=name, type=type, parent=None, data=None, modifiers=[], material_slots=[],
+        matrix_world=np.eye(4), location=[0.0, 0.0, 0.0], rotation_euler=[0.0, 0.0, 0.0], scale=[1.0, 1.0, 1.0],
+    )
+    if type == "ARMATURE":
+        obj.pose = types.SimpleNamespace(bones=Collection(
+            types.SimpleNamespace(name=b, matrix=np.eye(4), location=[0.0] * 3,
+                                  rotation_quaternion=[1.0, 0.0, 0.0, 0.0], rotation_euler=[0.0] * 3, scale=[1.0] * 3)
+            for b in bones
+        ))
+    return obj
+
+
+@pytest.fixture
+def scene(monkeypatch):
+    objects = [make_object("cam"), make_object("arm", "ARMATURE", ["b0", "b1"]), make_object("box")]
+    bpy = types.SimpleNamespace(data=types.SimpleNamespace(objects=Collection(objects)))
+    monkeypatch.setitem(sys.modules, "bpy", bpy)
+    monkeypatch.delitem(sys.modules, "scene_export_utils", raising=False)
+    return importlib.import_module("scene_export_utils"), objects
+
+
+def test_only_changed_exports_chain_deltas(scene, tmp_path):
+    se, (cam, arm, box) = scene
+    assert se.save_scene_bulk(str(tmp_path), only_changed=True) == 3
+
+    cam.matrix_world = np.diag([2.0, 2.0, 2.0, 1.0])
+    cam.location = [1.0, 2.0, 3.0]
+    assert se.save_scene_bulk(str(tmp_path), only_changed=True) == 1
+    assert se.save_scene_bulk(str(tmp_path), only_changed=True) == 0   # nothing new, no file
+    arm.pose.bones[1].matrix = np.diag([3.0, 3.0, 3.0, 1.0])
+    arm.pose.bones[1].matrix[0, 3] = 0.5                                # row-major translation
+    assert se.save_scene_bulk(str(tmp_path), only_changed=True) == 1
+
+    index, arrays = se.load_scene_bulk(str(tmp_path))
+    assert index["arrays"] == ["scene.npz", "scene.0001.npz", "scene.0002.npz"]
+    assert index["unchanged"] == ["cam", "box"]
+    assert arrays["object_names"].tolist() == ["cam", "arm", "box"]
+    assert arrays["object_location"][0].tolist() == [1.0, 2.0, 3.0]
+    assert arrays["object_matrix_world"].shape == (3, 4, 4)
+    assert np.array_equal(arrays["armature0_matrix"][1], arm.pose.bones[1].matrix)
+    assert arrays["armature0_bone_names"].tolist() == ["b0", "b1"]
+
+
+def test_full_export_matches_the_replayed_chain_and_drops_deltas(scene, tmp_path):
+    se, (cam, arm, box) = scene
+    se.save_scene_bulk(str(tmp_path), only_changed=True)
+    box.location = [0.0, 0.0, 5.0]
+    box.matrix_world = np.eye(4)
+    box.matrix_world[2, 3] = 5.0
+    se.save_scene_bulk(str(tmp_path), only_changed=True)
+    _, chained = se.load_scene_bulk(str(tmp_path))
+
+    se.save_scene_bulk(str(tmp_path))
+    index, full = se.load_scene_bulk(str(tmp_path))
+    assert index["arrays"] == ["scene.npz"]
+    assert not (tmp_path / "scene.0001.npz").exists()
+    assert set(full) == set(chained)
+    for key in full:
+        assert np.array_equal(full[key], chained[key]), key
@@ -0,0 +1,86 @@
+import json
+import os
+
+from frame_manifest import MANIFEST_NAME, frame_record, output_name
+from uploader import LEDGER_NAME, LocalBackend, run_uploader
+
+NODES = ("image", "segmentation-material")
+
+
+def quiet(*args):
+    pass
+
+
+def add_frame(src, fid, write=NODES, rejected=False):
+    """Append a manifest record for fid and write the outputs of `write`."""
+    files = {node: f"{output_name(node, fid)}0001.png" for node in NODES}
+    for node in write:
+        with open(os.path.join(src, files[node]), "wb") as f:
+            f.write(fid.encode())
+    record = frame_record(fid, f"env=e&char={fid}", {"env": "e"}, 0, (0.0, 0.0, 1.0), files=files)
+    if rejected:
+        record["rejected"] = True
+    with open(os.path.join(src, MANIFEST_NAME), "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+    return files
+
+
+def uploaded_names(dest):
+    return sorted(os.listdir(dest)) if os.path.isdir(dest) else []
+
+
+def test_only_complete_frames_are_uploaded(tmp_path):
+    src, dest = tmp_path / "src", tmp_path / "dest"
+    src.mkdir()
+    done = add_frame(src, "00000000000000a1")
+    add_frame(src, "00000000000000b2", write=("image",))
+
+    uploaded, failed, _ = run_uploader(str(src), LocalBackend(str(dest)), log=quiet)
+
+    assert failed == 0
+    assert uploaded == 3
+    assert uploaded_names(dest) == sorted([*done.values(), MANIFEST_NAME])
+
+
+def test_ledger_skips_uploaded_files_on_restart(tmp_path):
+    src, dest = tmp_path / "src", tmp_path / "dest"
+    src.mkdir()
+    add_frame(src, "00000000000000a1")
+    assert run_uploader(str(src), LocalBackend(str(dest)), log=quiet)[0] == 3
+    assert run_uploader(str(src), LocalBackend(str(dest)), log=quiet) == (0, 0, 0)
+
+    new = add_frame(src, "00000000000000c3")
+    uploaded, _, _ = run_uploader(str(src), LocalBackend(str(dest)), log=quiet)
+
+    # the two new outputs plus the grown manifest
+    assert uploaded == 3
+    assert set(new.values()) <= set(uploaded_names(dest))
+    with open(src / LEDGER_NAME, encoding="utf-8") as f:
+        keys = [json.loads(line)["key"] for line in f]
+    assert keys.count(MANIFEST_NAME) == 2
+    assert len(keys) == 6
+
+
+def test_rejected_frames_are_not_uploaded(tmp_path):
+    src, dest = tmp_path / "src", tmp_path / "dest"
+    src.mkdir()
+    kept = add_frame(src, "00000000000000a1")
+    rejected = add_frame(src, "00000000000000d4", rejected=True)
+
+    run_uploader(str(src), LocalBackend(str(dest)), log=quiet)
+
+    names = uploaded_names(dest)
+    assert set(kept.values()) <= set(names)
+    assert not set(rejected.values()) & set(names)
+
+
+def test_pairs_without_manifest_wait_for_settle(tmp_path):
+    src, dest = tmp_path / "src", tmp_path / "dest"
+    src.mkdir()
+    for name in ("image&env=e&char=a0001.png", "segmentation-material&env=e&char=a0001.png",
+                 "image&env=e&char=b0001.png"):
+        (src / name).write_bytes(b"x")
+
+    assert run_uploader(str(src), LocalBackend(str(dest)), settle=3600, log=quiet)[0] == 0
+    assert run_uploader(str(src), LocalBackend(str(dest)), settle=0, log=quiet)[0] == 2
+    assert uploaded_names(dest) == ["image&env=e&char=a0001.png", "segmentation-material&env=e&char=a0001.png"]
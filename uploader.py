@@ -0,0 +1,318 @@
+import argparse
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from frame_manifest import MANIFEST_NAME
+from pairing import pair_files, scan_outputs
+
+# Upload stage for render outputs (replaces `mc mirror --watch`):
+#   - only complete frames: every file of a frames.jsonl record (written after
+#     the last pass of the frame), or complete image/mask pairs older than
+#     --settle seconds for outputs without a manifest; rejected frames are
+#     skipped, and --require-labels also waits for the .labels.json
+#   - upload ledger (JSONL next to the outputs): a file is uploaded again only
+#     if its size or mtime changed, so restarts resume instead of re-uploading
+#   - backends: LocalBackend (directory, also the stand-in for testing) and
+#     MinioBackend (multipart fput_object, `pip install minio`)
+#
+#   python uploader.py --src /tmp/blender-outputs --dest minio://public/shared/blender-outputs/characters-images-masks --watch
+#   python uploader.py --src /tmp/blender-outputs --dest /tmp/upload-standin
+
+LEDGER_NAME = "uploaded.jsonl"
+UPLOAD_WORKERS = 8
+PART_SIZE_MB = 16
+SETTLE_SECONDS = 10.0
+WATCH_INTERVAL = 5.0
+
+
+# ----------------------------------------------------------
+# Backends
+# ----------------------------------------------------------
+
+class LocalBackend:
+    """Copies into a directory (write to a temp name, then rename)."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def upload(self, path, key):
+        dest = os.path.join(self.root, key)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        tmp = f"{dest}.part"
+        shutil.copyfile(path, tmp)
+        os.replace(tmp, dest)
+
+    def __repr__(self):
+        return f"LocalBackend({self.root})"
+
+
+class MinioBackend:
+    """
+    S3 / MinIO bucket through the minio SDK; objects larger than part_size
+    are sent as multipart uploads with num_parallel_uploads parts in flight.
+    """
+
+    def __init__(self, bucket, prefix="", part_size=PART_SIZE_MB * 1024 * 1024, parallel_parts=3):
+        self.client = minio_client_from_env()
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.part_size = part_size
+        self.parallel_parts = parallel_parts
+
+    def upload(self, path, key):
+        name = f"{self.prefix}/{key}" if self.prefix else key
+        self.client.fput_object(
+            self.bucket, name, path,
+            part_size=self.part_size, num_parallel_uploads=self.parallel_parts,
+        )
+
+    def __repr__(self):
+        return f"MinioBackend({self.bucket}/{self.prefix})"
+
+
+def minio_client_from_env():
+    """Client for the RUNPOD_SECRET_MINIO_* variables set on the pod (see runpod.sh)."""
+    from minio import Minio
+    host = os.environ["RUNPOD_SECRET_MINIO_HOST"]
+    secure = host.startswith("https://")
+    host = host.split("://", 1)[-1]
+    port = os.environ.get("RUNPOD_SECRET_MINIO_PORT")
+    return Minio(
+        f"{host}:{port}" if port else host,
+        access_key=os.environ["RUNPOD_SECRET_MINIO_USER"],
+        secret_key=os.environ["RUNPOD_SECRET_MINIO_SECRET"],
+        secure=secure,
+    )
+
+
+def split_minio_url(url):
+    """minio://bucket/prefix → (bucket, prefix)."""
+    bucket, _, prefix = url[len("minio://"):].partition("/")
+    return bucket, prefix.strip("/")
+
+
+def backend_from_dest(dest, part_size_mb=PART_SIZE_MB):
+    """minio://bucket/prefix or a local directory."""
+    if dest.startswith("minio://"):
+        return MinioBackend(*split_minio_url(dest), part_size_mb * 1024 * 1024)
+    return LocalBackend(dest)
+
+
+# ----------------------------------------------------------
+# Ledger
+# ----------------------------------------------------------
+
+class UploadLedger:
+    """key → (size, mtime_ns) of the last successful upload."""
+
+    def __init__(self, path):
+        self.path = path
+        self.uploaded = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        rec = json.loads(line)
+                        self.uploaded[rec["key"]] = (rec["size"], rec["mtime_ns"])
+        self.f = open(path, "a", encoding="utf-8", buffering=1)
+
+    def is_current(self, key, st):
+        return self.uploaded.get(key) == (st.st_size, st.st_mtime_ns)
+
+    def mark(self, key, st):
+        self.uploaded[key] = (st.st_size, st.st_mtime_ns)
+        self.f.write(json.dumps({
+            "key": key, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "ts": time.time()
+        }) + "\n")
+
+    def close(self):
+        self.f.close()
+
+
+# ----------------------------------------------------------
+# Completed frames
+# ----------------------------------------------------------
+
+class ManifestTail:
+    """Reads the records appended to frames.jsonl since the previous call."""
+
+    def __init__(self, path):
+        self.path = path
+        self.offset = 0
+
+    def read_new(self):
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, "rb") as f:
+            f.seek(self.offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1  # a record still being written stays for the next call
+        self.offset += end
+        return [json.loads(line) for line in data[:end].splitlines() if line.strip()]
+
+
+def labels_name(filename):
+    return f"{os.path.splitext(filename)[0]}.labels.json"
+
+
+def manifest_frame_files(src, record, label_node=None, require_labels=False):
+    """Files of a finished frame, or None if one is missing."""
+    if record.get("rejected"):
+        return []
+    names = list(record["files"].values())
+    if label_node in record["files"]:
+        labels = labels_name(record["files"][label_node])
+        if os.path.exists(os.path.join(src, labels)):
+            names.append(labels)
+        elif require_labels:
+            return None
+    paths = [os.path.join(src, n) for n in names]
+    return paths if all(os.path.exists(p) for p in paths) else None
+
+
+def settled_pair_files(src, settle=SETTLE_SECONDS, uploaded=()):
+    """
+    Complete image/mask pairs of outputs without a manifest, untouched for
+    `settle` s; pairs whose names are all in `uploaded` are not stat'ed again.
+    """
+    groups, _ = pair_files(scan_outputs(src))
+    now = time.time()
+    files = []
+    for entry in groups.values():
+        if entry["image"] is None or entry["mask"] is None:
+            continue
+        if entry["image"].name in uploaded and entry["mask"].name in uploaded:
+            continue
+        pair = [str(entry["image"]), str(entry["mask"])]
+        try:
+            if all(now - os.stat(p).st_mtime >= settle for p in pair):
+                files.extend(pair)
+        except FileNotFoundError:
+            continue
+    return files
+
+
+# ----------------------------------------------------------
+# Upload loop
+# ----------------------------------------------------------
+
+def upload_files(backend, ledger, paths, src, workers=UPLOAD_WORKERS, log=print, recheck=False):
+    """
+    Upload the paths not yet in the ledger (with recheck, also the ones
+    whose size / mtime changed). Returns (uploaded, failed, bytes).
+    """
+    todo = []
+    for path in paths:
+        key = os.path.relpath(path, src).replace(os.sep, "/")
+        if key in ledger.uploaded and not recheck:
+            continue
+        st = os.stat(path)
+        if not ledger.is_current(key, st):
+            todo.append((path, key, st))
+
+    uploaded = failed = nbytes = 0
+    if not todo:
+        return uploaded, failed, nbytes
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(backend.upload, path, key): (path, key, st) for path, key, st in todo}
+        for fut in as_completed(futures):
+            path, key, st = futures[fut]
+            try:
+                fut.result()
+            except Exception as e:
+                failed += 1
+                log(f"❌ Upload failed for {key}: {e}")
+                continue
+            ledger.mark(key, st)
+            uploaded += 1
+            nbytes += st.st_size
+    return uploaded, failed, nbytes
+
+
+def run_uploader(src, backend, ledger_path=None, workers=UPLOAD_WORKERS, watch=False,
+                 interval=WATCH_INTERVAL, settle=SETTLE_SECONDS, label_node="segmentation-material",
+                 require_labels=False, log=print):
+    """
+    One pass (or a loop with watch) over src. Frames of the manifest are
+    retried on later passes until all their files exist.
+    """
+    ledger = UploadLedger(ledger_path or os.path.join(src, LEDGER_NAME))
+    manifest_path = os.path.join(src, MANIFEST_NAME)
+    tail = ManifestTail(manifest_path)
+    pending = []
+    totals = [0, 0, 0]
+    log(f"☁️ Uploading {src} → {backend} ({len(ledger.uploaded)} files in ledger)")
+    try:
+        while True:
+            t0 = time.perf_counter()
+            pending.extend(tail.read_new())
+            paths = []
+            if os.path.exists(manifest_path):
+                waiting = []
+                for record in pending:
+                    files = manifest_frame_files(src, record, label_node, require_labels)
+                    if files is None:
+                        waiting.append(record)
+                    else:
+                        paths.extend(files)
+                pending = waiting
+            else:
+                paths = settled_pair_files(src, settle, ledger.uploaded)
+
+            stats = upload_files(backend, ledger, paths, src, workers, log)
+            if os.path.exists(manifest_path):
+                # the manifest grows with every frame: re-sent after each pass
+                # that changed it, so the bucket never lags a whole run behind
+                manifest_stats = upload_files(backend, ledger, [manifest_path], src, workers, log, recheck=True)
+                stats = tuple(a + b for a, b in zip(stats, manifest_stats))
+            totals = [a + b for a, b in zip(totals, stats)]
+            elapsed = time.perf_counter() - t0
+            if stats[0] or stats[1]:
+                log(f"⬆️ {stats[0]} files ({stats[2] / 1e6:.1f} MB) in {elapsed:.2f}s, "
+                    f"{stats[1]} failed, {len(pending)} frames incomplete")
+            if not watch:
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        log("⏹️ Stopped")
+    finally:
+        ledger.close()
+    return tuple(totals)
+
+
+# ----------------------------------------------------------
+# Main
+# ----------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Upload completed render outputs with a resume ledger")
+    parser.add_argument("--src", required=True, help="Render output directory")
+    parser.add_argument("--dest", required=True, help="minio://bucket/prefix or a local directory")
+    parser.add_argument("--ledger", required=False, help=f"Upload ledger (default: <src>/{LEDGER_NAME})")
+    parser.add_argument("--workers", type=int, default=UPLOAD_WORKERS, help="Concurrent file uploads")
+    parser.add_argument("--part-size-mb", type=int, default=PART_SIZE_MB, help="Multipart part size (MinIO)")
+    parser.add_argument("--watch", action="store_true", help="Keep polling for new frames")
+    parser.add_argument("--interval", type=float, default=WATCH_INTERVAL)
+    parser.add_argument("--settle", type=float, default=SETTLE_SECONDS,
+                        help="Min file age without a manifest (half-written PNGs)")
+    parser.add_argument("--require-labels", action="store_true",
+                        help="Wait for the .labels.json of each mask (exportLabelsInBlender)")
+    args = parser.parse_args()
+
+    backend = backend_from_dest(args.dest, args.part_size_mb)
+    t0 = time.perf_counter()
+    uploaded, failed, nbytes = run_uploader(
+        args.src, backend, args.ledger, args.workers, args.watch, args.interval,
+        args.settle, require_labels=args.require_labels,
+    )
+    elapsed = time.perf_counter() - t0
+    print(f"✅ {uploaded} files ({nbytes / 1e6:.1f} MB) uploaded in {elapsed:.2f}s, {failed} failed")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
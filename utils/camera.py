@@ -1,6 +1,13 @@
 import bpy
 import math
-import random 
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root: blender -P does not add it
+from sampling import relative_jitter
+
+# Noise helpers take an np.random.Generator (np.random.default_rng(seed),
+# or sampling.job_rng for per-job streams) so every draw can be replayed.
 
 def set_camera_rotation(rotation_tuple):
     cam = bpy.context.scene.camera
@@ -10,80 +17,42 @@ def set_camera_rotation(rotation_tuple):
     else:
         print("⚠️ No active camera found.")
 
-def add_camera_variance(base_rot, variance_ratio=0.10):
+def add_camera_variance(rng, base_rot, variance_ratio=0.10):
     """
-    Adds up to ±variance_ratio (default ±10%) noise to each Euler axis.
+    Adds up to ±variance_ratio (default ±10%) uniform noise to each Euler axis.
     base_rot is a tuple (x, y, z) in radians.
     Returns a new tuple with randomized offsets.
     """
-    noisy = []
-    for angle in base_rot:
-        max_delta = abs(angle) * variance_ratio
-        delta = random.uniform(-max_delta, max_delta)
-        noisy.append(angle + delta)
-    return tuple(noisy)
+    return _uniform_variance(rng, base_rot, variance_ratio)
 
-def add_camera_gaussian_noise(base_rot, sigma_ratio=0.05, clamp_ratio=0.15):
+def add_camera_gaussian_noise(rng, base_rot, sigma_ratio=0.05, clamp_ratio=0.15):
     """
-    Adds Gaussian noise to each Euler axis.
+    Adds Gaussian noise to each Euler axis (sampling.relative_jitter).
     - sigma_ratio: standard deviation as a fraction of the base rotation (default = 5%)
-    - clamp_ratio: hard cap to limit extreme values (default = ±15%)
+    - clamp_ratio: truncation bound, tails are resampled (default = ±15%)
 
-    If a rotation axis is zero, σ becomes a small constant so we still allow noise.
+    If a rotation axis is zero, 1.0 is used as reference so we still allow noise.
     """
-    noisy = []
-    for angle in base_rot:
-        # avoid zero-variance when angle = 0
-        angle_abs = abs(angle) if abs(angle) > 1e-6 else 1.0
-
-        sigma = angle_abs * sigma_ratio
-        clamp = angle_abs * clamp_ratio
-
-        # Gaussian noise centered on 0
-        delta = random.gauss(0, sigma)
-
-        # Limit extreme noise
-        delta = max(-clamp, min(clamp, delta))
-
-        noisy.append(angle + delta)
+    return tuple(relative_jitter(rng, base_rot, sigma_ratio, clamp_ratio).tolist())
 
-    return tuple(noisy)
-
-def add_camera_position_variance(base_loc, variance_ratio=0.10):
+def add_camera_position_variance(rng, base_loc, variance_ratio=0.10):
     """
-    Adds up to ±variance_ratio noise to each camera *position* axis.
+    Adds up to ±variance_ratio uniform noise to each camera *position* axis.
     base_loc is a tuple (x, y, z).
     Returns a new tuple with randomized offsets.
     """
-    noisy = []
-    for coord in base_loc:
-        max_delta = abs(coord) * variance_ratio
-        delta = random.uniform(-max_delta, max_delta)
-        noisy.append(coord + delta)
-    return tuple(noisy)
+    return _uniform_variance(rng, base_loc, variance_ratio)
 
-def add_camera_position_gaussian(base_loc, sigma_ratio=0.05, clamp_ratio=0.15):
+def add_camera_position_gaussian(rng, base_loc, sigma_ratio=0.05, clamp_ratio=0.15):
     """
-    Adds Gaussian noise to each camera *position* axis.
+    Adds Gaussian noise to each camera *position* axis (sampling.relative_jitter).
     - sigma_ratio: σ = percentage of base coordinate (default = 5%)
-    - clamp_ratio: hard cap for max deviation (default = 15%)
+    - clamp_ratio: truncation bound, tails are resampled (default = 15%)
 
     If a coordinate is zero, a fallback value (1.0) is used to allow noise.
     """
-    noisy = []
-    for coord in base_loc:
-        # avoid zero-variance when coordinate = 0
-        coord_abs = abs(coord) if abs(coord) > 1e-6 else 1.0
-
-        sigma = coord_abs * sigma_ratio
-        clamp = coord_abs * clamp_ratio
-
-        # Gaussian noise
-        delta = random.gauss(0, sigma)
-
-        # clamp extreme values
-        delta = max(-clamp, min(clamp, delta))
-
-        noisy.append(coord + delta)
+    return tuple(relative_jitter(rng, base_loc, sigma_ratio, clamp_ratio).tolist())
 
-    return tuple(noisy)
\ No newline at end of file
+def _uniform_variance(rng, base, variance_ratio):
+    max_delta = [abs(v) * variance_ratio for v in base]
+    return tuple(v + d for v, d in zip(base, (rng.uniform(-1.0, 1.0, len(base)) * max_delta).tolist()))
@@ -1,8 +1,14 @@
-
+import argparse
 import bpy
 import math
+import sys
 from mathutils import Euler
-import random
+import numpy as np
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root: blender -P does not add it
+from blender_args import script_args
+from sampling import new_seed, relative_jitter
 
 def set_camera_location(location_tuple):
     cam = bpy.context.scene.camera
@@ -13,27 +19,18 @@ def set_camera_location(location_tuple):
         print("⚠️ No active camera found.")
 
 def add_object_position_noise(
+    rng,
     base_loc: tuple[float, float, float],
     sigma_ratio=0.05,
     clamp_ratio=0.15
 ):
     """
-    Gaussian XYZ noise for object location.
+    Gaussian XYZ noise for object location (sampling.relative_jitter).
+    - rng: np.random.Generator, e.g. np.random.default_rng(seed)
     - sigma_ratio: % of base coordinate used as σ
-    - clamp_ratio: hard clamp as % of base coordinate
+    - clamp_ratio: truncation bound as % of base coordinate
     """
-    noisy = []
-    for coord in base_loc:
-        ref = abs(coord) if abs(coord) > 1e-6 else 1.0
-        sigma = ref * sigma_ratio
-        clamp = ref * clamp_ratio
-
-        delta = random.gauss(0, sigma)
-        delta = max(-clamp, min(clamp, delta))
-
-        noisy.append(coord + delta)
-
-    return tuple(noisy)
+    return tuple(relative_jitter(rng, base_loc, sigma_ratio, clamp_ratio).tolist())
 
 def set_object_location(obj_name: str, location: tuple):
     obj = bpy.context.scene.objects.get(obj_name)
@@ -78,21 +75,45 @@ object_positions_relative = {
     # "far": (0, 0, 0),
 }
 
-targetCamera = camera_positions["isometric"]
-targetPosition = object_positions_relative["medium"]
 
-set_camera_location(targetCamera)
+def main(argv=None):
+    """
+    blender -b scene.blend -P utils/camera_and_positions.py -- \
+        [--camera isometric] [--position medium] [--object NAME] [--noise]
+    """
+    if argv is None:
+        argv = script_args()
+    parser = argparse.ArgumentParser(description="Place camera and object from the preset positions")
+    parser.add_argument("--camera", choices=list(camera_positions), default="isometric")
+    parser.add_argument("--position", choices=list(object_positions_relative), default="medium")
+    parser.add_argument("--object", default=mainObjectId)
+    parser.add_argument("--noise", action="store_true", help="Apply Gaussian noise in world space")
+    parser.add_argument("--seed", type=int, default=None, help="Noise seed (default: fresh, printed)")
+    args = parser.parse_args(argv)
+
+    targetCamera = camera_positions[args.camera]
+    targetPosition = object_positions_relative[args.position]
+
+    set_camera_location(targetCamera)
+
+    obj_base_pos = compute_object_position_from_camera(
+        targetCamera,
+        targetPosition
+    )
 
-obj_base_pos = compute_object_position_from_camera(
-    targetCamera,
-    targetPosition
-)
+    if args.noise:
+        seed = new_seed() if args.seed is None else args.seed
+        print(f"🎲 Noise seed {seed}")
+        # Apply Gaussian noise in world space
+        obj_base_pos = add_object_position_noise(
+            np.random.default_rng(seed),
+            obj_base_pos,
+            sigma_ratio=0.05,
+            clamp_ratio=0.10
+        )
+
+    set_object_location(args.object, obj_base_pos)
 
-# Apply Gaussian noise in world space
-obj_pos_noisy = add_object_position_noise(
-    obj_base_pos,
-    sigma_ratio=0.05,
-    clamp_ratio=0.10
-)
 
-set_object_location(mainObjectId, obj_base_pos)
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,11 @@
+import argparse
 import bpy
 import json
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root: blender -P does not add it
+from blender_args import script_args
 
 def export_armature_pose(armature_obj):
     """
@@ -70,8 +76,24 @@ def load_pose_from_json_file(armature_obj, filepath):
     apply_pose_dict(armature_obj, pose_dict)
 
 
-characterObject = "main_armature"
-arm = bpy.data.objects[characterObject]
-export_pose_to_json_file(arm, "/tmp/blender-outputs/poses/default.json")
-
-# load_pose_from_json_file(arm, "/tmp/blender-outputs/poses/default.json")
+def main(argv=None):
+    """
+    blender -b scene.blend -P utils/pose.py -- [--armature NAME] [--out PATH | --load PATH]
+    """
+    if argv is None:
+        argv = script_args()
+    parser = argparse.ArgumentParser(description="Export the current armature pose to JSON, or apply one")
+    parser.add_argument("--armature", default="main_armature")
+    parser.add_argument("--out", default="/tmp/blender-outputs/poses/default.json")
+    parser.add_argument("--load", required=False, help="Apply this pose JSON instead of exporting")
+    args = parser.parse_args(argv)
+
+    arm = bpy.data.objects[args.armature]
+    if args.load:
+        load_pose_from_json_file(arm, args.load)
+    else:
+        export_pose_to_json_file(arm, args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,10 @@
+import argparse
 import bpy
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # repo root: blender -P does not add it
+from blender_args import script_args
 
 def set_visibility(name: str, visible: bool):
     obj = bpy.context.scene.objects.get(name)
@@ -8,8 +14,21 @@ def set_visibility(name: str, visible: bool):
     obj.hide_viewport = not visible
     obj.hide_render = not visible
     print(f"🔁 {name} visible={visible}")
-    
 
-hair="main-hair-material"
 
-set_visibility(hair, True)
\ No newline at end of file
+def main(argv=None):
+    """
+    blender -b scene.blend -P utils/visibility_and_objects.py -- [--name NAME] [--hide]
+    """
+    if argv is None:
+        argv = script_args()
+    parser = argparse.ArgumentParser(description="Show / hide a scene object in viewport and render")
+    parser.add_argument("--name", default="main-hair-material")
+    parser.add_argument("--hide", action="store_true")
+    args = parser.parse_args(argv)
+
+    set_visibility(args.name, not args.hide)
+
+
+if __name__ == "__main__":
+    main()